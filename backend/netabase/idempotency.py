@@ -0,0 +1,112 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# How long a response is kept for replay
+IDEMPOTENCY_TTL = 24 * 60 * 60
+
+# A request still holding its key after this long is assumed to have died
+LOCK_TTL = 30
+
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(request):
+    """Hash of the method, path and body, so a reused key can be detected."""
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method} {request.path}\n{body}".encode()
+    ).hexdigest()
+
+
+def replay(stored, request_fingerprint):
+    """The stored response, or 422 if the key came with another request."""
+    if stored["fingerprint"] != request_fingerprint:
+        return Response(
+            {
+                "detail": f"{IDEMPOTENCY_HEADER} was already used "
+                "with a different request."
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        stored["data"],
+        status=stored["status"],
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def idempotent(scope):
+    """
+    Make a view method safe to retry with an ``Idempotency-Key`` header.
+
+    The first response for a key (per user) is stored and returned again for
+    retries with the same payload, marked with ``Idempotent-Replayed``. The
+    same key with a different payload is rejected with 422, and a retry that
+    arrives while the first request is still running gets 409. Requests
+    without the header are handled normally. Server errors are not stored,
+    so the client can retry them.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return method(view, request, *args, **kwargs)
+
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {"detail": f"{IDEMPOTENCY_HEADER} is too long."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            digest = hashlib.sha256(key.encode()).hexdigest()
+            cache_key = f"idempotency:{scope}:{request.user.id}:{digest}"
+            request_fingerprint = fingerprint(request)
+
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return replay(stored, request_fingerprint)
+
+            lock_key = f"{cache_key}:lock"
+            if not cache.add(lock_key, 1, LOCK_TTL):
+                return Response(
+                    {
+                        "detail": f"A request with this {IDEMPOTENCY_HEADER} "
+                        "is still being processed."
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                # The first request may have finished between the get and add
+                stored = cache.get(cache_key)
+                if stored is not None:
+                    return replay(stored, request_fingerprint)
+
+                response = method(view, request, *args, **kwargs)
+                if response.status_code < 500:
+                    cache.set(
+                        cache_key,
+                        {
+                            "fingerprint": request_fingerprint,
+                            "status": response.status_code,
+                            "data": response.data,
+                        },
+                        IDEMPOTENCY_TTL,
+                    )
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,140 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Collapses "IN (%s, %s, %s)" so batches of any size share a fingerprint
+PLACEHOLDER_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """The query shape without parameters, so N+1 repeats compare equal."""
+    return " ".join(PLACEHOLDER_LIST.sub("(%s)", sql).split())
+
+
+class QueryStats:
+    """Execute wrapper counting and timing the queries of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def duplicates(self):
+        """Fingerprints run more than once, most repeated first."""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n > 1]
+
+
+def view_budget(view_func):
+    """The ``query_budget`` declared on a view class, or None."""
+    return getattr(getattr(view_func, "view_class", view_func), "query_budget", None)
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the queries each request runs and check them against a budget.
+
+    Every response gets a ``Server-Timing: db`` entry with the query count
+    and database time, and the numbers are logged with any repeated query
+    shapes. Views declare a ``query_budget`` (maximum number of queries);
+    going over it logs a warning, or raises ``QueryBudgetExceeded`` when
+    ``QUERY_BUDGET_STRICT`` is on, as in the tests.
+
+    Streaming responses run most of their queries while the body is sent,
+    after the headers; they are counted until the stream ends and only
+    logged and checked, without the header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        request.query_budget = None
+
+        with self.recording(stats):
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self.stream(
+                request, response.streaming_content, stats
+            )
+            return response
+
+        response.headers["Server-Timing"] = ", ".join(
+            filter(
+                None,
+                [
+                    response.headers.get("Server-Timing"),
+                    f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"',
+                ],
+            )
+        )
+        self.check(request, stats)
+        return response
+
+    def stream(self, request, content, stats):
+        with self.recording(stats):
+            yield from content
+        self.check(request, stats)
+
+    def recording(self, stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def check(self, request, stats):
+        duplicates = stats.duplicates()
+        logger.debug(
+            "%s %s: %d queries, %.1f ms, %d repeated",
+            request.method,
+            request.path,
+            stats.count,
+            stats.duration_ms,
+            len(duplicates),
+        )
+
+        budget = request.query_budget
+        if budget is not None and stats.count > budget:
+            self.over_budget(request, stats, budget, duplicates)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = view_budget(view_func)
+
+    def over_budget(self, request, stats, budget, duplicates):
+        message = (
+            f"{request.method} {request.path} ran {stats.count} queries, "
+            f"over its budget of {budget}"
+        )
+        if duplicates:
+            message += "; repeated: " + "; ".join(
+                f"{n}x {sql}" for sql, n in duplicates
+            )
+
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,82 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Set while a client that recently wrote should keep reading from the primary
+PIN_COOKIE = "db_primary_pin"
+
+use_replica = ContextVar("use_replica", default=False)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a random replica while a read-only request is handled.
+
+    Everything else, including reads inside write requests, management
+    commands and background threads, stays on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and use_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route safe-method requests to the replicas.
+
+    A successful write sets a short-lived cookie that keeps the client on the
+    primary, so the user sees their own rating straight after posting it even
+    if the replicas lag behind. Streaming responses keep the routing while
+    their body is sent, as that is when they run their queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica = request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+        token = use_replica.set(replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self.stream(
+                response.streaming_content, replica
+            )
+
+        written = request.method not in SAFE_METHODS and response.status_code < 400
+        if written and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                secure=settings.COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+                domain=settings.COOKIE_DOMAIN,
+            )
+        return response
+
+    def stream(self, content, replica):
+        token = use_replica.set(replica)
+        try:
+            yield from content
+        finally:
+            use_replica.reset(token)
@@ -28,12 +28,35 @@ ADMINS = [(os.getenv("ADMIN_NAME"), os.getenv("ADMIN_EMAIL"))]
 # -------------------------------------------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if DATABASE_URL:
-    DATABASES = {
-        "default": dj_database_url.parse(
-            DATABASE_URL, conn_max_age=600, ssl_require=True
-        )
+# psycopg 3 connection pool per worker process instead of persistent connections
+DATABASE_POOL = os.getenv("DATABASE_POOL", "False").lower() == "true"
+
+
+def database_config(url):
+    if not DATABASE_POOL:
+        return dj_database_url.parse(url, conn_max_age=600, ssl_require=True)
+
+    # Django refuses pooling together with persistent connections
+    config = dj_database_url.parse(url, conn_max_age=0, ssl_require=True)
+    config.setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 10)),
+        "timeout": int(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
     }
+    return config
+
+
+# Read-only replicas, used for safe-method requests (netabase.routers)
+DATABASE_REPLICAS = []
+
+if DATABASE_URL:
+    DATABASES = {"default": database_config(DATABASE_URL)}
+
+    replica_urls = os.getenv("DATABASE_REPLICA_URLS", "")
+    for i, url in enumerate(u.strip() for u in replica_urls.split(",") if u.strip()):
+        alias = f"replica_{i}"
+        DATABASES[alias] = {**database_config(url), "TEST": {"MIRROR": "default"}}
+        DATABASE_REPLICAS.append(alias)
 else:
     DATABASES = {
         "default": {
@@ -42,6 +65,20 @@ else:
         }
     }
 
+DATABASE_ROUTERS = ["netabase.routers.ReplicaRouter"]
+
+# Raise instead of logging a warning when a view goes over its query_budget
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False").lower() == "true"
+
+# After a write, the client reads from the primary for this long so it sees
+# its own changes despite replication lag
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 15))
+
+# The sync feed only serves rows updated at least this many seconds ago, so
+# a write that commits after a later-stamped one is not skipped by a client's
+# cursor. Keep it above the longest write transaction
+SYNC_SAFETY_LAG = int(os.getenv("SYNC_SAFETY_LAG", 10))
+
 # -------------------------------------------------------------------
 # REDIS + CACHE
 # -------------------------------------------------------------------
@@ -64,6 +101,24 @@ CACHES = {
 if "test" in sys.argv:
     CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 
+# -------------------------------------------------------------------
+# NEWS
+# -------------------------------------------------------------------
+# Seconds a feed counts as fresh before a reader triggers a background refresh
+NEWS_FRESH_TTL = int(os.getenv("NEWS_FRESH_TTL", 60 * 15))
+NEWS_BACKGROUND_REFRESH = (
+    os.getenv("NEWS_BACKGROUND_REFRESH", "True").lower() == "true"
+    and "test" not in sys.argv
+)
+
+# -------------------------------------------------------------------
+# RATINGS
+# -------------------------------------------------------------------
+# Queue rating submissions and answer 202 instead of writing them inline.
+# Needs `manage.py apply_rating_queue --loop` running next to the web workers.
+RATING_WRITE_BEHIND = os.getenv("RATING_WRITE_BEHIND", "False").lower() == "true"
+RATING_QUEUE_BATCH_SIZE = int(os.getenv("RATING_QUEUE_BATCH_SIZE", 500))
+
 # -------------------------------------------------------------------
 # INSTALLED APPS
 # -------------------------------------------------------------------
@@ -93,6 +148,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "netabase.querybudget.QueryBudgetMiddleware",
+    "netabase.routers.ReplicaRoutingMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -180,11 +237,23 @@ CLOUDINARY_STORAGE = {
 # -------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user_api.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    # Proxies in front of the app that append to X-Forwarded-For (1 behind a
+    # single load balancer). With 0 the socket address is used, as a client
+    # can put anything in the header
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+    # Token buckets from netabase.throttling, keyed "<scope>.<user|ip>"
+    "DEFAULT_THROTTLE_RATES": {
+        "rating.user": os.getenv("THROTTLE_RATING_USER", "10/min"),
+        "rating.ip": os.getenv("THROTTLE_RATING_IP", "30/min"),
+        "google_login.ip": os.getenv("THROTTLE_GOOGLE_LOGIN_IP", "10/min"),
+        "token_refresh.ip": os.getenv("THROTTLE_TOKEN_REFRESH_IP", "30/min"),
+        "export.ip": os.getenv("THROTTLE_EXPORT_IP", "10/hour"),
+    },
 }
 
 
@@ -240,6 +309,9 @@ SESSION_ENGINE = "django.contrib.sessions.backends.db"
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
+GOOGLE_CERTS_URL = os.getenv(
+    "GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"
+)
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
 # -------------------------------------------------------------------
@@ -0,0 +1,159 @@
+import logging
+import math
+import threading
+import time
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+# Refills the bucket for the time elapsed since the last request, then takes
+# one token if available. Returns {allowed, seconds until a token is free}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+# After a Redis error, requests are limited in process for this long before
+# Redis is tried again, so an outage doesn't add a timeout to every request
+REDIS_RETRY_AFTER = 30
+redis_down_until = 0
+
+
+def parse_rate(rate):
+    """``"10/min"`` -> (capacity 10, refill of 10 tokens per 60 seconds)."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class LocalBuckets:
+    """In-process token buckets, used when Redis can't be reached."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self.lock:
+            tokens, ts = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - ts) * rate)
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                return True, 0
+            self.buckets[key] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+local_buckets = LocalBuckets()
+
+
+def redis_take(key, capacity, rate, now):
+    from django_redis import get_redis_connection
+
+    conn = get_redis_connection("default")
+    allowed, wait = conn.eval(TOKEN_BUCKET_SCRIPT, 1, key, capacity, rate, now)
+    return bool(allowed), float(wait)
+
+
+def take_token(key, capacity, rate):
+    """Take one token from the bucket at ``key``; returns (allowed, wait)."""
+    global redis_down_until
+
+    now = time.time()
+    if now >= redis_down_until:
+        try:
+            return redis_take(key, capacity, rate, now)
+        except NotImplementedError:
+            # Cache backend is not django-redis (development, tests)
+            pass
+        except Exception:
+            logger.warning("Redis throttle unavailable, limiting in process")
+            redis_down_until = now + REDIS_RETRY_AFTER
+
+    return local_buckets.take(key, capacity, rate, now)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket rate limit shared through Redis.
+
+    The rate comes from ``DEFAULT_THROTTLE_RATES["<scope>.<kind>"]``, with
+    the scope taken from the class or the view's ``throttle_scope``. A
+    bucket holds the rate's request count and refills evenly over its
+    period, so short bursts pass while sustained floods are cut off.
+    """
+
+    scope = None
+    kind = None
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def get_rate(self, view):
+        scope = self.scope or getattr(view, "throttle_scope", None)
+        rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+        return scope, rates.get(f"{scope}.{self.kind}")
+
+    def allow_request(self, request, view):
+        scope, rate = self.get_rate(view)
+        ident = self.get_cache_key(request, view)
+        if rate is None or ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        allowed, self.wait_seconds = take_token(
+            f"throttle:{scope}:{self.kind}:{ident}", capacity, refill
+        )
+        return allowed
+
+    def wait(self):
+        return math.ceil(self.wait_seconds)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Per authenticated user; anonymous requests are left to the IP limit."""
+
+    kind = "user"
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return request.user.pk
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    kind = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
@@ -1,3 +1,28 @@
 from django.contrib import admin
 
-# Register your models here.
+from news_api.models import NewsItem, NewsSource
+
+
+@admin.register(NewsItem)
+class NewsItemAdmin(admin.ModelAdmin):
+    list_display = ("title", "source_name", "published_at", "created_at")
+    search_fields = ("title", "guid", "link")
+    list_filter = ("source_name",)
+    readonly_fields = ("created_at", "updated_at")
+    list_per_page = 50
+
+
+@admin.register(NewsSource)
+class NewsSourceAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "last_status",
+        "consecutive_failures",
+        "open_until",
+        "last_error_class",
+        "last_checked_at",
+        "last_fetch_ms",
+        "last_parse_ms",
+        "bytes_saved",
+    )
+    readonly_fields = ("seen_guids", "latencies_ms", "updated_at")
@@ -0,0 +1,83 @@
+import re
+from functools import lru_cache
+
+# keyword -> weight; an entry is politics once its matches add up to THRESHOLD
+POLITICS_KEYWORDS = {
+    "politics": 1.0,
+    "political": 1.0,
+    "government": 1.0,
+    "election": 1.0,
+    "राजनीति": 1.0,
+    "नेता": 1.0,
+    "संसद": 1.0,
+    "मन्त्री": 1.0,
+    "प्रधानमन्त्री": 1.0,
+    "दल": 1.0,
+    "कांग्रेस": 1.0,
+    "एमाले": 1.0,
+    "माओवादी": 1.0,
+    "सरकार": 1.0,
+}
+
+# Extra (or re-weighted) keywords for individual NEWS_SOURCES entries,
+# e.g. {"bbCnepali": {"निर्वाचन": 1.0}}
+SOURCE_KEYWORDS = {}
+
+THRESHOLD = 1.0
+
+
+class KeywordClassifier:
+    """
+    Weighted keyword matcher compiled once into a single regex.
+
+    Keywords are matched case-insensitively as substrings, longest first,
+    so the text is scanned once instead of once per keyword.
+    """
+
+    def __init__(self, keywords, threshold=THRESHOLD):
+        self.weights = {keyword.lower(): weight for keyword, weight in keywords.items()}
+        self.threshold = threshold
+
+        alternation = "|".join(
+            re.escape(keyword)
+            for keyword in sorted(self.weights, key=len, reverse=True)
+        )
+        # Case-insensitive pattern keeps spans aligned with the original text;
+        # the plain one runs on pre-lowercased text, which is cheaper to scan.
+        self.pattern = re.compile(alternation, re.IGNORECASE)
+        self.lower_pattern = re.compile(alternation)
+        self.any_keyword_suffices = min(self.weights.values()) >= threshold
+
+    def classify(self, text: str):
+        """Return the score and the ``(keyword, start, end)`` spans that matched."""
+        matches = []
+        score = 0.0
+
+        for match in self.pattern.finditer(text):
+            keyword = match.group(0).lower()
+            matches.append((keyword, match.start(), match.end()))
+            score += self.weights.get(keyword, 1.0)
+
+        return {"score": score, "matches": matches}
+
+    def is_match(self, text: str) -> bool:
+        text = text.lower()
+
+        if self.any_keyword_suffices:
+            return self.lower_pattern.search(text) is not None
+
+        # Stop scanning as soon as the threshold is reached
+        score = 0.0
+        for match in self.lower_pattern.finditer(text):
+            score += self.weights[match.group(0)]
+            if score >= self.threshold:
+                return True
+        return False
+
+
+@lru_cache(maxsize=None)
+def classifier_for_source(source=None):
+    """Shared classifier with the source's extra keywords merged in."""
+    keywords = dict(POLITICS_KEYWORDS)
+    keywords.update(SOURCE_KEYWORDS.get(source, {}))
+    return KeywordClassifier(keywords)
@@ -0,0 +1,137 @@
+import hashlib
+import random
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils.html import strip_tags
+
+from news_api.entities import normalize
+from news_api.models import NewsBand, NewsItem
+
+NUM_PERM = 60
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+# Estimated Jaccard similarity at which two items count as the same story
+SIMILARITY_THRESHOLD = 0.5
+
+# Only stories published this close together are compared
+CLUSTER_WINDOW = timedelta(days=3)
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: band keys stored in the database must stay comparable
+_rng = random.Random(1729)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def shingles(text: str):
+    """Character n-grams of the normalized text without markup or punctuation."""
+    text = re.sub(r"[^\w\s]", " ", normalize(strip_tags(text or "")))
+    text = " ".join(text.split())
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def base_hash(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=4).digest(), "little"
+    )
+
+
+def minhash(text: str):
+    """MinHash signature of ``NUM_PERM`` values, or None for empty text."""
+    hashes = [base_hash(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return None
+
+    return [
+        min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def similarity(first, second) -> float:
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+def band_keys(signature):
+    """One signed 64-bit key per LSH band, so they fit a BigIntegerField."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def item_text(item):
+    return f"{item.title} {item.description}"
+
+
+def cluster_items(items):
+    """
+    Attach each item to a story, joining an earlier near-duplicate's story.
+
+    Candidates come from LSH band collisions (one indexed query over
+    ``NewsBand``) and are confirmed by MinHash similarity, so the cost does
+    not grow with the number of stored items.
+    """
+    items = sorted(items, key=lambda item: (item.published_at, item.id))
+    if not items:
+        return 0
+
+    signatures = {item.id: minhash(item_text(item)) for item in items}
+    keys = {
+        item_id: band_keys(signature) if signature else []
+        for item_id, signature in signatures.items()
+    }
+
+    buckets = defaultdict(set)
+    for key, item_id in NewsBand.objects.filter(
+        band_key__in={key for item_keys in keys.values() for key in item_keys},
+        news_item__published_at__gte=items[0].published_at - CLUSTER_WINDOW,
+        news_item__published_at__lte=items[-1].published_at + CLUSTER_WINDOW,
+    ).values_list("band_key", "news_item_id"):
+        buckets[key].add(item_id)
+
+    candidate_ids = {item_id for bucket in buckets.values() for item_id in bucket}
+    known = {
+        candidate.id: (candidate, minhash(item_text(candidate)))
+        for candidate in NewsItem.objects.filter(id__in=candidate_ids).only(
+            "id", "title", "description", "published_at", "story_id"
+        )
+    }
+
+    bands = []
+    for item in items:
+        signature = signatures[item.id]
+        best_score, best = 0.0, None
+
+        for candidate_id in {cid for key in keys[item.id] for cid in buckets[key]}:
+            candidate, candidate_signature = known[candidate_id]
+            if abs(candidate.published_at - item.published_at) > CLUSTER_WINDOW:
+                continue
+
+            score = similarity(signature, candidate_signature)
+            if score >= SIMILARITY_THRESHOLD and score > best_score:
+                best_score, best = score, candidate
+
+        item.story_id = (best.story_id or best.id) if best else item.id
+
+        # Later items in the same batch can match this one
+        known[item.id] = (item, signature)
+        for key in keys[item.id]:
+            buckets[key].add(item.id)
+            bands.append(NewsBand(news_item_id=item.id, band_key=key))
+
+    NewsItem.objects.bulk_update(items, ["story"], batch_size=500)
+    NewsBand.objects.bulk_create(bands, batch_size=1000)
+    return len(items)
@@ -0,0 +1,79 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+from politicians.models import Party, Politician
+
+# Aliases shorter than this match too many unrelated words
+MIN_ALIAS_LENGTH = 2
+
+
+def normalize(text: str) -> str:
+    """NFC, lowercase and single spaces, so feed text and names compare equal."""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def alias_pattern(alias: str) -> str:
+    """
+    Regex for one alias.
+
+    Latin aliases must be whole words. Nepali attaches case endings straight
+    to the name ("ओलीले", "कांग्रेसको"), so Devanagari aliases only need to
+    start on a word boundary.
+    """
+    pattern = r"(?<!\w)" + r"\s+".join(re.escape(part) for part in alias.split())
+    if alias.isascii():
+        pattern += r"(?!\w)"
+    return pattern
+
+
+class EntityIndex:
+    """
+    In-memory index of politician and party names compiled into one regex.
+
+    ``find`` returns the politician and party ids mentioned in a text with a
+    single scan, whatever the number of names.
+    """
+
+    def __init__(self, politicians, parties):
+        self.aliases = defaultdict(set)
+
+        for politician_id, *names in politicians:
+            for name in names:
+                self.add(name, ("politician", politician_id))
+
+        for party_id, *names in parties:
+            for name in names:
+                self.add(name, ("party", party_id))
+
+        aliases = sorted(self.aliases, key=len, reverse=True)
+        self.pattern = (
+            re.compile("|".join(alias_pattern(alias) for alias in aliases))
+            if aliases
+            else None
+        )
+
+    def add(self, name, entity):
+        alias = normalize(name or "")
+        if len(alias) >= MIN_ALIAS_LENGTH:
+            self.aliases[alias].add(entity)
+
+    @classmethod
+    def build(cls):
+        return cls(
+            Politician.objects.values_list("id", "name", "name_np"),
+            Party.objects.values_list("id", "name", "short_name", "name_np"),
+        )
+
+    def find(self, text: str):
+        """Return ``(politician_ids, party_ids)`` named in the text."""
+        politicians, parties = set(), set()
+        if self.pattern is None:
+            return politicians, parties
+
+        for match in self.pattern.finditer(normalize(text)):
+            alias = " ".join(match.group(0).split())
+            for kind, entity_id in self.aliases[alias]:
+                (politicians if kind == "politician" else parties).add(entity_id)
+
+        return politicians, parties
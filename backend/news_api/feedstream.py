@@ -0,0 +1,120 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import XMLPullParser
+
+from django.utils.html import strip_tags
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+
+ENTRY_TAGS = {"item", f"{ATOM}entry"}
+
+
+def parse_published(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as an aware UTC datetime."""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=dt_timezone.utc)
+    return published.astimezone(dt_timezone.utc)
+
+
+def text_of(element, *tags):
+    for tag in tags:
+        child = element.find(tag)
+        if child is not None and child.text:
+            return child.text.strip()
+    return ""
+
+
+def image_of(element):
+    """media:content, media:thumbnail, then an image enclosure."""
+    for tag in (f"{MEDIA}content", f"{MEDIA}thumbnail"):
+        child = element.find(tag)
+        if child is not None and child.get("url"):
+            return child.get("url")
+
+    for tag in ("enclosure", f"{ATOM}link"):
+        for child in element.iter(tag):
+            if child.get("type", "").startswith("image"):
+                return child.get("url") or child.get("href")
+
+    return None
+
+
+def link_of(element):
+    link = text_of(element, "link")
+    if link:
+        return link
+
+    for child in element.iter(f"{ATOM}link"):
+        if child.get("rel", "alternate") == "alternate" and child.get("href"):
+            return child.get("href")
+    return ""
+
+
+def normalize_entry(element):
+    """One feed entry as the flat dict the filter and ingest steps use."""
+    link = link_of(element)
+    author = text_of(element, "author", f"{DC}creator")
+    if not author:
+        author = text_of(element, f"{ATOM}author/{ATOM}name")
+
+    return {
+        "guid": text_of(element, "guid", f"{ATOM}id") or link,
+        "title": strip_tags(text_of(element, "title", f"{ATOM}title")),
+        "description": strip_tags(
+            text_of(element, "description", f"{ATOM}summary", f"{ATOM}content")
+        ).strip(),
+        "link": link,
+        "category": text_of(element, "category"),
+        "author": author,
+        "published_at": parse_published(
+            text_of(element, "pubDate", f"{ATOM}published", f"{ATOM}updated")
+        ),
+        "image_url": image_of(element),
+    }
+
+
+def iter_entries(chunks):
+    """
+    Yield normalized entries from an iterable of raw byte chunks.
+
+    Entries come out while the body is still downloading, and each one is
+    dropped from the tree once read, so memory stays flat whatever the feed
+    size. Raises ``xml.etree.ElementTree.ParseError`` for malformed XML;
+    entries before the error have already been yielded.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    parents = []
+
+    def drain():
+        for event, element in parser.read_events():
+            if event == "start":
+                parents.append(element)
+                continue
+
+            parents.pop()
+            if element.tag in ENTRY_TAGS:
+                yield normalize_entry(element)
+                if parents:
+                    parents[-1].remove(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+
+    parser.close()
+    yield from drain()
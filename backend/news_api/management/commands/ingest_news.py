@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from news_api.services import ingest_news
+
+
+class Command(BaseCommand):
+    help = "Scrape the politics news feeds and store new items. Run on a schedule."
+
+    def handle(self, *args, **options):
+        result = ingest_news()
+
+        for name, source in sorted(result["sources"].items()):
+            line = f"{name}: {source['status']}"
+            if source["status"] == "ok":
+                line += (
+                    f" ({source['count']} new items, fetch {source['fetch_ms']} ms,"
+                    f" parse {source['parse_ms']} ms, {source['bytes']} bytes)"
+                )
+            elif source["status"] == "not_modified":
+                line += f" ({source['bytes_saved']} bytes saved)"
+            elif "error" in source:
+                line += f" ({source['error']})"
+            self.stdout.write(line)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Ingested {result['ingested']} news items")
+        )
@@ -0,0 +1,74 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+import feedparser
+from django.core.management.base import BaseCommand
+
+from news_api.feedstream import iter_entries
+
+CHUNK_SIZE = 16 * 1024
+
+
+def synthetic_feed(items: int) -> bytes:
+    """An RSS document with ``items`` politics entries of realistic size."""
+    entry = (
+        "<item><title>संसद बैठक {i}</title>"
+        "<link>https://example.com/news/{i}</link>"
+        '<guid isPermaLink="false">https://example.com/?p={i}</guid>'
+        "<description><![CDATA[<p>{body}</p>]]></description>"
+        "<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>"
+    )
+    body = "सरकारले नयाँ नीति ल्याउने तयारी गरेको छ। " * 20
+    items_xml = "".join(entry.format(i=i, body=body) for i in range(items))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Synthetic</title>{items_xml}</channel></rss>"
+    ).encode()
+
+
+def profile(func):
+    """Run ``func`` and return (seconds, peak traced bytes)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def stream_entries(body: bytes):
+    chunks = (body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+    count = 0
+    for _ in iter_entries(chunks):
+        count += 1
+    return count
+
+
+class Command(BaseCommand):
+    help = "Compare time and peak memory of feedparser and the streaming parser."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file", help="Feed file to parse instead of a synthetic one"
+        )
+        parser.add_argument("--items", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options["file"]:
+            body = Path(options["file"]).read_bytes()
+        else:
+            body = synthetic_feed(options["items"])
+
+        self.stdout.write(f"feed size: {len(body) / 1024 / 1024:.1f} MiB")
+
+        # Peak memory excludes the body itself, which both parsers receive
+        for label, func in (
+            ("feedparser", lambda: feedparser.parse(body)),
+            ("streaming", lambda: stream_entries(body)),
+        ):
+            elapsed, peak = profile(func)
+            self.stdout.write(
+                f"{label:>10}: {elapsed:.2f} s, peak {peak / 1024 / 1024:.1f} MiB"
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from news_api.entities import EntityIndex
+from news_api.models import NewsItem
+from news_api.services import tag_mentions
+
+
+class Command(BaseCommand):
+    help = (
+        "Tag stored news items with the politicians and parties they mention, "
+        "e.g. after adding politicians or Devanagari names."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        index = EntityIndex.build()
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+
+        while True:
+            batch = list(
+                NewsItem.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+
+            total += tag_mentions(NewsItem.objects.filter(id__in=batch), index)
+            last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Recorded {total} mentions"))
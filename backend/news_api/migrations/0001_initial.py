@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("guid", models.CharField(max_length=500, unique=True)),
+                ("source_name", models.CharField(max_length=50)),
+                ("title", models.CharField(max_length=500)),
+                ("description", models.TextField(blank=True)),
+                ("link", models.URLField(max_length=1000)),
+                ("category", models.CharField(blank=True, max_length=255)),
+                ("author", models.CharField(blank=True, max_length=255)),
+                ("image_url", models.URLField(blank=True, max_length=1000, null=True)),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        help_text="Feed publish date, or first ingestion time when missing"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-published_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["-published_at", "-id"],
+                        name="news_api_ne_publish_f9e036_idx",
+                    ),
+                    models.Index(
+                        fields=["source_name", "-published_at", "-id"],
+                        name="news_api_ne_source__0edbdd_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsSource",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("etag", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "last_modified",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                ("seen_guids", models.JSONField(blank=True, default=list)),
+                ("last_status", models.CharField(blank=True, max_length=20)),
+                ("last_checked_at", models.DateTimeField(blank=True, null=True)),
+                ("last_fetch_ms", models.PositiveIntegerField(default=0)),
+                ("last_parse_ms", models.PositiveIntegerField(default=0)),
+                (
+                    "last_bytes",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Size of the last full feed download"
+                    ),
+                ),
+                (
+                    "bytes_saved",
+                    models.PositiveBigIntegerField(
+                        default=0,
+                        help_text="Bytes not downloaded thanks to 304 responses",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_api", "0002_newssource"),
+        ("politicians", "0014_party_name_np_politician_name_np"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsMention",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("published_at", models.DateTimeField()),
+                (
+                    "news_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="mentions",
+                        to="news_api.newsitem",
+                    ),
+                ),
+                (
+                    "party",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="news_mentions",
+                        to="politicians.party",
+                    ),
+                ),
+                (
+                    "politician",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="news_mentions",
+                        to="politicians.politician",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-published_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["politician", "-published_at", "-id"],
+                        name="news_api_ne_politic_af955d_idx",
+                    ),
+                    models.Index(
+                        fields=["party", "-published_at", "-id"],
+                        name="news_api_ne_party_i_ff31a1_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("politician__isnull", False)),
+                        fields=("news_item", "politician"),
+                        name="unique_news_politician_mention",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("party__isnull", False)),
+                        fields=("news_item", "party"),
+                        name="unique_news_party_mention",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_api", "0003_newsmention"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsitem",
+            name="story",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="First item of the near-duplicate cluster; itself when unique",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="alternates",
+                to="news_api.newsitem",
+            ),
+        ),
+        migrations.CreateModel(
+            name="NewsBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band_key", models.BigIntegerField()),
+                (
+                    "news_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bands",
+                        to="news_api.newsitem",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["band_key"], name="news_api_ne_band_ke_def5f9_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_api", "0004_newsitem_story_newsband"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newssource",
+            name="consecutive_failures",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="items_total",
+            field=models.PositiveBigIntegerField(
+                default=0, help_text="Politics items returned over all fetches"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="last_item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="last_success_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="latencies_ms",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Most recent fetch latencies, newest first",
+            ),
+        ),
+        migrations.AddField(
+            model_name="newssource",
+            name="open_until",
+            field=models.DateTimeField(
+                blank=True, help_text="Fetches are skipped until this time", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_api", "0005_newssource_circuit_breaker"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newssource",
+            name="last_error_class",
+            field=models.CharField(
+                blank=True, help_text="Kind of the last failure", max_length=100
+            ),
+        ),
+        migrations.AlterField(
+            model_name="newssource",
+            name="last_error",
+            field=models.TextField(
+                blank=True, help_text="Message of the last failure, for admins only"
+            ),
+        ),
+    ]
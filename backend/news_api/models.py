@@ -1,3 +1,145 @@
 from django.db import models
 
-# Create your models here.
+from politicians.models import Party, Politician
+
+
+class NewsItem(models.Model):
+    guid = models.CharField(max_length=500, unique=True)
+    source_name = models.CharField(max_length=50)
+    title = models.CharField(max_length=500)
+    description = models.TextField(blank=True)
+    link = models.URLField(max_length=1000)
+    category = models.CharField(max_length=255, blank=True)
+    author = models.CharField(max_length=255, blank=True)
+    image_url = models.URLField(max_length=1000, blank=True, null=True)
+    published_at = models.DateTimeField(
+        help_text="Feed publish date, or first ingestion time when missing"
+    )
+    story = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        related_name="alternates",
+        null=True,
+        blank=True,
+        help_text="First item of the near-duplicate cluster; itself when unique",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-published_at", "-id"]
+        indexes = [
+            models.Index(fields=["-published_at", "-id"]),
+            models.Index(fields=["source_name", "-published_at", "-id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.source_name} - {self.title}"
+
+
+class NewsBand(models.Model):
+    """One LSH band key of a news item's MinHash signature."""
+
+    news_item = models.ForeignKey(
+        NewsItem, on_delete=models.CASCADE, related_name="bands"
+    )
+    band_key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["band_key"]),
+        ]
+
+
+class NewsSource(models.Model):
+    """Per-feed fetch state kept between ingestion runs."""
+
+    name = models.CharField(max_length=50, unique=True)
+    etag = models.CharField(max_length=255, blank=True, null=True)
+    last_modified = models.CharField(max_length=100, blank=True, null=True)
+    seen_guids = models.JSONField(default=list, blank=True)
+    last_status = models.CharField(max_length=20, blank=True)
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    last_fetch_ms = models.PositiveIntegerField(default=0)
+    last_parse_ms = models.PositiveIntegerField(default=0)
+    last_bytes = models.PositiveIntegerField(
+        default=0, help_text="Size of the last full feed download"
+    )
+    bytes_saved = models.PositiveBigIntegerField(
+        default=0, help_text="Bytes not downloaded thanks to 304 responses"
+    )
+
+    # Circuit breaker
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    open_until = models.DateTimeField(
+        null=True, blank=True, help_text="Fetches are skipped until this time"
+    )
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(
+        blank=True, help_text="Message of the last failure, for admins only"
+    )
+    last_error_class = models.CharField(
+        max_length=100, blank=True, help_text="Kind of the last failure"
+    )
+
+    # Health metrics
+    latencies_ms = models.JSONField(
+        default=list, blank=True, help_text="Most recent fetch latencies, newest first"
+    )
+    last_item_count = models.PositiveIntegerField(default=0)
+    items_total = models.PositiveBigIntegerField(
+        default=0, help_text="Politics items returned over all fetches"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class NewsMention(models.Model):
+    """A politician or party named in a news item, tagged at ingestion time."""
+
+    news_item = models.ForeignKey(
+        NewsItem, on_delete=models.CASCADE, related_name="mentions"
+    )
+    politician = models.ForeignKey(
+        Politician,
+        on_delete=models.CASCADE,
+        related_name="news_mentions",
+        null=True,
+        blank=True,
+    )
+    party = models.ForeignKey(
+        Party,
+        on_delete=models.CASCADE,
+        related_name="news_mentions",
+        null=True,
+        blank=True,
+    )
+    # Copied from the news item so per-entity feeds are one index range scan
+    published_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-published_at", "-id"]
+        indexes = [
+            models.Index(fields=["politician", "-published_at", "-id"]),
+            models.Index(fields=["party", "-published_at", "-id"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["news_item", "politician"],
+                condition=models.Q(politician__isnull=False),
+                name="unique_news_politician_mention",
+            ),
+            models.UniqueConstraint(
+                fields=["news_item", "party"],
+                condition=models.Q(party__isnull=False),
+                name="unique_news_party_mention",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.politician or self.party} in {self.news_item}"
@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+from news_api.models import NewsItem, NewsMention
+
+
+class NewsItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NewsItem
+        fields = [
+            "id",
+            "guid",
+            "source_name",
+            "title",
+            "description",
+            "link",
+            "category",
+            "author",
+            "image_url",
+            "published_at",
+        ]
+
+
+class NewsMentionSerializer(serializers.ModelSerializer):
+    """Renders a mention as the news item it points to."""
+
+    class Meta:
+        model = NewsMention
+        fields = ["news_item"]
+
+    def to_representation(self, instance):
+        return NewsItemSerializer(instance.news_item, context=self.context).data
+
+
+class NewsStorySerializer(NewsItemSerializer):
+    """A news item together with the same story from other sources."""
+
+    alternates = serializers.SerializerMethodField()
+
+    class Meta(NewsItemSerializer.Meta):
+        fields = NewsItemSerializer.Meta.fields + ["alternates"]
+
+    def get_alternates(self, obj):
+        return [
+            {
+                "source_name": alternate.source_name,
+                "title": alternate.title,
+                "link": alternate.link,
+            }
+            for alternate in obj.alternates.all()
+            if alternate.id != obj.id
+        ]
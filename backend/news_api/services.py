@@ -1,23 +1,25 @@
-from datetime import datetime
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from xml.etree.ElementTree import ParseError
 
 import feedparser
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.html import strip_tags
 
-POLITICS_KEYWORDS = [
-    "politics",
-    "political",
-    "government",
-    "election",
-    "राजनीति",
-    "नेता",
-    "संसद",
-    "मन्त्री",
-    "प्रधानमन्त्री",
-    "दल",
-    "कांग्रेस",
-    "एमाले",
-    "माओवादी",
-    "सरकार",
-]
+from news_api.classifier import classifier_for_source
+from news_api.dedup import cluster_items
+from news_api.entities import EntityIndex
+from news_api.feedstream import iter_entries
+from news_api.models import NewsItem, NewsMention, NewsSource
 
 NEWS_SOURCES = {
     "onlinekhabar": "https://www.onlinekhabar.com/feed",
@@ -28,10 +30,41 @@ NEWS_SOURCES = {
     "nagarik": "https://nagariknews.nagariknetwork.com/rss",
 }
 
+# Seconds allowed per feed (connect, read) and for a whole scrape
+FETCH_TIMEOUT = (3, 8)
+SCRAPE_DEADLINE = 15
+MAX_FETCH_WORKERS = 6
+
+logger = logging.getLogger(__name__)
+
+# Background refreshes triggered by readers; one worker per source at most
+refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="news-refresh")
+REFRESH_LOCK_TTL = 60
+# A failed refresh is retried by the next reader after this many seconds
+REFRESH_RETRY_TTL = 60
+
+# Guids remembered per feed to skip entries handled on the previous fetch
+MAX_SEEN_GUIDS = 500
+# Consecutive already-seen entries after which the rest of a feed is skipped;
+# more than one so a pinned old post at the top doesn't hide new ones
+STOP_AFTER_SEEN = 3
+FEED_CHUNK_SIZE = 16 * 1024
+
+# Circuit breaker: after BREAKER_THRESHOLD consecutive failures a feed is
+# skipped for BREAKER_BASE_BACKOFF seconds, doubling with every failed probe
+BREAKER_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 60
+BREAKER_MAX_BACKOFF = 60 * 60
+
+# Fetch latencies kept per feed for the health percentiles
+LATENCY_WINDOW = 100
+
+# Longest link or image URL a NewsItem can store
+MAX_URL_LENGTH = NewsItem._meta.get_field("link").max_length
 
-def is_politics(text: str) -> bool:
-    text = text.lower()
-    return any(keyword.lower() in text for keyword in POLITICS_KEYWORDS)
+
+def is_politics(text: str, source=None) -> bool:
+    return classifier_for_source(source).is_match(text)
 
 
 def parse_date(entry):
@@ -40,7 +73,7 @@ def parse_date(entry):
         return None
 
     try:
-        return datetime(*entry.published_parsed[:6]).isoformat()
+        return datetime(*entry.published_parsed[:6], tzinfo=dt_timezone.utc)
     except:
         return None
 
@@ -67,49 +100,542 @@ def extract_image(entry):
     return image_url
 
 
-def scrape_source(name: str, url: str):
-    feed = feedparser.parse(url)
-    results = []
+def fetch_feed(url: str, timeout=FETCH_TIMEOUT, etag=None, modified=None):
+    """
+    Start downloading a feed with a timeout, sending validators from the
+    last fetch. The body is streamed, so the caller must close the response.
+    """
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
 
-    for entry in feed.entries:
-        text = f"{entry.title} {entry.get('summary', '')}"
+    response = requests.get(url, timeout=timeout, headers=headers, stream=True)
+    if response.status_code != 304:
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+    return response
 
-        # Filter politics content
-        if not is_politics(text):
-            continue
 
-        item = {
-            "source_name": name,
-            "title": entry.title,
-            "heading": entry.title,
-            "description": entry.get("summary", ""),
+def feedparser_entries(url: str, timeout=FETCH_TIMEOUT):
+    """
+    Slow path for feeds that are not well-formed XML: download the whole
+    body again and let feedparser's lenient parser handle it.
+    """
+    response = requests.get(
+        url, timeout=timeout, headers={"User-Agent": feedparser.USER_AGENT}
+    )
+    response.raise_for_status()
+    feed = feedparser.parse(
+        response.content,
+        response_headers={
+            "content-location": response.url,
+            "content-type": response.headers.get("Content-Type", ""),
+        },
+    )
+
+    for entry in feed.entries:
+        yield {
+            "guid": entry.get("id", entry.link),
+            "title": strip_tags(entry.title),
+            "description": strip_tags(entry.get("summary", "")).strip(),
             "link": entry.link,
             "category": entry.get("category", ""),
-            "author": entry.get("author", name),
-            "pub_date": entry.get("published", None),
-            "published_date": entry.get("published", None),
-            "parsed_date": parse_date(entry),
-            "guid": entry.get("id", entry.link),
-            "image": extract_image(entry),
+            "author": entry.get("author", ""),
+            "published_at": parse_date(entry),
             "image_url": extract_image(entry),
-            "content_type": "politics",
         }
 
-        results.append(item)
 
+def scrape_source(name: str, url: str, timeout=FETCH_TIMEOUT, state=None):
+    """
+    Fetch one feed and return its politics items not seen on the last fetch.
+
+    The body is parsed as it streams in and reading stops once
+    ``STOP_AFTER_SEEN`` consecutive entries were already handled, since
+    feeds list newest first. ``state`` carries the feed's ETag/Last-Modified
+    and seen guids between runs and is updated in place, together with
+    fetch/parse timings and the bytes a 304 saved us.
+    """
+    state = {} if state is None else state
+
+    started = time.monotonic()
+    response = fetch_feed(url, timeout, state.get("etag"), state.get("modified"))
+    state["fetch_ms"] = round((time.monotonic() - started) * 1000)
+
+    if response.status_code == 304:
+        response.close()
+        state.update(not_modified=True, parse_ms=0, bytes_saved=state.get("bytes", 0))
+        return []
+
+    seen = list(state.get("seen_guids") or [])
+    seen_set = set(seen)
+    received = 0
+    consecutive_seen = 0
+    new_guids = []
+    results = []
+
+    def chunks():
+        nonlocal received
+        for chunk in response.iter_content(chunk_size=FEED_CHUNK_SIZE):
+            received += len(chunk)
+            yield chunk
+
+    started = time.monotonic()
+    try:
+        entries = iter_entries(chunks())
+        for entry in with_fallback(entries, url, timeout):
+            # Already handled on a previous fetch
+            if entry["guid"] in seen_set:
+                consecutive_seen += 1
+                if consecutive_seen >= STOP_AFTER_SEEN:
+                    break
+                continue
+
+            consecutive_seen = 0
+            new_guids.append(entry["guid"])
+
+            # Filter politics content
+            text = f"{entry['title']} {entry['description']}"
+            if not is_politics(text, source=name):
+                continue
+
+            entry["author"] = entry["author"] or name
+            results.append({"source_name": name, **entry})
+    finally:
+        response.close()
+
+    state["parse_ms"] = round((time.monotonic() - started) * 1000)
+    state.update(
+        not_modified=False,
+        etag=response.headers.get("ETag"),
+        modified=response.headers.get("Last-Modified"),
+        bytes=received,
+        bytes_saved=0,
+    )
+
+    # Newly seen guids first, then the ones from before we stopped reading
+    state["seen_guids"] = (new_guids + seen)[:MAX_SEEN_GUIDS]
     return results
 
 
-def scrape_all_sources():
+def with_fallback(entries, url, timeout):
+    """Yield streamed entries, switching to feedparser on malformed XML."""
+    yielded = set()
+    try:
+        for entry in entries:
+            yielded.add(entry["guid"])
+            yield entry
+    except ParseError:
+        logger.info("Malformed feed at %s, falling back to feedparser", url)
+        for entry in feedparser_entries(url, timeout):
+            if entry["guid"] not in yielded:
+                yield entry
+
+
+def scrape_all_sources(
+    sources=None, timeout=FETCH_TIMEOUT, deadline=SCRAPE_DEADLINE, states=None
+):
+    """
+    Scrape all feeds concurrently and return whatever finished in time.
+
+    Each feed gets its own request timeout and the whole scrape is bounded
+    by ``deadline``; feeds still running then are reported as timed out
+    instead of holding back the ones that already answered. ``states`` maps
+    source names to the conditional-fetch state used by ``scrape_source``.
+    """
+    sources = NEWS_SOURCES if sources is None else sources
+    states = {} if states is None else states
     all_news = []
+    statuses = {}
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(MAX_FETCH_WORKERS, len(sources) or 1),
+        thread_name_prefix="news-scrape",
+    )
+    started = time.monotonic()
+    now = timezone.now()
+    futures = {}
+
+    for name, url in sources.items():
+        state = states.setdefault(name, {})
+        if not allow_fetch(name, state, now):
+            statuses[name] = {
+                "status": "open",
+                "retry_at": state["open_until"].isoformat(),
+            }
+            continue
+
+        futures[executor.submit(scrape_source, name, url, timeout, state)] = name
 
-    for name, url in NEWS_SOURCES.items():
+    done, pending = wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        name = futures[future]
         try:
-            source_news = scrape_source(name, url)
-            all_news.extend(source_news)
+            source_news = future.result()
         except Exception as e:
-            all_news.append({"source_name": name, "error": str(e)})
+            logger.warning("Fetching %s failed: %s", name, e)
+            statuses[name] = {
+                "status": "error",
+                "error": str(e),
+                "error_class": type(e).__name__,
+            }
+            continue
+
+        state = states[name]
+        all_news.extend(source_news)
+        statuses[name] = {
+            "status": "not_modified" if state["not_modified"] else "ok",
+            "count": len(source_news),
+            "elapsed_ms": state["fetch_ms"] + state["parse_ms"],
+            "fetch_ms": state["fetch_ms"],
+            "parse_ms": state["parse_ms"],
+            "bytes": 0 if state["not_modified"] else state["bytes"],
+            "bytes_saved": state["bytes_saved"],
+        }
+
+    for future in pending:
+        statuses[futures[future]] = {
+            "status": "timeout",
+            "elapsed_ms": round((time.monotonic() - started) * 1000),
+        }
+
+    all_news = sorted(
+        all_news,
+        key=lambda x: x["published_at"].isoformat() if x["published_at"] else "",
+        reverse=True,
+    )
+
+    return {"results": all_news, "sources": statuses}
+
+
+def circuit_state(open_until, now):
+    """``closed``, ``open`` (skip the feed) or ``half_open`` (allow a probe)."""
+    if open_until is None:
+        return "closed"
+    return "open" if now < open_until else "half_open"
+
+
+def allow_fetch(name, state, now):
+    """
+    Whether the breaker lets this feed be fetched now.
+
+    Once the backoff has passed a single probe goes through; the cache lock
+    keeps concurrent ingestion runs from all probing a feed that is still down.
+    """
+    circuit = circuit_state(state.get("open_until"), now)
+    if circuit == "closed":
+        return True
+    if circuit == "open":
+        return False
+    state["probing"] = cache.add(probe_key(name), True, REFRESH_LOCK_TTL)
+    return state["probing"]
+
+
+def probe_key(name):
+    return f"news:probe:{name}"
+
+
+def release_probes(states):
+    """Free the probe locks taken for this run once the outcomes are saved."""
+    cache.delete_many(
+        [probe_key(name) for name, state in states.items() if state.get("probing")]
+    )
+
 
-    all_news = sorted(all_news, key=lambda x: x.get("parsed_date", ""), reverse=True)
+def backoff_until(failures, now):
+    delay = BREAKER_BASE_BACKOFF * 2 ** (failures - BREAKER_THRESHOLD)
+    return now + timedelta(seconds=min(delay, BREAKER_MAX_BACKOFF))
+
+
+INGEST_UPDATE_FIELDS = [
+    "source_name",
+    "title",
+    "description",
+    "link",
+    "category",
+    "author",
+    "image_url",
+    "updated_at",
+]
+
+
+def to_news_item(item, fetched_at):
+    """
+    The ``NewsItem`` row for a scraped item, or None if its link doesn't fit.
+
+    Cutting a URL short would break it, so an over-long image URL is dropped
+    and an item with an over-long link is skipped; either would otherwise
+    fail the whole insert batch.
+    """
+    if len(item["link"]) > MAX_URL_LENGTH:
+        logger.info("Skipping %s item with a too long link", item["source_name"])
+        return None
+
+    image_url = item["image_url"]
+    if image_url and len(image_url) > MAX_URL_LENGTH:
+        image_url = None
+
+    return NewsItem(
+        guid=item["guid"][:500],
+        source_name=item["source_name"],
+        title=item["title"][:500],
+        description=item["description"],
+        link=item["link"],
+        category=item["category"][:255],
+        author=(item["author"] or "")[:255],
+        image_url=image_url,
+        published_at=item["published_at"] or fetched_at,
+        updated_at=fetched_at,
+    )
+
+
+def load_source_states(names):
+    """Conditional-fetch state for each source from its ``NewsSource`` row."""
+    return {
+        source.name: {
+            "etag": source.etag,
+            "modified": source.last_modified,
+            "seen_guids": source.seen_guids,
+            "bytes": source.last_bytes,
+            "open_until": source.open_until,
+        }
+        for source in NewsSource.objects.filter(name__in=names)
+    }
+
+
+def save_source_states(statuses, states, checked_at):
+    for name, status in statuses.items():
+        # Skipped by the breaker, nothing was fetched
+        if status["status"] == "open":
+            continue
+
+        source, _ = NewsSource.objects.get_or_create(name=name)
+        source.last_status = status["status"]
+        source.last_checked_at = checked_at
+        record_health(source, status, checked_at)
+
+        # Failed or timed out fetches keep the validators from the last success
+        if status["status"] in ("ok", "not_modified"):
+            state = states[name]
+            source.last_fetch_ms = state["fetch_ms"]
+            source.last_parse_ms = state["parse_ms"]
+            source.bytes_saved += state["bytes_saved"]
+            if status["status"] == "ok":
+                source.etag = state["etag"]
+                source.last_modified = state["modified"]
+                source.seen_guids = state["seen_guids"]
+                source.last_bytes = state["bytes"]
+
+        source.save()
+
+
+def record_health(source, status, checked_at):
+    """Update the breaker and health metrics of one feed after a fetch."""
+    if "elapsed_ms" in status:
+        source.latencies_ms = [status["elapsed_ms"], *source.latencies_ms][
+            :LATENCY_WINDOW
+        ]
+
+    if status["status"] in ("error", "timeout"):
+        source.consecutive_failures += 1
+        source.last_error = status.get("error") or "Timed out"
+        source.last_error_class = status.get("error_class") or "Timeout"
+        if source.consecutive_failures >= BREAKER_THRESHOLD:
+            source.open_until = backoff_until(source.consecutive_failures, checked_at)
+        return
+
+    source.consecutive_failures = 0
+    source.open_until = None
+    source.last_error = ""
+    source.last_error_class = ""
+    source.last_success_at = checked_at
+    source.last_item_count = status["count"]
+    source.items_total += status["count"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, or None without samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def source_health(sources=None):
+    """Breaker state, latency percentiles and item counts for every feed."""
+    sources = NEWS_SOURCES if sources is None else sources
+    rows = {
+        source.name: source for source in NewsSource.objects.filter(name__in=sources)
+    }
+    stored = dict(
+        NewsItem.objects.filter(source_name__in=sources)
+        .order_by()
+        .values_list("source_name")
+        .annotate(Count("id"))
+    )
+    now = timezone.now()
+
+    health = []
+    for name, url in sources.items():
+        source = rows.get(name) or NewsSource(name=name)
+        latencies = source.latencies_ms
+        health.append(
+            {
+                "name": name,
+                "url": url,
+                "circuit": circuit_state(source.open_until, now),
+                "consecutive_failures": source.consecutive_failures,
+                "open_until": source.open_until,
+                "last_status": source.last_status,
+                # The message can name hosts and addresses; admins see it
+                "last_error_class": source.last_error_class,
+                "last_checked_at": source.last_checked_at,
+                "last_success_at": source.last_success_at,
+                "latency_ms": {
+                    "p50": percentile(latencies, 50),
+                    "p90": percentile(latencies, 90),
+                    "p99": percentile(latencies, 99),
+                    "samples": len(latencies),
+                },
+                "last_item_count": source.last_item_count,
+                "items_total": source.items_total,
+                "stored_items": stored.get(name, 0),
+                "bytes_saved": source.bytes_saved,
+            }
+        )
+
+    return health
+
+
+def ingest_news(sources=None):
+    """
+    Scrape the feeds and upsert new politics items into ``NewsItem`` by guid.
+
+    Feeds are fetched conditionally and only entries missing from the last
+    fetch are processed. The same guid can show up twice in one scrape, so
+    rows are deduplicated before the single ``INSERT ... ON CONFLICT``.
+    """
+    sources = NEWS_SOURCES if sources is None else sources
+    states = load_source_states(sources)
+    data = scrape_all_sources(sources, states=states)
+    fetched_at = timezone.now()
+
+    items = {}
+    for item in data["results"]:
+        news_item = to_news_item(item, fetched_at)
+        if news_item is not None:
+            items.setdefault(news_item.guid, news_item)
+
+    try:
+        NewsItem.objects.bulk_create(
+            items.values(),
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["guid"],
+            update_fields=INGEST_UPDATE_FIELDS,
+        )
+        save_source_states(data["sources"], states, fetched_at)
+    finally:
+        release_probes(states)
+
+    if items:
+        saved = NewsItem.objects.filter(guid__in=items.keys())
+        tag_mentions(saved)
+        cluster_items(
+            saved.filter(story__isnull=True).only(
+                "id", "title", "description", "published_at", "story_id"
+            )
+        )
+
+    return {"ingested": len(items), "sources": data["sources"]}
+
+
+def tag_mentions(news_items, index=None):
+    """
+    Record which politicians and parties each news item names.
+
+    Builds the name index once per call, then scans every item's title and
+    description with it; existing mentions are left untouched.
+    """
+    index = EntityIndex.build() if index is None else index
+    mentions = []
+
+    for item in news_items.only("id", "title", "description", "published_at"):
+        politician_ids, party_ids = index.find(f"{item.title} {item.description}")
+        mentions.extend(
+            NewsMention(
+                news_item_id=item.id,
+                politician_id=politician_id,
+                published_at=item.published_at,
+            )
+            for politician_id in politician_ids
+        )
+        mentions.extend(
+            NewsMention(
+                news_item_id=item.id,
+                party_id=party_id,
+                published_at=item.published_at,
+            )
+            for party_id in party_ids
+        )
+
+    NewsMention.objects.bulk_create(mentions, batch_size=500, ignore_conflicts=True)
+    return len(mentions)
+
+
+def fresh_key(name):
+    return f"news:fresh:{name}"
+
+
+def refresh_source(name, url):
+    """
+    Ingest one source in the background, then mark it fresh.
+
+    A failed fetch or ingestion only holds off readers for a short while, so
+    the source is tried again well before a successful refresh would expire.
+    """
+    close_old_connections()
+    fresh_for = REFRESH_RETRY_TTL
+    try:
+        result = ingest_news({name: url})
+        if result["sources"][name]["status"] not in ("error", "timeout"):
+            fresh_for = settings.NEWS_FRESH_TTL
+    except Exception:
+        logger.exception("Background refresh of %s failed", name)
+    finally:
+        cache.set(fresh_key(name), True, fresh_for)
+        cache.delete(f"news:refresh-lock:{name}")
+        close_old_connections()
+
+
+def refresh_stale_sources(sources=None):
+    """
+    Stale-while-revalidate for the news feeds.
+
+    Readers are always answered from stored items; any source whose
+    freshness marker expired gets its own background refresh, guarded by a
+    cache lock so only one worker refreshes it at a time. Returns the
+    futures of the refreshes started.
+    """
+    if not settings.NEWS_BACKGROUND_REFRESH:
+        return []
+
+    sources = NEWS_SOURCES if sources is None else sources
+    fresh = cache.get_many([fresh_key(name) for name in sources])
+    futures = []
+
+    for name, url in sources.items():
+        if fresh.get(fresh_key(name)):
+            continue
+        if not cache.add(f"news:refresh-lock:{name}", True, REFRESH_LOCK_TTL):
+            continue
+        futures.append(refresh_executor.submit(refresh_source, name, url))
 
-    return all_news
+    return futures
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+POLITICS_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Local feed</title>
+    <item>
+      <title>संसद बैठक आज</title>
+      <link>https://example.com/news/1</link>
+      <guid isPermaLink="false">https://example.com/?p=1</guid>
+      <description>सरकारको नयाँ नीति</description>
+      <pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Cricket team wins</title>
+      <link>https://example.com/news/2</link>
+      <guid isPermaLink="false">https://example.com/?p=2</guid>
+      <description>Sports update</description>
+      <pubDate>Mon, 06 Jan 2025 09:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+@pytest.fixture(autouse=True)
+def disable_redis_cache():
+    # Automatically disable Redis cache and background feed refreshes.
+    with override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+            }
+        },
+        NEWS_BACKGROUND_REFRESH=False,
+    ):
+        yield
+
+
+@pytest.fixture
+def locmem_cache():
+    # A working cache for tests that need one, instead of the dummy above
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    ):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serves canned feeds with ETags; ``/slow`` sleeps, ``/broken`` fails."""
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(2)
+
+        if self.path.startswith("/broken"):
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = self.server.feeds.get(self.path, POLITICS_FEED).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    """Local stand-in for the news feeds, yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    server.daemon_threads = True
+    server.feeds = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from news_api import services
+from news_api.models import NewsSource
+from news_api.services import (
+    BREAKER_THRESHOLD,
+    ingest_news,
+    percentile,
+    probe_key,
+)
+
+
+# ---------------------------
+# BREAKER: OPEN AFTER FAILURES
+# ---------------------------
+@pytest.mark.django_db
+def test_breaker_opens_and_skips_failing_feed(feed_server):
+    sources = {"flaky": f"{feed_server.base_url}/broken"}
+
+    for _ in range(BREAKER_THRESHOLD):
+        result = ingest_news(sources)
+        assert result["sources"]["flaky"]["status"] == "error"
+
+    source = NewsSource.objects.get(name="flaky")
+    assert source.consecutive_failures == BREAKER_THRESHOLD
+    assert source.open_until > timezone.now()
+
+    result = ingest_news(sources)
+
+    assert result["sources"]["flaky"]["status"] == "open"
+    source.refresh_from_db()
+    assert source.consecutive_failures == BREAKER_THRESHOLD
+
+
+# ---------------------------
+# BREAKER: HALF-OPEN PROBES
+# ---------------------------
+@pytest.mark.django_db
+def test_failed_probe_doubles_backoff(feed_server):
+    now = timezone.now()
+    NewsSource.objects.create(
+        name="flaky",
+        consecutive_failures=BREAKER_THRESHOLD,
+        open_until=now - timedelta(seconds=1),
+    )
+
+    result = ingest_news({"flaky": f"{feed_server.base_url}/broken"})
+
+    assert result["sources"]["flaky"]["status"] == "error"
+    source = NewsSource.objects.get(name="flaky")
+    assert source.consecutive_failures == BREAKER_THRESHOLD + 1
+    backoff = source.open_until - now
+    assert timedelta(seconds=110) < backoff < timedelta(seconds=130)
+
+
+@pytest.mark.django_db
+def test_successful_probe_closes_breaker(feed_server):
+    NewsSource.objects.create(
+        name="flaky",
+        consecutive_failures=BREAKER_THRESHOLD,
+        open_until=timezone.now() - timedelta(seconds=1),
+        last_error="500 Server Error",
+    )
+
+    result = ingest_news({"flaky": f"{feed_server.base_url}/feed"})
+
+    assert result["sources"]["flaky"]["status"] == "ok"
+    source = NewsSource.objects.get(name="flaky")
+    assert source.consecutive_failures == 0
+    assert source.open_until is None
+    assert source.last_error == ""
+    assert source.last_success_at is not None
+    assert source.items_total == 1
+
+
+
+@pytest.mark.django_db
+def test_probe_lock_released_after_probe(feed_server, locmem_cache):
+    NewsSource.objects.create(
+        name="flaky",
+        consecutive_failures=BREAKER_THRESHOLD,
+        open_until=timezone.now() - timedelta(seconds=1),
+    )
+
+    ingest_news({"flaky": f"{feed_server.base_url}/broken"})
+
+    assert cache.get(probe_key("flaky")) is None
+
+# ---------------------------
+# HEALTH ENDPOINT
+# ---------------------------
+@pytest.mark.django_db
+def test_source_health_reports_metrics(feed_server, monkeypatch):
+    sources = {
+        "good": f"{feed_server.base_url}/feed",
+        "bad": f"{feed_server.base_url}/broken",
+    }
+    monkeypatch.setattr(services, "NEWS_SOURCES", sources)
+    for _ in range(BREAKER_THRESHOLD):
+        ingest_news(sources)
+
+    response = APIClient().get(reverse("news-source-health"))
+
+    assert response.status_code == 200  # type: ignore
+    health = {row["name"]: row for row in response.data["sources"]}  # type: ignore
+    assert health["good"]["circuit"] == "closed"
+    assert health["good"]["items_total"] == 1
+    assert health["good"]["stored_items"] == 1
+    assert health["good"]["latency_ms"]["samples"] == BREAKER_THRESHOLD
+    assert health["good"]["latency_ms"]["p50"] is not None
+    assert health["bad"]["circuit"] == "open"
+    assert health["bad"]["last_success_at"] is None
+    assert health["bad"]["last_error_class"] == "HTTPError"
+    assert "last_error" not in health["bad"]
+    assert "500" in NewsSource.objects.get(name="bad").last_error
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 90) == 7
+    assert percentile([], 50) is None
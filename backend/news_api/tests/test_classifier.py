@@ -0,0 +1,46 @@
+import json
+
+from news_api.classifier import KeywordClassifier, classifier_for_source
+from news_api.management.commands.benchmark_classifier import (
+    DEFAULT_CORPUS,
+    legacy_is_politics,
+)
+from news_api.services import is_politics
+
+
+def test_classify_returns_spans_and_score():
+    classifier = KeywordClassifier({"सरकार": 1.0, "Election": 2.0})
+
+    result = classifier.classify("New election as सरकार falls")
+
+    assert result["score"] == 3.0
+    assert result["matches"] == [("election", 4, 12), ("सरकार", 16, 21)]
+
+
+def test_weighted_keywords_need_threshold():
+    classifier = KeywordClassifier({"दल": 0.5, "संसद": 1.0})
+
+    assert not classifier.is_match("खेलकुद दल")
+    assert classifier.is_match("दल र दल")
+    assert classifier.is_match("संसद")
+
+
+def test_source_keywords_are_merged(monkeypatch):
+    monkeypatch.setattr(
+        "news_api.classifier.SOURCE_KEYWORDS", {"local": {"parliament": 1.0}}
+    )
+    classifier_for_source.cache_clear()
+
+    try:
+        assert is_politics("Parliament session", source="local")
+        assert not is_politics("Parliament session", source="other")
+    finally:
+        classifier_for_source.cache_clear()
+
+
+def test_matches_legacy_keyword_scan_on_synthetic_entries():
+    entries = json.loads(DEFAULT_CORPUS.read_text(encoding="utf-8"))
+
+    for entry in entries:
+        text = f"{entry['title']} {entry['summary']}"
+        assert is_politics(text) == legacy_is_politics(text), entry["title"]
@@ -0,0 +1,73 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from news_api.dedup import minhash, similarity
+from news_api.models import NewsItem
+from news_api.services import ingest_news
+
+
+def story_feed(guid, title, description):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Story</title>
+    <item>
+      <title>{title}</title>
+      <link>https://example.com/{guid}</link>
+      <guid isPermaLink="false">https://example.com/?p={guid}</guid>
+      <description>{description}</description>
+      <pubDate>Thu, 09 Jan 2025 08:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def test_minhash_similarity_tracks_overlap():
+    first = minhash("संसदको बैठक आज बिहान ११ बजे बस्दै, सरकारले विधेयक पेस गर्ने")
+    second = minhash("संसदको बैठक आज बिहान ११ बजे बस्दै; सरकारले विधेयक पेश गर्ने")
+    other = minhash("नेपाली क्रिकेट टोलीले एसिया कपमा जित हासिल गर्‍यो")
+
+    assert similarity(first, second) > 0.6
+    assert similarity(first, other) < 0.2
+
+
+# ---------------------------
+# INGEST: NEAR-DUPLICATE STORIES
+# ---------------------------
+@pytest.mark.django_db
+def test_ingest_clusters_near_duplicates_across_sources(feed_server):
+    feed_server.feeds["/a"] = story_feed(
+        "a1",
+        "संसदको बैठक आज बिहान ११ बजे बस्दै",
+        "सरकारले बजेट विधेयक पेस गर्ने तयारी गरेको छ",
+    )
+    feed_server.feeds["/b"] = story_feed(
+        "b1",
+        "संसदको बैठक आज बिहान ११ बजे बस्दै",
+        "सरकारले बजेट विधेयक पेश गर्ने तयारी गरेको छ।",
+    )
+    feed_server.feeds["/c"] = story_feed(
+        "c1",
+        "माओवादी केन्द्रको स्थायी कमिटी बैठक",
+        "आगामी निर्वाचनमा गठबन्धनबारे छलफल हुने",
+    )
+
+    ingest_news({"first": f"{feed_server.base_url}/a"})
+    ingest_news(
+        {"second": f"{feed_server.base_url}/b", "third": f"{feed_server.base_url}/c"}
+    )
+
+    first = NewsItem.objects.get(source_name="first")
+    second = NewsItem.objects.get(source_name="second")
+    third = NewsItem.objects.get(source_name="third")
+    assert first.story_id == first.id
+    assert second.story_id == first.id
+    assert third.story_id == third.id
+
+    response = APIClient().get(reverse("politics-news"), {"group": "story"})
+    results = {r["source_name"]: r for r in response.data["results"]}  # type: ignore
+    assert set(results) == {"first", "third"}
+    assert [a["source_name"] for a in results["first"]["alternates"]] == ["second"]
+    assert results["third"]["alternates"] == []
@@ -0,0 +1,99 @@
+import tracemalloc
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from news_api.feedstream import iter_entries
+from news_api.management.commands.profile_feed_parser import (
+    stream_entries,
+    synthetic_feed,
+)
+from news_api.services import scrape_source
+
+ATOM_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+  <title>Atom feed</title>
+  <entry>
+    <id>tag:example.com,2025:1</id>
+    <title>Parliament passes budget</title>
+    <link rel="alternate" href="https://example.com/atom/1"/>
+    <summary>&lt;p&gt;The government budget passed.&lt;/p&gt;</summary>
+    <author><name>Reporter</name></author>
+    <published>2025-01-06T10:00:00+05:45</published>
+    <media:thumbnail url="https://example.com/1.jpg"/>
+  </entry>
+</feed>
+"""
+
+MALFORMED_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <item>
+      <title>संसद&nbsp;बैठक</title>
+      <link>https://example.com/news/9</link>
+      <guid isPermaLink="false">https://example.com/?p=9</guid>
+      <description>सरकारको नयाँ नीति</description>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def chunked(text, size=7):
+    body = text.encode()
+    return (body[i : i + size] for i in range(0, len(body), size))
+
+
+# ---------------------------
+# STREAMING: NORMALIZATION
+# ---------------------------
+def test_iter_entries_normalizes_atom():
+    [entry] = list(iter_entries(chunked(ATOM_FEED)))
+
+    assert entry["guid"] == "tag:example.com,2025:1"
+    assert entry["link"] == "https://example.com/atom/1"
+    assert entry["description"] == "The government budget passed."
+    assert entry["author"] == "Reporter"
+    assert entry["image_url"] == "https://example.com/1.jpg"
+    assert entry["published_at"] == datetime(2025, 1, 6, 4, 15, tzinfo=dt_timezone.utc)
+
+
+def test_iter_entries_keeps_memory_flat():
+    def peak(items):
+        body = synthetic_feed(items)
+        tracemalloc.start()
+        assert stream_entries(body) == items
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    # Twenty times the entries must not need anywhere near twenty times the memory
+    assert peak(1000) < peak(50) * 3
+
+
+# ---------------------------
+# STREAMING: SCRAPE
+# ---------------------------
+def test_scrape_source_stops_at_seen_entries(feed_server):
+    feed_server.feeds["/big"] = synthetic_feed(200).decode()
+    seen = [f"https://example.com/?p={i}" for i in range(5, 200)]
+    state = {"seen_guids": seen}
+
+    results = scrape_source("local", f"{feed_server.base_url}/big", state=state)
+
+    assert [item["guid"] for item in results] == [
+        f"https://example.com/?p={i}" for i in range(5)
+    ]
+    assert state["bytes"] < len(feed_server.feeds["/big"].encode())
+    assert state["seen_guids"][:6] == [
+        *(f"https://example.com/?p={i}" for i in range(5)),
+        "https://example.com/?p=5",
+    ]
+
+
+def test_scrape_source_falls_back_on_malformed_xml(feed_server):
+    feed_server.feeds["/malformed"] = MALFORMED_FEED
+
+    results = scrape_source("local", f"{feed_server.base_url}/malformed")
+
+    assert [item["guid"] for item in results] == ["https://example.com/?p=9"]
+    assert results[0]["author"] == "local"
@@ -0,0 +1,147 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from news_api.models import NewsItem, NewsSource
+from news_api.services import ingest_news
+
+SECOND_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Other feed</title>
+    <item>
+      <title>नयाँ सरकार गठन</title>
+      <link>https://example.org/news/9</link>
+      <guid isPermaLink="false">https://example.org/?p=9</guid>
+      <pubDate>Tue, 07 Jan 2025 08:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+# ---------------------------
+# INGEST: GUID DEDUPLICATION
+# ---------------------------
+@pytest.mark.django_db
+def test_ingest_news_upserts_by_guid(feed_server):
+    sources = {
+        "first": f"{feed_server.base_url}/feed",
+        "mirror": f"{feed_server.base_url}/feed",
+    }
+
+    result = ingest_news(sources)
+    ingest_news(sources)
+
+    assert result["ingested"] == 1
+    assert NewsItem.objects.count() == 1
+    item = NewsItem.objects.get()
+    assert item.guid == "https://example.com/?p=1"
+    assert item.published_at.isoformat() == "2025-01-06T10:00:00+00:00"
+
+
+@pytest.mark.django_db
+def test_ingest_news_command(feed_server, monkeypatch):
+    monkeypatch.setattr(
+        "news_api.services.NEWS_SOURCES", {"local": f"{feed_server.base_url}/feed"}
+    )
+
+    call_command("ingest_news")
+
+    assert NewsItem.objects.filter(source_name="local").count() == 1
+
+
+
+@pytest.mark.django_db
+def test_ingest_news_drops_urls_too_long_to_store(feed_server):
+    long_url = "https://example.org/" + "a" * 1000
+    feed_server.feeds["/long"] = f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Long links</title>
+    <item>
+      <title>संसद बैठक आज</title>
+      <link>{long_url}</link>
+      <guid isPermaLink="false">https://example.org/?p=1</guid>
+    </item>
+    <item>
+      <title>नयाँ सरकार गठन</title>
+      <link>https://example.org/news/2</link>
+      <guid isPermaLink="false">https://example.org/?p=2</guid>
+      <enclosure url="{long_url}.jpg" type="image/jpeg" length="1" />
+    </item>
+  </channel>
+</rss>
+"""
+
+    result = ingest_news({"long": f"{feed_server.base_url}/long"})
+
+    assert result["ingested"] == 1
+    item = NewsItem.objects.get()
+    assert item.link == "https://example.org/news/2"
+    assert item.image_url is None
+
+# ---------------------------
+# NEWS API: FILTERS + CURSOR PAGINATION
+# ---------------------------
+@pytest.mark.django_db
+def test_news_api_reads_from_storage(feed_server):
+    feed_server.feeds["/other"] = SECOND_FEED
+    ingest_news(
+        {
+            "first": f"{feed_server.base_url}/feed",
+            "second": f"{feed_server.base_url}/other",
+        }
+    )
+
+    client = APIClient()
+    url = reverse("politics-news")
+
+    response = client.get(url, {"page_size": 1})
+    assert response.status_code == 200  # type: ignore
+    assert [r["source_name"] for r in response.data["results"]] == ["second"]  # type: ignore
+
+    response = client.get(response.data["next"])  # type: ignore
+    assert [r["source_name"] for r in response.data["results"]] == ["first"]  # type: ignore
+
+    response = client.get(url, {"source": "first"})
+    assert len(response.data["results"]) == 1  # type: ignore
+
+    response = client.get(url, {"since": "2025-01-07"})
+    assert [r["source_name"] for r in response.data["results"]] == ["second"]  # type: ignore
+
+
+# ---------------------------
+# INGEST: CONDITIONAL FETCHING
+# ---------------------------
+@pytest.mark.django_db
+def test_ingest_news_skips_unchanged_feeds(feed_server):
+    sources = {"local": f"{feed_server.base_url}/other"}
+    feed_server.feeds["/other"] = SECOND_FEED
+
+    first = ingest_news(sources)
+    assert first["sources"]["local"]["status"] == "ok"
+
+    second = ingest_news(sources)
+    assert second["sources"]["local"]["status"] == "not_modified"
+    assert second["ingested"] == 0
+
+    source = NewsSource.objects.get(name="local")
+    assert source.etag
+    assert source.bytes_saved == len(SECOND_FEED.encode())
+
+    # Only the entry that was not in the previous fetch is processed
+    feed_server.feeds["/other"] = SECOND_FEED.replace(
+        "<item>",
+        """<item>
+      <title>संसद अधिवेशन</title>
+      <link>https://example.org/news/10</link>
+      <guid isPermaLink="false">https://example.org/?p=10</guid>
+    </item>
+    <item>""",
+        1,
+    )
+    third = ingest_news(sources)
+    assert third["ingested"] == 1
+    assert NewsItem.objects.count() == 2
@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from news_api.entities import EntityIndex
+from news_api.models import NewsMention
+from news_api.services import ingest_news
+from politicians.models import Party, Politician
+
+MENTION_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Mentions</title>
+    <item>
+      <title>केपी शर्मा ओलीले संसदमा जवाफ दिए</title>
+      <link>https://example.com/news/21</link>
+      <guid isPermaLink="false">https://example.com/?p=21</guid>
+      <description>एमालेको संसदीय दलको बैठक बस्यो</description>
+      <pubDate>Wed, 08 Jan 2025 08:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Government reshuffle: UML ministers sworn in</title>
+      <link>https://example.com/news/22</link>
+      <guid isPermaLink="false">https://example.com/?p=22</guid>
+      <pubDate>Wed, 08 Jan 2025 09:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+@pytest.fixture
+def uml(db):
+    party = Party.objects.create(name="CPN (UML)", short_name="UML", name_np="एमाले")
+    politician = Politician.objects.create(
+        name="KP Sharma Oli",
+        name_np="केपी शर्मा ओली",
+        party=party,
+        education="",
+        biography="",
+    )
+    return party, politician
+
+
+def test_entity_index_matches_latin_and_devanagari():
+    index = EntityIndex(
+        politicians=[(1, "KP Sharma Oli", "केपी शर्मा ओली")],
+        parties=[(7, "CPN (UML)", "UML", "एमाले")],
+    )
+
+    assert index.find("केपी  शर्मा ओलीले भने") == ({1}, set())
+    assert index.find("kp sharma oli met UML leaders") == ({1}, {7})
+    assert index.find("एमालेको बैठक") == (set(), {7})
+    # Latin aliases must be whole words
+    assert index.find("SIMULATION results") == (set(), set())
+
+
+# ---------------------------
+# INGEST: MENTION TAGGING + ENTITY NEWS
+# ---------------------------
+@pytest.mark.django_db
+def test_ingest_tags_mentions_and_serves_entity_news(feed_server, uml):
+    party, politician = uml
+    feed_server.feeds["/mentions"] = MENTION_FEED
+
+    ingest_news({"local": f"{feed_server.base_url}/mentions"})
+
+    assert NewsMention.objects.filter(politician=politician).count() == 1
+    assert NewsMention.objects.filter(party=party).count() == 2
+
+    client = APIClient()
+    response = client.get(reverse("politician-news", args=[politician.slug]))
+    assert response.status_code == 200  # type: ignore
+    assert [r["guid"] for r in response.data["results"]] == [  # type: ignore
+        "https://example.com/?p=21"
+    ]
+
+    response = client.get(reverse("party-news", args=[party.slug]))
+    assert [r["guid"] for r in response.data["results"]] == [  # type: ignore
+        "https://example.com/?p=22",
+        "https://example.com/?p=21",
+    ]
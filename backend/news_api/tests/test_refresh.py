@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import wait
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from news_api import services
+from news_api.models import NewsItem, NewsSource
+from news_api.services import (
+    REFRESH_RETRY_TTL,
+    fresh_key,
+    ingest_news,
+    refresh_source,
+    refresh_stale_sources,
+)
+
+
+@pytest.fixture
+def local_cache(locmem_cache, settings):
+    settings.NEWS_BACKGROUND_REFRESH = True
+
+
+# ---------------------------
+# STALE-WHILE-REVALIDATE
+# ---------------------------
+@pytest.mark.django_db(transaction=True)
+def test_stale_sources_refresh_in_background_once(feed_server, local_cache):
+    sources = {
+        "fast": f"{feed_server.base_url}/feed",
+        "slow": f"{feed_server.base_url}/slow",
+    }
+
+    futures = refresh_stale_sources(sources)
+    assert len(futures) == 2
+
+    # Locked while the refresh runs, so readers don't pile up more work
+    assert refresh_stale_sources(sources) == []
+
+    wait(futures)
+    assert NewsItem.objects.count() == 1
+    assert set(NewsSource.objects.values_list("name", "last_status")) == {
+        ("fast", "ok"),
+        ("slow", "ok"),
+    }
+
+    # Both sources are fresh now
+    assert refresh_stale_sources(sources) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_news_endpoint_answers_from_storage_while_refreshing(
+    feed_server, local_cache, monkeypatch
+):
+    monkeypatch.setattr(
+        "news_api.services.NEWS_SOURCES", {"slow": f"{feed_server.base_url}/slow"}
+    )
+
+    response = APIClient().get(reverse("politics-news"))
+
+    # Answered right away from (still empty) storage, refresh runs behind it
+    assert response.status_code == 200  # type: ignore
+    assert response.data["results"] == []  # type: ignore
+    assert cache.get("news:refresh-lock:slow")
+
+    # Let the background refresh finish before the test database goes away
+    deadline = time.monotonic() + 10
+    while cache.get("news:refresh-lock:slow") and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+@pytest.mark.django_db
+def test_failed_refresh_is_retried_soon(feed_server, local_cache, monkeypatch):
+    marked = {}
+    monkeypatch.setattr(
+        cache, "set", lambda key, value, timeout: marked.update({key: timeout})
+    )
+
+    refresh_source("bad", f"{feed_server.base_url}/broken")
+    assert marked[fresh_key("bad")] == REFRESH_RETRY_TTL
+
+    def crash(sources):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(services, "ingest_news", crash)
+    refresh_source("good", f"{feed_server.base_url}/feed")
+    assert marked[fresh_key("good")] == REFRESH_RETRY_TTL
+
+
+@pytest.mark.django_db
+def test_news_endpoint_shows_items_right_after_refresh(feed_server, locmem_cache):
+    url = reverse("politics-news")
+    assert APIClient().get(url).data["results"] == []  # type: ignore
+
+    ingest_news({"local": f"{feed_server.base_url}/feed"})
+
+    response = APIClient().get(url)
+    assert len(response.data["results"]) == 1  # type: ignore
@@ -0,0 +1,44 @@
+import time
+
+from news_api.services import scrape_all_sources, scrape_source
+
+
+# ---------------------------
+# SCRAPE: SINGLE SOURCE
+# ---------------------------
+def test_scrape_source_filters_politics(feed_server):
+    results = scrape_source("local", f"{feed_server.base_url}/feed")
+
+    assert [item["guid"] for item in results] == ["https://example.com/?p=1"]
+    assert results[0]["source_name"] == "local"
+
+
+# ---------------------------
+# SCRAPE: CONCURRENT WITH DEADLINE
+# ---------------------------
+def test_scrape_all_sources_returns_partial_results(feed_server):
+    sources = {
+        "fast": f"{feed_server.base_url}/feed",
+        "slow": f"{feed_server.base_url}/slow",
+        "broken": f"{feed_server.base_url}/broken",
+    }
+
+    started = time.monotonic()
+    data = scrape_all_sources(sources, deadline=0.5)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.5
+    assert [item["source_name"] for item in data["results"]] == ["fast"]
+    assert data["sources"]["fast"]["status"] == "ok"
+    assert data["sources"]["fast"]["count"] == 1
+    assert data["sources"]["slow"]["status"] == "timeout"
+    assert data["sources"]["broken"]["status"] == "error"
+
+
+def test_scrape_source_times_out(feed_server):
+    sources = {"slow": f"{feed_server.base_url}/slow"}
+
+    data = scrape_all_sources(sources, timeout=0.3)
+
+    assert data["results"] == []
+    assert data["sources"]["slow"]["status"] == "error"
@@ -1,7 +1,19 @@
 from django.urls import path
 
-from news_api.views import PoliticsNewsAPIView
+from news_api.views import (
+    PartyNewsView,
+    PoliticianNewsView,
+    PoliticsNewsAPIView,
+    SourceHealthView,
+)
 
 urlpatterns = [
-    path("news/", PoliticsNewsAPIView.as_view()),
+    path("news/", PoliticsNewsAPIView.as_view(), name="politics-news"),
+    path("news/sources/health/", SourceHealthView.as_view(), name="news-source-health"),
+    path(
+        "politicians/<slug:slug>/news/",
+        PoliticianNewsView.as_view(),
+        name="politician-news",
+    ),
+    path("parties/<slug:slug>/news/", PartyNewsView.as_view(), name="party-news"),
 ]
@@ -1,16 +1,116 @@
+import django_filters
+from django.db.models import F, Prefetch, Q
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from news_api.services import scrape_all_sources
+from news_api.models import NewsItem, NewsMention
+from news_api.serializers import (
+    NewsItemSerializer,
+    NewsMentionSerializer,
+    NewsStorySerializer,
+)
+from news_api.services import refresh_stale_sources, source_health
 
 
-class PoliticsNewsAPIView(APIView):
+class NewsCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-published_at", "-id")
+
+
+class NewsItemFilter(django_filters.FilterSet):
+    source = django_filters.CharFilter(field_name="source_name")
+    since = django_filters.IsoDateTimeFilter(
+        field_name="published_at", lookup_expr="gte"
+    )
+    until = django_filters.IsoDateTimeFilter(
+        field_name="published_at", lookup_expr="lt"
+    )
+
+    class Meta:
+        model = NewsItem
+        fields = ["source", "since", "until"]
+
+
+class PoliticsNewsAPIView(generics.ListAPIView):
+    permission_classes = [AllowAny]
+    pagination_class = NewsCursorPagination
+    query_budget = 2
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = NewsItemFilter
+
+    def group_by_story(self):
+        return self.request.query_params.get("group") == "story"
+
+    def get_queryset(self):
+        if not self.group_by_story():
+            return NewsItem.objects.all()
+
+        # One row per story: its first item, with the other sources attached
+        return NewsItem.objects.filter(
+            Q(story__isnull=True) | Q(story=F("id"))
+        ).prefetch_related(
+            Prefetch(
+                "alternates",
+                queryset=NewsItem.objects.only(
+                    "id", "story_id", "source_name", "title", "link"
+                ),
+            )
+        )
+
+    def get_serializer_class(self):
+        if self.group_by_story():
+            return NewsStorySerializer
+        return NewsItemSerializer
+
+    def dispatch(self, *args, **kwargs):
+        # Not page cached: the read is one indexed query, and a cached page
+        # would hide what the background refreshes just stored
+        refresh_stale_sources()
+        return super().dispatch(*args, **kwargs)
+
+
+class PoliticianNewsView(generics.ListAPIView):
+    serializer_class = NewsMentionSerializer
+    permission_classes = [AllowAny]
+    pagination_class = NewsCursorPagination
+    query_budget = 1
+
+    def get_queryset(self):
+        return NewsMention.objects.filter(
+            politician__slug=self.kwargs["slug"]
+        ).select_related("news_item")
+
+    @method_decorator(cache_page(60 * 5))
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+
+class PartyNewsView(generics.ListAPIView):
+    serializer_class = NewsMentionSerializer
+    permission_classes = [AllowAny]
+    pagination_class = NewsCursorPagination
+    query_budget = 1
+
+    def get_queryset(self):
+        return NewsMention.objects.filter(
+            party__slug=self.kwargs["slug"]
+        ).select_related("news_item")
+
+    @method_decorator(cache_page(60 * 5))
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+
+class SourceHealthView(APIView):
     permission_classes = [AllowAny]
 
-    @method_decorator(cache_page(60 * 60))
     def get(self, request):
-        data = scrape_all_sources()
-        return Response({"count": len(data), "results": data})
+        return Response({"sources": source_health()})
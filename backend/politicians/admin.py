@@ -60,7 +60,7 @@ class PoliticianAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_select_related = ("party",)
-    search_fields = ("name", "party__name", "location", "party_position")
+    search_fields = ("name", "name_np", "party__name", "location", "party_position")
     list_filter = ("party", "is_active", "party_position")
     readonly_fields = ("views", "created_at", "updated_at", "photo_preview", "slug")
 
@@ -70,6 +70,7 @@ class PoliticianAdmin(admin.ModelAdmin):
             {
                 "fields": (
                     "name",
+                    "name_np",
                     "photo",
                     "photo_preview",
                     "party",
@@ -120,7 +121,7 @@ class PoliticianAdmin(admin.ModelAdmin):
 @admin.register(Party)
 class PartyAdmin(admin.ModelAdmin):
     list_display = ("flag_preview", "name", "short_name", "created_at")
-    search_fields = ("name", "short_name")
+    search_fields = ("name", "short_name", "name_np")
     readonly_fields = ("flag_preview", "created_at", "updated_at")
     list_per_page = 25
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PoliticiansConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "politicians"
+
+    def ready(self):
+        from politicians import signals  # noqa: F401
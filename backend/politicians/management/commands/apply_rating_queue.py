@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from politicians.services import apply_pending_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply queued rating submissions in batches. Run with --loop as a "
+        "worker when RATING_WRITE_BEHIND is on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.RATING_QUEUE_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls of an empty queue",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total = 0
+
+        while True:
+            applied = apply_pending_ratings(batch_size)
+            total += applied
+            if applied == batch_size:
+                continue
+            if not options["loop"]:
+                break
+            if total:
+                self.stdout.write(f"Applied {total} queued ratings")
+                total = 0
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Applied {total} queued ratings"))
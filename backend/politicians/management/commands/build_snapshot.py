@@ -0,0 +1,203 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signing import BadSignature
+from django.utils import timezone
+
+from politicians.services import SYNC_STREAMS, build_sync_page
+
+SNAPSHOT_FORMAT = 3
+
+# sync stream -> (snapshot table, tombstone model name)
+TABLES = {
+    "parties": ("parties", "party"),
+    "politicians": ("politicians", "politician"),
+    "promises": ("promises", "promise"),
+    "initiatives": ("initiatives", "initiative"),
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_parties_slug ON parties (slug)",
+    "CREATE INDEX IF NOT EXISTS idx_politicians_slug ON politicians (slug)",
+    "CREATE INDEX IF NOT EXISTS idx_politicians_party ON politicians (party_id)",
+    "CREATE INDEX IF NOT EXISTS idx_politicians_active "
+    "ON politicians (is_active, party_id)",
+    "CREATE INDEX IF NOT EXISTS idx_promises_politician "
+    "ON promises (politician_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_initiatives_politician "
+    "ON initiatives (politician_id)",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a versioned, read-optimized SQLite snapshot of the public "
+        "dataset, updating an existing snapshot incrementally when possible."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the SQLite snapshot file")
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild from scratch instead of applying changes since the last build",
+        )
+        parser.add_argument(
+            "--parquet",
+            metavar="DIR",
+            help="Also write one Parquet file per table into DIR (needs pyarrow)",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        incremental = output.exists() and not options["full"]
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        # Build into a temporary copy so readers never see a half-written file
+        fd, tmp_name = tempfile.mkstemp(suffix=".sqlite3", dir=output.parent)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+
+        try:
+            if incremental:
+                shutil.copyfile(output, tmp_path)
+            else:
+                tmp_path.unlink()
+
+            conn = sqlite3.connect(tmp_path)
+            try:
+                version, counts = self.write_snapshot(conn, incremental)
+                conn.commit()
+                if not incremental:
+                    conn.execute("VACUUM")
+            finally:
+                conn.close()
+
+            os.replace(tmp_path, output)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        if options["parquet"]:
+            self.write_parquet(output, Path(options["parquet"]))
+
+        mode = "Updated" if incremental else "Built"
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(f"{mode} snapshot v{version} at {output} ({summary})")
+        )
+
+    def write_snapshot(self, conn, incremental):
+        self.create_schema(conn)
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+
+        if incremental and int(meta.get("format", 0)) != SNAPSHOT_FORMAT:
+            raise CommandError(
+                "Existing snapshot uses an older format, rebuild it with --full"
+            )
+
+        token = meta.get("sync_token") if incremental else None
+        counts = {name: 0 for name in [*TABLES, "rating_summaries", "deleted"]}
+
+        while True:
+            try:
+                page = build_sync_page(token)
+            except BadSignature:
+                raise CommandError(
+                    "Existing snapshot's sync token is no longer valid (was "
+                    "SECRET_KEY rotated?), rebuild it with --full"
+                )
+
+            for stream, (table, _) in TABLES.items():
+                self.upsert(conn, table, page[stream])
+                counts[stream] += len(page[stream])
+
+            self.upsert(conn, "rating_summaries", page["rating_summaries"])
+            counts["rating_summaries"] += len(page["rating_summaries"])
+
+            for tombstone in page["deleted"]:
+                self.delete(conn, tombstone)
+            counts["deleted"] += len(page["deleted"])
+
+            token = page["next"]
+            if not page["has_more"]:
+                break
+
+        version = int(meta.get("version", 0)) + 1
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("format", str(SNAPSHOT_FORMAT)),
+                ("version", str(version)),
+                ("built_at", timezone.now().isoformat()),
+                ("sync_token", token),
+            ],
+        )
+        return version, counts
+
+    def create_schema(self, conn):
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+
+        for stream, (table, _) in TABLES.items():
+            _, fields = SYNC_STREAMS[stream]
+            columns = ", ".join(
+                "id INTEGER PRIMARY KEY" if field == "id" else field for field in fields
+            )
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rating_summaries ("
+            "politician_id INTEGER PRIMARY KEY, average_rating REAL, rated_by INTEGER)"
+        )
+
+        for statement in INDEXES:
+            conn.execute(statement)
+
+    def upsert(self, conn, table, rows):
+        if not rows:
+            return
+
+        columns = list(rows[0])
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            [[row[column] for column in columns] for row in rows],
+        )
+
+    def delete(self, conn, tombstone):
+        for table, model in TABLES.values():
+            if model == tombstone["model"]:
+                conn.execute(f"DELETE FROM {table} WHERE id = ?", [tombstone["id"]])
+
+        # Summaries are derived rows without tombstones of their own
+        if tombstone["model"] == "politician":
+            conn.execute(
+                "DELETE FROM rating_summaries WHERE politician_id = ?",
+                [tombstone["id"]],
+            )
+
+    def write_parquet(self, snapshot, directory):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CommandError("Parquet output requires the pyarrow package")
+
+        directory.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(snapshot)
+        try:
+            for table in [name for name, _ in TABLES.values()] + ["rating_summaries"]:
+                cursor = conn.execute(f"SELECT * FROM {table}")
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+                data = {
+                    column: [row[i] for row in rows] for i, column in enumerate(columns)
+                }
+                pq.write_table(pa.table(data), directory / f"{table}.parquet")
+        finally:
+            conn.close()
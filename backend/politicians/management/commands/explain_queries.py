@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from politicians.models import Party, Politician
+from politicians.queryplans import (
+    endpoint_cases,
+    explain,
+    index_source,
+    missing_indexes,
+    plan_warnings,
+    replay,
+    seed,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the queries behind the public list endpoints, flag sequential "
+        "scans and unindexed sorts, and suggest the indexes that would help."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Add this many synthetic politicians (rolled back afterwards)",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run EXPLAIN ANALYZE where the database supports it",
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the full plan of every query"
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["scale"]:
+                party, politician = seed(options["scale"])
+            else:
+                party = Party.objects.first()
+                politician = Politician.objects.first()
+                if party is None or politician is None:
+                    raise CommandError("The database is empty, pass --scale to seed it")
+
+            suggestions = self.explain_cases(
+                endpoint_cases(party.id, party.slug, politician.slug), options
+            )
+
+            # The synthetic rows and the ANALYZE side effects never persist
+            transaction.set_rollback(True)
+
+        self.print_suggestions(suggestions)
+
+    def explain_cases(self, cases, options):
+        suggestions = defaultdict(list)
+        self.stdout.write(f"Explaining {len(cases)} queries on {connection.vendor}")
+
+        for case in cases:
+            plan = explain(replay(case), analyze=options["analyze"])
+            warnings = plan_warnings(plan)
+
+            status = (
+                self.style.WARNING("check") if warnings else self.style.SUCCESS("ok")
+            )
+            self.stdout.write(f"\n{case.label}: {status}")
+            for warning, detail in warnings:
+                self.stdout.write(f"  {warning}: {detail}")
+            if options["plans"]:
+                self.stdout.write("  " + plan.replace("\n", "\n  "))
+
+            if warnings:
+                for model, index in case.suggest:
+                    if index not in suggestions[model]:
+                        suggestions[model].append(index)
+
+        return suggestions
+
+    def print_suggestions(self, suggestions):
+        missing = {
+            model: indexes
+            for model, indexes in (
+                (model, missing_indexes(model, indexes))
+                for model, indexes in suggestions.items()
+            )
+            if indexes
+        }
+        if not missing:
+            self.stdout.write(self.style.SUCCESS("\nNo missing indexes to suggest"))
+            return
+
+        self.stdout.write(
+            "\nSuggested indexes (add to Meta.indexes, then run makemigrations):"
+        )
+        for model, indexes in missing.items():
+            self.stdout.write(f"\n  {model.__name__}:")
+            for index in indexes:
+                self.stdout.write(f"    {index_source(index)},")
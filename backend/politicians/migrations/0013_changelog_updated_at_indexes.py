@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("politicians", "0012_alter_politician_age"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=50)),
+                ("object_id", models.BigIntegerField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("deleted", "Deleted"), ("changed", "Changed")],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="initiatives",
+            index=models.Index(
+                fields=["updated_at", "id"], name="politicians_updated_35e751_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="party",
+            index=models.Index(
+                fields=["updated_at", "id"], name="politicians_updated_d6a12e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="politician",
+            index=models.Index(
+                fields=["updated_at", "id"], name="politicians_updated_a018bf_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="promises",
+            index=models.Index(
+                fields=["updated_at", "id"], name="politicians_updated_c67405_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["updated_at", "id"], name="politicians_updated_d2b2d9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="changelog",
+            index=models.Index(
+                fields=["created_at"], name="politicians_created_39105b_idx"
+            ),
+        ),
+    ]
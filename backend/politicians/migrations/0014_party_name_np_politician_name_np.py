@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("politicians", "0013_changelog_updated_at_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="party",
+            name="name_np",
+            field=models.CharField(
+                blank=True, help_text="Party name in Devanagari", max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="politician",
+            name="name_np",
+            field=models.CharField(
+                blank=True, help_text="Name in Devanagari", max_length=250
+            ),
+        ),
+    ]
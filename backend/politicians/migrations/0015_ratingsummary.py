@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def backfill_summaries(apps, schema_editor):
+    Rating = apps.get_model("politicians", "Rating")
+    RatingSummary = apps.get_model("politicians", "RatingSummary")
+
+    rows = (
+        Rating.objects.values("politician_id")
+        .annotate(average=Avg("score"), total=Count("id"))
+        .order_by()
+    )
+    RatingSummary.objects.bulk_create(
+        [
+            RatingSummary(
+                politician_id=row["politician_id"],
+                rated_by=row["total"],
+                average_rating=row["average"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("politicians", "0014_party_name_np_politician_name_np"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RatingSummary",
+            fields=[
+                (
+                    "politician",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_summary",
+                        serialize=False,
+                        to="politicians.politician",
+                    ),
+                ),
+                ("rated_by", models.PositiveIntegerField(default=0)),
+                ("average_rating", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Rating summaries",
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
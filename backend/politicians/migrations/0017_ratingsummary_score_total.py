@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:16
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_score_totals(apps, schema_editor):
+    Rating = apps.get_model("politicians", "Rating")
+    RatingSummary = apps.get_model("politicians", "RatingSummary")
+
+    totals = (
+        Rating.objects.filter(politician_id=OuterRef("politician_id"))
+        .order_by()
+        .values("politician_id")
+        .annotate(total=Sum("score"))
+        .values("total")
+    )
+    RatingSummary.objects.update(score_total=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("politicians", "0016_pendingrating"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ratingsummary",
+            name="score_total",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_score_totals, migrations.RunPython.noop),
+    ]
@@ -47,12 +47,18 @@ class Party(models.Model):
         help_text="Party flag or logo (max 5MB)",
     )
     short_name = models.CharField(max_length=50, blank=True, null=True)
+    name_np = models.CharField(
+        max_length=255, blank=True, help_text="Party name in Devanagari"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Parties"
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"]),
+        ]
 
     def __str__(self):
         return self.name
@@ -60,6 +66,9 @@ class Party(models.Model):
 
 class Politician(models.Model):
     name = models.CharField(max_length=250)
+    name_np = models.CharField(
+        max_length=250, blank=True, help_text="Name in Devanagari"
+    )
     slug = AutoSlugField(populate_from="name", unique=True, max_length=255)  # type: ignore
     views = models.PositiveIntegerField(default=0)
     photo = models.ImageField(
@@ -108,6 +117,7 @@ class Politician(models.Model):
             models.Index(fields=["slug"]),
             models.Index(fields=["-views"]),
             models.Index(fields=["is_active", "party"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
         ordering = ["-views"]
 
@@ -137,6 +147,7 @@ class Initiatives(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["politician", "-created_at"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
     def __str__(self):
@@ -166,6 +177,7 @@ class Promises(models.Model):
         indexes = [
             models.Index(fields=["politician", "status"]),
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
     def __str__(self):
@@ -202,6 +214,7 @@ class Rating(models.Model):
         indexes = [
             models.Index(fields=["politician", "-created_at"]),
             models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["updated_at", "id"]),
         ]
 
     def __str__(self):
@@ -218,3 +231,64 @@ class Rating(models.Model):
                     "You have already rated this politician. "
                     "Please edit your existing rating instead."
                 )
+
+
+class RatingSummary(models.Model):
+    """Stored rating count and average per politician, kept by rating writes."""
+
+    politician = models.OneToOneField(
+        Politician,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    rated_by = models.PositiveIntegerField(default=0)
+    # Sum of the scores, so writes can adjust the average without a recount
+    score_total = models.PositiveBigIntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Rating summaries"
+
+    def __str__(self):
+        return f"{self.politician_id}: {self.average_rating:.2f} ({self.rated_by})"
+
+
+class PendingRating(models.Model):
+    """A validated rating submission waiting for the queue worker to apply it."""
+
+    politician = models.ForeignKey(Politician, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    score = models.IntegerField(choices=Rating.RATING_CHOICES)
+    comment = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.politician_id} ({self.score}/5)"
+
+
+class ChangeLog(models.Model):
+    """Lightweight record of deletions and derived changes for delta sync."""
+
+    ACTION_CHOICES = [
+        ("deleted", "Deleted"),
+        ("changed", "Changed"),
+    ]
+
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.object_id} ({self.action})"
@@ -0,0 +1,238 @@
+import random
+import re
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Index, Q
+from django.test import RequestFactory
+
+from politicians.models import Party, Politician, Rating
+from politicians.views import (
+    PartyListView,
+    PartyPoliticiansView,
+    PoliticianListView,
+    PoliticianRatingListCreateView,
+)
+
+# (pattern, what it means) per database vendor; matched line by line
+PLAN_WARNINGS = {
+    "postgresql": [
+        (re.compile(r"Seq Scan on (\w+)"), "sequential scan"),
+        (re.compile(r"Sort Key: (.+)"), "sort without an index"),
+        (re.compile(r"Sort Method: external"), "sort spilled to disk"),
+    ],
+    "mysql": [
+        (re.compile(r"Table scan on (\w+)"), "sequential scan"),
+        (re.compile(r"Using filesort|Sort: (.+)"), "filesort"),
+    ],
+    "sqlite": [
+        (re.compile(r"\bSCAN (\w+)$"), "sequential scan"),
+        (
+            re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY)"),
+            "sort without an index",
+        ),
+    ],
+}
+
+
+# Indexes worth adding when a plan scans or sorts; named as the Meta would
+NAME_INDEX = (Politician, Index(fields=["name"], name="politician_name_idx"))
+AGE_INDEX = (Politician, Index(fields=["age"], name="politician_age_idx"))
+LOCATION_INDEX = (
+    Politician,
+    Index(fields=["location"], name="politician_location_idx"),
+)
+ACTIVE_VIEWS_INDEX = (
+    Politician,
+    Index(fields=["-views"], condition=Q(is_active=True), name="politician_active_idx"),
+)
+PARTY_NAME_INDEX = (
+    Politician,
+    Index(fields=["party", "name"], name="politician_party_name_idx"),
+)
+# Covers the rating aggregates, so they read the index instead of the table
+RATING_SCORE_INDEX = (
+    Rating,
+    Index(fields=["politician", "score"], name="rating_politician_score_idx"),
+)
+
+ORDERING_INDEXES = {
+    "name": [NAME_INDEX],
+    "age": [AGE_INDEX],
+    "average_rating_annotated": [RATING_SCORE_INDEX],
+    "total_ratings_annotated": [RATING_SCORE_INDEX],
+}
+
+
+@dataclass
+class Case:
+    """One endpoint request whose queryset is explained."""
+
+    label: str
+    view: type
+    params: dict = field(default_factory=dict)
+    kwargs: dict = field(default_factory=dict)
+    # (model, index) pairs to suggest if the plan has warnings
+    suggest: list = field(default_factory=list)
+
+
+def endpoint_cases(party_id, party_slug, politician_slug):
+    """The list, search, filter and ordering variants the API serves."""
+    cases = [
+        Case(
+            f"politicians ordering={ordering}",
+            PoliticianListView,
+            {"ordering": ordering},
+            suggest=ORDERING_INDEXES.get(name, []),
+        )
+        for name in PoliticianListView.ordering_fields
+        for ordering in (name, f"-{name}")
+    ]
+
+    return cases + [
+        Case("politicians search", PoliticianListView, {"search": "ra"}),
+        Case(
+            "politicians party filter",
+            PoliticianListView,
+            {"party": party_id},
+            suggest=[RATING_SCORE_INDEX],
+        ),
+        Case(
+            "politicians location filter",
+            PoliticianListView,
+            {"location": "Kathmandu"},
+            suggest=[LOCATION_INDEX],
+        ),
+        Case(
+            "active politicians by rating",
+            PoliticianListView,
+            {"is_active": "true", "ordering": "-average_rating_annotated"},
+            # The order is on an aggregate no politician index can hold; the
+            # covering index at least keeps the averaging off the table
+            suggest=[RATING_SCORE_INDEX],
+        ),
+        Case(
+            "active politicians by views",
+            PoliticianListView,
+            {"is_active": "true", "ordering": "-views"},
+            suggest=[ACTIVE_VIEWS_INDEX],
+        ),
+        Case(
+            "party politicians",
+            PartyPoliticiansView,
+            kwargs={"slug": party_slug},
+            suggest=[PARTY_NAME_INDEX],
+        ),
+        Case("parties", PartyListView),
+        Case(
+            "politician ratings",
+            PoliticianRatingListCreateView,
+            kwargs={"slug": politician_slug},
+        ),
+    ]
+
+
+def replay(case):
+    """The page queryset a GET to the case's endpoint would run."""
+    request = RequestFactory().get("/", case.params)
+    view = case.view(args=(), kwargs=case.kwargs, format_kwarg=None)
+    view.request = view.initialize_request(request)
+
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    if paginator is not None:
+        queryset = queryset[: paginator.get_page_size(view.request)]
+    return queryset
+
+
+def explain(queryset, analyze=False):
+    # Only PostgreSQL and MySQL can run the query while explaining it
+    if analyze and connection.vendor in ("postgresql", "mysql"):
+        return queryset.explain(analyze=True)
+    return queryset.explain()
+
+
+def plan_warnings(plan):
+    """(warning, detail) for each suspicious node of a plan."""
+    found = []
+    for line in plan.splitlines():
+        for pattern, warning in PLAN_WARNINGS.get(connection.vendor, []):
+            match = pattern.search(line.strip())
+            if match:
+                detail = match.group(1) if match.groups() else line.strip()
+                found.append((warning, detail))
+    return found
+
+
+def missing_indexes(model, indexes):
+    """The suggested indexes the model doesn't declare yet."""
+    declared = {(tuple(index.fields), index.condition) for index in model._meta.indexes}
+    return [
+        index
+        for index in indexes
+        if (tuple(index.fields), index.condition) not in declared
+    ]
+
+
+def index_source(index):
+    """The index as it would be written in the model's Meta.indexes."""
+    source = f"models.Index(fields={list(index.fields)!r}"
+    if index.condition is not None:
+        conditions = ", ".join(
+            f"{lookup}={value!r}" for lookup, value in index.condition.children
+        )
+        source += f", condition=models.Q({conditions})"
+    return source + f", name={index.name!r})"
+
+
+def seed(politicians, ratings_per_politician=5, users=200, parties=20):
+    """
+    Insert a synthetic dataset so the planner sees realistic table sizes.
+
+    Meant to run inside a transaction that is rolled back afterwards.
+    """
+    rng = random.Random(0)
+    locations = ["Kathmandu", "Lalitpur", "Pokhara", "Biratnagar", "Chitwan"]
+
+    party_rows = Party.objects.bulk_create(
+        Party(name=f"Advisor Party {i}", slug=f"advisor-party-{i}")
+        for i in range(parties)
+    )
+    user_rows = User.objects.bulk_create(
+        User(username=f"advisor-user-{i}") for i in range(users)
+    )
+    politician_rows = Politician.objects.bulk_create(
+        Politician(
+            name=f"Advisor Politician {i}",
+            slug=f"advisor-politician-{i}",
+            party=rng.choice(party_rows),
+            location=rng.choice(locations),
+            age=rng.randint(25, 90),
+            views=rng.randint(0, 10_000),
+            is_active=rng.random() < 0.8,
+            education="",
+            biography="",
+        )
+        for i in range(politicians)
+    )
+    Rating.objects.bulk_create(
+        (
+            Rating(politician=politician, user=user, score=rng.randint(1, 5))
+            for politician in politician_rows
+            for user in rng.sample(user_rows, min(ratings_per_politician, users))
+        ),
+        batch_size=1000,
+    )
+
+    # Refresh the planner statistics for the new rows
+    with connection.cursor() as cursor:
+        if connection.vendor in ("postgresql", "sqlite"):
+            cursor.execute("ANALYZE")
+        elif connection.vendor == "mysql":
+            tables = ", ".join(
+                model._meta.db_table for model in (Party, Politician, Rating)
+            )
+            cursor.execute(f"ANALYZE TABLE {tables}")
+
+    return party_rows[0], politician_rows[0]
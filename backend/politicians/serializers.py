@@ -1,9 +1,45 @@
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Avg
 from rest_framework import serializers
 
 from politicians.models import Initiatives, Party, Politician, Promises, Rating
 
 
+def serializer_columns(serializer_class):
+    """
+    The model fields a serializer reads, as paths for ``QuerySet.only()``.
+
+    Sources through forward relations become ``party__name`` style paths.
+    Annotations, properties, method fields and reverse relations aren't
+    columns of the queried tables and are left out.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    columns = []
+
+    for field in serializer.fields.values():
+        if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+            continue
+
+        path, current = [], model
+        for attr in field.source_attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                path = []
+                break
+            if not model_field.concrete:
+                path = []
+                break
+            path.append(attr)
+            if model_field.is_relation:
+                current = model_field.related_model
+
+        if path:
+            columns.append("__".join(path))
+    return columns
+
+
 class PartySerializer(serializers.ModelSerializer):
     politician_count = serializers.SerializerMethodField()
 
@@ -22,7 +58,11 @@ class PartySerializer(serializers.ModelSerializer):
         read_only_fields = ["slug", "created_at", "updated_at"]
 
     def get_politician_count(self, obj):
-        return obj.politicians.filter(is_active=True).count()
+        # Annotated by the party views; counted per object elsewhere
+        count = getattr(obj, "active_politician_count", None)
+        if count is None:
+            count = obj.politicians.filter(is_active=True).count()
+        return count
 
 
 class PoliticianSerializer(serializers.ModelSerializer):
@@ -47,6 +87,15 @@ class PoliticianSerializer(serializers.ModelSerializer):
             "views",
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+
+        # Present only when the view resolved the user's ratings for the page
+        my_ratings = self.context.get("my_ratings")
+        if my_ratings is not None:
+            data["my_rating"] = my_ratings.get(instance.slug)
+        return data
+
 
 class RatingSerializer(serializers.ModelSerializer):
     user_id = serializers.ReadOnlyField(source="user.id")
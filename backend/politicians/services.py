@@ -0,0 +1,709 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    F,
+    FloatField,
+    Prefetch,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Now
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from politicians.models import (
+    ChangeLog,
+    Initiatives,
+    Party,
+    PendingRating,
+    Politician,
+    Promises,
+    Rating,
+    RatingSummary,
+)
+
+MAX_COMPARE_SLUGS = 10
+
+
+def parse_slugs(raw: str):
+    """Split a comma separated slug list, dropping blanks and duplicates."""
+    slugs = []
+    for slug in (raw or "").split(","):
+        slug = slug.strip()
+        if slug and slug not in slugs:
+            slugs.append(slug)
+    return slugs
+
+
+MAX_MY_RATING_SLUGS = 100
+
+
+def user_ratings(user_id, slugs=None, politician_ids=None):
+    """
+    Map politician slug -> the user's rating, for the given politicians.
+
+    One query, driven by the ``Rating(user, -created_at)`` index.
+    """
+    ratings = Rating.objects.filter(user_id=user_id)
+    if slugs is not None:
+        ratings = ratings.filter(politician__slug__in=slugs)
+    if politician_ids is not None:
+        ratings = ratings.filter(politician_id__in=politician_ids)
+
+    return {
+        slug: {"id": rating_id, "score": score, "updated_at": updated_at}
+        for rating_id, slug, score, updated_at in ratings.order_by().values_list(
+            "id", "politician__slug", "score", "updated_at"
+        )
+    }
+
+
+def rating_distribution(politician_ids):
+    """Map politician id -> {score: count} using one grouped query."""
+    distribution = {
+        pid: {score: 0 for score, _ in Rating.RATING_CHOICES} for pid in politician_ids
+    }
+
+    rows = (
+        Rating.objects.filter(politician_id__in=politician_ids)
+        .values("politician_id", "score")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        distribution[row["politician_id"]][row["score"]] = row["total"]
+
+    return distribution
+
+
+def promise_breakdown(politician_ids):
+    """Map politician id -> {status: count} using one grouped query."""
+    breakdown = {
+        pid: {status: 0 for status, _ in Promises.STATUS_CHOICES}
+        for pid in politician_ids
+    }
+
+    rows = (
+        Promises.objects.filter(politician_id__in=politician_ids)
+        .values("politician_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        breakdown[row["politician_id"]][row["status"]] = row["total"]
+
+    return breakdown
+
+
+def initiative_counts(politician_ids):
+    """Map politician id -> number of initiatives using one grouped query."""
+    counts = {pid: 0 for pid in politician_ids}
+
+    rows = (
+        Initiatives.objects.filter(politician_id__in=politician_ids)
+        .values("politician_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        counts[row["politician_id"]] = row["total"]
+
+    return counts
+
+
+def summarize_distribution(distribution):
+    total = sum(distribution.values())
+    if not total:
+        return 0, 0
+    score_sum = sum(score * count for score, count in distribution.items())
+    return round(score_sum / total, 2), total
+
+
+def build_comparison(slugs):
+    """
+    Build aligned comparison rows for the given politician slugs.
+
+    Runs a fixed number of queries (one for politicians and one grouped
+    aggregate per metric) regardless of how many slugs are compared.
+    """
+    politicians = {
+        p.slug: p
+        for p in Politician.objects.filter(slug__in=slugs)
+        .select_related("party")
+        .only(
+            "id",
+            "slug",
+            "name",
+            "photo",
+            "views",
+            "is_active",
+            "party__name",
+            "party__slug",
+            "party__short_name",
+        )
+    }
+    ids = [p.id for p in politicians.values()]
+
+    ratings = rating_distribution(ids)
+    promises = promise_breakdown(ids)
+    initiatives = initiative_counts(ids)
+
+    results = []
+    for slug in slugs:
+        politician = politicians.get(slug)
+        if politician is None:
+            continue
+
+        average, total = summarize_distribution(ratings[politician.id])
+        results.append(
+            {
+                "slug": politician.slug,
+                "name": politician.name,
+                "photo": politician.photo.url if politician.photo else None,
+                "views": politician.views,
+                "is_active": politician.is_active,
+                "party": {
+                    "name": politician.party.name,
+                    "slug": politician.party.slug,
+                    "short_name": politician.party.short_name,
+                },
+                "average_rating": average,
+                "rated_by": total,
+                "rating_distribution": ratings[politician.id],
+                "promises": promises[politician.id],
+                "promise_count": sum(promises[politician.id].values()),
+                "initiative_count": initiatives[politician.id],
+            }
+        )
+
+    return {
+        "results": results,
+        "not_found": [slug for slug in slugs if slug not in politicians],
+    }
+
+
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_CSV_FIELDS = [
+    "id",
+    "slug",
+    "name",
+    "age",
+    "location",
+    "is_active",
+    "views",
+    "party_name",
+    "party_slug",
+    "party_short_name",
+    "average_rating",
+    "rated_by",
+    "promises",
+    "initiatives",
+    "updated_at",
+]
+
+
+def export_queryset(after=None):
+    """Politicians in primary key order, starting after the given id cursor."""
+    queryset = (
+        Politician.objects.select_related("party")
+        .annotate(
+            average_rating_annotated=Coalesce(
+                Avg("ratings__score"), 0, output_field=FloatField()
+            ),
+            total_ratings_annotated=Count("ratings"),
+        )
+        .prefetch_related(
+            Prefetch(
+                "promises",
+                queryset=Promises.objects.only(
+                    "politician_id", "title", "description", "status"
+                ),
+            ),
+            Prefetch(
+                "initiatives",
+                queryset=Initiatives.objects.only(
+                    "politician_id", "title", "description"
+                ),
+            ),
+        )
+        .order_by("id")
+    )
+
+    if after is not None:
+        queryset = queryset.filter(id__gt=after)
+
+    return queryset
+
+
+def export_rows(after=None):
+    """
+    Yield one plain dict per politician for the bulk export.
+
+    Rows are read with ``iterator(chunk_size=...)`` so memory stays bounded by
+    the chunk size, with promises and initiatives prefetched per chunk.
+    """
+    queryset = export_queryset(after)
+
+    for politician in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        party = politician.party
+        yield {
+            "id": politician.id,
+            "slug": politician.slug,
+            "name": politician.name,
+            "age": politician.age,
+            "location": politician.location,
+            "is_active": politician.is_active,
+            "views": politician.views,
+            "party_name": party.name,
+            "party_slug": party.slug,
+            "party_short_name": party.short_name,
+            "average_rating": round(politician.average_rating_annotated, 2),
+            "rated_by": politician.total_ratings_annotated,
+            "promises": [
+                {
+                    "title": promise.title,
+                    "description": promise.description,
+                    "status": promise.status,
+                }
+                for promise in politician.promises.all()
+            ],
+            "initiatives": [
+                {
+                    "title": initiative.title,
+                    "description": initiative.description,
+                }
+                for initiative in politician.initiatives.all()
+            ],
+            "updated_at": politician.updated_at.isoformat(),
+        }
+
+
+SYNC_PAGE_SIZE = 500
+SYNC_TOKEN_SALT = "politicians.sync"
+
+# name -> (model, fields) for the row streams scanned on updated_at
+SYNC_STREAMS = {
+    "parties": (
+        Party,
+        ["id", "name", "name_np", "slug", "short_name", "flag", "updated_at"],
+    ),
+    "politicians": (
+        Politician,
+        [
+            "id",
+            "name",
+            "name_np",
+            "slug",
+            "photo",
+            "age",
+            # Not "views": counting a view doesn't touch updated_at, so a
+            # mirror would only ever see it change alongside other edits
+            "party_id",
+            "party_position",
+            "location",
+            "education",
+            "criminal_record",
+            "criticism",
+            "biography",
+            "previous_party_history",
+            "is_active",
+            "updated_at",
+        ],
+    ),
+    "promises": (
+        Promises,
+        ["id", "politician_id", "title", "description", "status", "updated_at"],
+    ),
+    "initiatives": (
+        Initiatives,
+        ["id", "politician_id", "title", "description", "updated_at"],
+    ),
+}
+
+
+def encode_sync_token(state):
+    return signing.dumps(state, salt=SYNC_TOKEN_SALT, compress=True)
+
+
+def decode_sync_token(token):
+    """Return the cursor state for a token; raises BadSignature if tampered."""
+    if not token:
+        return {}
+    return signing.loads(token, salt=SYNC_TOKEN_SALT)
+
+
+def scan_updated(queryset, cursor, limit, until):
+    """
+    Keyset scan over (updated_at, id) starting after the cursor.
+
+    Uses the composite ``updated_at, id`` index so each page is a range read.
+    Rows updated at or after ``until`` are left for a later call.
+    """
+    queryset = queryset.filter(updated_at__lt=until)
+    if cursor:
+        since = datetime.fromisoformat(cursor[0])
+        queryset = queryset.filter(
+            Q(updated_at__gt=since) | Q(updated_at=since, id__gt=cursor[1])
+        )
+    return list(queryset.order_by("updated_at", "id")[: limit + 1])
+
+
+def rating_summaries(politician_ids):
+    """Current average and count for each still existing politician."""
+    if not politician_ids:
+        return []
+
+    existing = Politician.objects.filter(id__in=politician_ids).values_list(
+        "id", flat=True
+    )
+    summaries = {
+        pid: {"politician_id": pid, "average_rating": 0, "rated_by": 0}
+        for pid in existing
+    }
+
+    rows = RatingSummary.objects.filter(politician_id__in=summaries.keys()).values_list(
+        "politician_id", "average_rating", "rated_by"
+    )
+    for pid, average, total in rows:
+        summaries[pid].update(average_rating=round(average, 2), rated_by=total)
+
+    return sorted(summaries.values(), key=lambda s: s["politician_id"])
+
+
+def build_sync_page(token=None, limit=SYNC_PAGE_SIZE):
+    """
+    Return rows changed since the continuation token and the next token.
+
+    Every stream keeps its own cursor inside the token so a busy table
+    does not hold back the others; ``has_more`` tells the client to call
+    again with ``next`` straight away.
+    """
+    state = decode_sync_token(token)
+    # Rows stamped just now may sit in a transaction that commits after a
+    # later-stamped one; serving them would move the cursor past the other
+    until = timezone.now() - timedelta(seconds=settings.SYNC_SAFETY_LAG)
+    next_state = {}
+    page = {}
+    has_more = False
+
+    for name, (model, fields) in SYNC_STREAMS.items():
+        rows = scan_updated(
+            model.objects.values(*fields), state.get(name), limit, until
+        )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+
+        for row in rows:
+            row["updated_at"] = row["updated_at"].isoformat()
+
+        page[name] = rows
+        next_state[name] = (
+            [rows[-1]["updated_at"], rows[-1]["id"]] if rows else state.get(name)
+        )
+
+    # Rating summaries are derived, so scan ratings and recompute touched rows
+    ratings = scan_updated(
+        Rating.objects.values("id", "politician_id", "updated_at"),
+        state.get("ratings"),
+        limit,
+        until,
+    )
+    if len(ratings) > limit:
+        ratings = ratings[:limit]
+        has_more = True
+    next_state["ratings"] = (
+        [ratings[-1]["updated_at"].isoformat(), ratings[-1]["id"]]
+        if ratings
+        else state.get("ratings")
+    )
+
+    changes = list(
+        ChangeLog.objects.filter(
+            id__gt=state.get("changelog", 0), created_at__lt=until
+        ).order_by("id")[: limit + 1]
+    )
+    if len(changes) > limit:
+        changes = changes[:limit]
+        has_more = True
+    next_state["changelog"] = changes[-1].id if changes else state.get("changelog", 0)
+
+    touched = {row["politician_id"] for row in ratings}
+    touched.update(
+        change.object_id for change in changes if change.model == "rating_summary"
+    )
+
+    page["rating_summaries"] = rating_summaries(touched)
+    page["deleted"] = [
+        {"model": change.model, "id": change.object_id}
+        for change in changes
+        if change.action == "deleted"
+    ]
+
+    return {**page, "has_more": has_more, "next": encode_sync_token(next_state)}
+
+
+def lock_summaries(politician_ids):
+    """The existing summary rows, locked in a stable order, by politician."""
+    rows = (
+        RatingSummary.objects.select_for_update()
+        .filter(politician_id__in=politician_ids)
+        .order_by("politician_id")
+    )
+    return {summary.politician_id: summary for summary in rows}
+
+
+def refresh_rating_summaries(politician_ids, create_missing=True):
+    """
+    Recompute the stored rating summary of each politician.
+
+    The summary rows are locked before the ratings are aggregated in a
+    separate statement, so a concurrent writer waits and then counts the
+    committed rating instead of writing back a total from its own stale
+    snapshot. A politician's first rating inserts its row. Deletes pass
+    ``create_missing=False`` as the politician may be going away too.
+    """
+    politician_ids = set(politician_ids)
+    if not politician_ids:
+        return
+
+    # Part of the caller's transaction when there is one, without a savepoint
+    with transaction.atomic(savepoint=False):
+        summaries = lock_summaries(politician_ids)
+        missing = politician_ids - summaries.keys()
+        if create_missing and missing:
+            # DO NOTHING waits for a concurrent insert of the same row
+            RatingSummary.objects.bulk_create(
+                [RatingSummary(politician_id=pid) for pid in missing],
+                ignore_conflicts=True,
+            )
+            summaries.update(lock_summaries(missing))
+        if not summaries:
+            return
+
+        totals = {
+            pid: (count, total, average)
+            for pid, count, total, average in Rating.objects.filter(
+                politician_id__in=summaries.keys()
+            )
+            .values("politician_id")
+            .annotate(count=Count("id"), total=Sum("score"), average=Avg("score"))
+            .order_by()
+            .values_list("politician_id", "count", "total", "average")
+        }
+        now = timezone.now()
+        for pid, summary in summaries.items():
+            (
+                summary.rated_by,
+                summary.score_total,
+                summary.average_rating,
+            ) = totals.get(pid, (0, 0, 0.0))
+            summary.updated_at = now
+        RatingSummary.objects.bulk_update(
+            summaries.values(),
+            ["rated_by", "score_total", "average_rating", "updated_at"],
+        )
+
+
+def apply_rating_deltas(deltas):
+    """
+    Add rating count and score changes to the stored summaries.
+
+    ``deltas`` maps politician ids to ``(count change, score change)``. One
+    UPDATE adds them to the current row values, so concurrent writers add
+    on top of each other instead of recounting every rating. A
+    politician's first rating inserts its row.
+    """
+    deltas = {pid: delta for pid, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+
+    updated = add_to_summaries(deltas)
+    if updated == len(deltas):
+        return
+
+    existing = RatingSummary.objects.filter(
+        politician_id__in=deltas.keys()
+    ).values_list("politician_id", flat=True)
+    missing = {
+        pid: delta
+        for pid, delta in deltas.items()
+        if pid not in set(existing) and delta[0] > 0
+    }
+    if missing:
+        # DO NOTHING waits for a concurrent insert of the same row
+        RatingSummary.objects.bulk_create(
+            [RatingSummary(politician_id=pid) for pid in missing],
+            ignore_conflicts=True,
+        )
+        add_to_summaries(missing)
+
+
+def add_to_summaries(deltas):
+    def per_politician(index):
+        return Case(
+            *[
+                When(politician_id=pid, then=Value(delta[index]))
+                for pid, delta in deltas.items()
+            ],
+            default=Value(0),
+        )
+
+    rated_by = F("rated_by") + per_politician(0)
+    score_total = F("score_total") + per_politician(1)
+    # The average first: MySQL would otherwise see the already updated columns
+    return RatingSummary.objects.filter(politician_id__in=deltas.keys()).update(
+        average_rating=Case(
+            When(
+                GreaterThan(rated_by, 0),
+                then=Cast(score_total, FloatField()) / rated_by,
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        rated_by=rated_by,
+        score_total=score_total,
+        updated_at=Now(),
+    )
+
+
+def locked_ratings(pairs):
+    """(id, score, created_at) of the stored rating per (politician, user)."""
+    condition = Q()
+    for politician_id, user_id in pairs:
+        condition |= Q(politician_id=politician_id, user_id=user_id)
+    rows = (
+        Rating.objects.select_for_update()
+        .filter(condition)
+        .order_by("id")
+        .values_list("politician_id", "user_id", "id", "score", "created_at")
+    )
+    return {(pid, uid): rest for pid, uid, *rest in rows}
+
+
+def upsert_ratings(ratings):
+    """
+    Insert or update ratings and adjust the summaries by the difference.
+
+    ``ratings`` are unsaved ``Rating`` objects, at most one per politician
+    and user. The stored rows are locked to read the scores being replaced.
+    New ones go in with ``ON CONFLICT DO NOTHING``, so a concurrent double
+    submit that inserted first is found and updated rather than counted
+    twice. Primary keys are set on the objects.
+    """
+    by_pair = {(rating.politician_id, rating.user_id): rating for rating in ratings}
+
+    with transaction.atomic():
+        stored = locked_ratings(by_pair)
+        new = [rating for pair, rating in by_pair.items() if pair not in stored]
+        if new:
+            Rating.objects.bulk_create(new, ignore_conflicts=True)
+            inserted = locked_ratings(pair for pair in by_pair if pair not in stored)
+            for pair, row in inserted.items():
+                # Ours carries the created_at the insert set on the object
+                if row[2] == by_pair[pair].created_at:
+                    by_pair[pair].pk = row[0]
+                else:
+                    stored[pair] = row
+
+        now = timezone.now()
+        deltas = {}
+        for pair, rating in by_pair.items():
+            count, total = deltas.get(rating.politician_id, (0, 0))
+            if pair in stored:
+                rating.pk, previous, _ = stored[pair]
+                rating.updated_at = now
+                deltas[rating.politician_id] = (count, total + rating.score - previous)
+            else:
+                deltas[rating.politician_id] = (count + 1, total + rating.score)
+
+        replaced = [by_pair[pair] for pair in stored]
+        if replaced:
+            Rating.objects.bulk_update(replaced, ["score", "comment", "updated_at"])
+        apply_rating_deltas(deltas)
+    return ratings
+
+
+def politician_cache_key(slug):
+    return f"politician:{slug}"
+
+
+def apply_queued(pending):
+    """
+    Upsert the latest queued submission of each (politician, user) pair and
+    dequeue the rows. Returns the affected politician ids.
+    """
+    latest = {}
+    for row in pending:
+        latest[(row.politician_id, row.user_id)] = Rating(
+            politician_id=row.politician_id,
+            user_id=row.user_id,
+            score=row.score,
+            comment=row.comment,
+        )
+
+    upsert_ratings(list(latest.values()))
+    PendingRating.objects.filter(id__in=[row.id for row in pending]).delete()
+    return {politician_id for politician_id, _ in latest}
+
+
+def apply_pending_ratings(batch_size=None):
+    """
+    Apply one batch of queued rating submissions, oldest first.
+
+    Repeated edits by the same user to the same politician collapse to the
+    latest one, the batch is written with one upsert, and each affected
+    politician's cache entry is cleared once after commit. The queue rows
+    are locked without SKIP LOCKED, so concurrent workers take turns and
+    a later batch never lands before an earlier one. Returns the number of
+    queued submissions consumed.
+    """
+    batch_size = batch_size or settings.RATING_QUEUE_BATCH_SIZE
+
+    with transaction.atomic():
+        pending = list(
+            PendingRating.objects.select_for_update().order_by("id")[:batch_size]
+        )
+        if not pending:
+            return 0
+
+        politician_ids = apply_queued(pending)
+
+        slugs = (
+            Politician.objects.filter(id__in=politician_ids)
+            .order_by()
+            .values_list("slug", flat=True)
+        )
+        keys = [politician_cache_key(slug) for slug in slugs]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    return len(pending)
+
+
+def drain_pending_ratings(politician_id, user_id):
+    """
+    Apply a user's queued submissions for one politician right away.
+
+    Direct edits and deletes call this first, so a submission queued
+    before them can't be applied on top afterwards. Waits for a worker
+    holding those rows. Returns whether anything was applied.
+    """
+    with transaction.atomic():
+        pending = list(
+            PendingRating.objects.select_for_update()
+            .filter(politician_id=politician_id, user_id=user_id)
+            .order_by("id")
+        )
+        if pending:
+            apply_queued(pending)
+    return bool(pending)
@@ -0,0 +1,61 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from politicians.models import (
+    ChangeLog,
+    Initiatives,
+    Party,
+    Politician,
+    Promises,
+    Rating,
+)
+from politicians.services import refresh_rating_summaries
+
+TRACKED_MODELS = {
+    Party: "party",
+    Politician: "politician",
+    Promises: "promise",
+    Initiatives: "initiative",
+}
+
+
+def log_deletion(sender, instance, **kwargs):
+    """Record a tombstone so delta sync clients can drop deleted rows."""
+    ChangeLog.objects.create(
+        model=TRACKED_MODELS[sender], object_id=instance.pk, action="deleted"
+    )
+
+
+# Connected per model so unrelated deletes keep Django's fast-delete path
+for tracked_model in TRACKED_MODELS:
+    post_delete.connect(
+        log_deletion,
+        sender=tracked_model,
+        dispatch_uid=f"changelog:{tracked_model._meta.label}",
+    )
+
+
+def cascaded_from_politician(origin):
+    """Whether a delete started at a politician or party being removed."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Politician, Party)
+
+
+@receiver(post_delete, sender=Rating)
+def log_rating_deletion(sender, instance, origin=None, **kwargs):
+    """A removed rating leaves no row behind but still changes the summary."""
+    # The politician's tombstone covers its ratings and summary
+    if cascaded_from_politician(origin):
+        return
+
+    ChangeLog.objects.create(
+        model="rating_summary", object_id=instance.politician_id, action="changed"
+    )
+    refresh_rating_summaries([instance.politician_id], create_missing=False)
+
+
+@receiver(post_save, sender=Rating)
+def refresh_rating_summary(sender, instance, **kwargs):
+    # Bulk upserts bypass this and refresh the summaries themselves
+    refresh_rating_summaries([instance.politician_id])
@@ -1,10 +1,12 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import override_settings
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from netabase.throttling import local_buckets
 from politicians.models import Party, Politician, Rating
+from user_api.authentication import refresh_token_for
 
 
 @pytest.fixture
@@ -14,7 +16,8 @@ def api_client():
 
 @pytest.fixture(autouse=True)
 def disable_redis_cache():
-    # Automatically disable Redis cache for all tests.
+    # Automatically disable Redis cache for all tests, with empty rate limits.
+    local_buckets.clear()
     with override_settings(
         CACHES={
             "default": {
@@ -25,6 +28,29 @@ def disable_redis_cache():
         yield
 
 
+@pytest.fixture
+def locmem_cache():
+    # A working cache for tests that need one, instead of the dummy above
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    ):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def no_sync_lag(settings):
+    # Serve rows written moments ago, as the tests sync right after writing
+    settings.SYNC_SAFETY_LAG = 0
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    # An endpoint running more queries than its query_budget fails the test
+    settings.QUERY_BUDGET_STRICT = True
+
+
 @pytest.fixture
 def user_factory(db):
     def make_user(**kwargs):
@@ -50,7 +76,7 @@ def auth_client(api_client, user_factory):
         if user is None:
             user = user_factory()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = refresh_token_for(user)
         api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}")
         return api_client, user
 
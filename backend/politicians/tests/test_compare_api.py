@@ -0,0 +1,68 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from politicians.models import Initiatives, Promises
+
+
+# ---------------------------
+# COMPARE: ALIGNED METRICS
+# ---------------------------
+@pytest.mark.django_db
+def test_compare_returns_aligned_metrics(politician_factory, rating_factory):
+    first = politician_factory()
+    second = politician_factory()
+
+    rating_factory(politician=first, score=5)
+    rating_factory(politician=first, score=3)
+    Promises.objects.create(politician=first, title="Road", status="completed")
+    Promises.objects.create(politician=first, title="School", status="failed")
+    Initiatives.objects.create(politician=second, title="Clean river")
+
+    url = reverse("politician-compare")
+    client = APIClient()
+    response = client.get(url, {"slugs": f"{second.slug},{first.slug},missing"})
+
+    assert response.status_code == 200  # type: ignore
+    results = response.data["results"]  # type: ignore
+    assert [r["slug"] for r in results] == [second.slug, first.slug]
+    assert response.data["not_found"] == ["missing"]  # type: ignore
+
+    assert results[1]["average_rating"] == 4.0
+    assert results[1]["rated_by"] == 2
+    assert results[1]["rating_distribution"][5] == 1
+    assert results[1]["promises"]["completed"] == 1
+    assert results[1]["promises"]["pending"] == 0
+    assert results[0]["initiative_count"] == 1
+    assert results[0]["party"]["name"] == second.party.name
+
+
+# ---------------------------
+# COMPARE: FIXED QUERY COUNT
+# ---------------------------
+@pytest.mark.django_db
+def test_compare_query_count_is_constant(
+    politician_factory, rating_factory, django_assert_num_queries
+):
+    politicians = [politician_factory() for _ in range(6)]
+    for pol in politicians:
+        rating_factory(politician=pol, score=4)
+
+    url = reverse("politician-compare")
+    client = APIClient()
+
+    with django_assert_num_queries(4):
+        client.get(url, {"slugs": ",".join(p.slug for p in politicians[:2])})
+
+    with django_assert_num_queries(4):
+        client.get(url, {"slugs": ",".join(p.slug for p in politicians)})
+
+
+@pytest.mark.django_db
+def test_compare_requires_two_slugs(politician_factory):
+    pol = politician_factory()
+
+    url = reverse("politician-compare")
+    response = APIClient().get(url, {"slugs": pol.slug})
+
+    assert response.status_code == 400  # type: ignore
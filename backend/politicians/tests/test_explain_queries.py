@@ -0,0 +1,40 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Index
+
+from politicians.models import Politician, Rating
+from politicians.queryplans import missing_indexes
+
+
+# ---------------------------
+# EXPLAIN QUERIES: ADVISOR
+# ---------------------------
+@pytest.mark.django_db
+def test_explain_queries_flags_scans_and_suggests_indexes():
+    out = StringIO()
+    call_command("explain_queries", scale=100, stdout=out)
+    output = out.getvalue()
+
+    assert "politicians ordering=-average_rating_annotated" in output
+    assert "politicians location filter: check" in output
+    assert "sequential scan: politicians_politician" in output
+    assert "models.Index(fields=['location']" in output
+
+    # The synthetic dataset is rolled back
+    assert not Politician.objects.exists()
+    assert not Rating.objects.exists()
+
+
+@pytest.mark.django_db
+def test_explain_queries_needs_data():
+    with pytest.raises(CommandError):
+        call_command("explain_queries", stdout=StringIO())
+
+
+def test_declared_indexes_are_not_suggested():
+    declared = Index(fields=["is_active", "party"], name="declared")
+    new = Index(fields=["location"], name="new")
+
+    assert missing_indexes(Politician, [declared, new]) == [new]
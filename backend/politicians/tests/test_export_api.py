@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from politicians.models import Initiatives, Promises
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+# ---------------------------
+# EXPORT: NDJSON
+# ---------------------------
+@pytest.mark.django_db
+def test_export_ndjson_includes_nested_data(politician_factory, rating_factory):
+    pol = politician_factory()
+    rating_factory(politician=pol, score=5)
+    rating_factory(politician=pol, score=2)
+    Promises.objects.create(politician=pol, title="Road", description="Build it")
+    Initiatives.objects.create(politician=pol, title="Clean river")
+
+    url = reverse("politician-export-ndjson")
+    response = APIClient().get(url)
+
+    assert response.status_code == 200  # type: ignore
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["slug"] == pol.slug
+    assert rows[0]["party_name"] == pol.party.name
+    assert rows[0]["average_rating"] == 3.5
+    assert rows[0]["rated_by"] == 2
+    assert rows[0]["promises"][0]["title"] == "Road"
+    assert rows[0]["initiatives"][0]["title"] == "Clean river"
+
+
+# ---------------------------
+# EXPORT: RESUME FROM CURSOR
+# ---------------------------
+@pytest.mark.django_db
+def test_export_resumes_after_cursor(politician_factory):
+    politicians = [politician_factory() for _ in range(3)]
+
+    url = reverse("politician-export-ndjson")
+    response = APIClient().get(url, {"after": politicians[0].id})
+
+    ids = [json.loads(line)["id"] for line in read_stream(response).splitlines()]
+    assert ids == [politicians[1].id, politicians[2].id]
+
+
+# ---------------------------
+# EXPORT: CSV
+# ---------------------------
+@pytest.mark.django_db
+def test_export_csv(politician_factory):
+    pol = politician_factory()
+    Promises.objects.create(politician=pol, title="Road", description="Build it")
+
+    url = reverse("politician-export-csv")
+    response = APIClient().get(url)
+
+    assert response.status_code == 200  # type: ignore
+    rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+    assert rows[0]["slug"] == pol.slug
+    assert json.loads(rows[0]["promises"])[0]["status"] == "pending"
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from politicians.serializers import PoliticianSerializer, serializer_columns
+
+HEAVY_COLUMNS = ["biography", "criticism", "education", "previous_party_history"]
+
+
+def page_query(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200  # type: ignore
+    (sql,) = [q["sql"] for q in queries.captured_queries if "LIMIT" in q["sql"]]
+    return sql
+
+
+# ---------------------------
+# LIST COLUMNS: SERIALIZER METADATA
+# ---------------------------
+def test_serializer_columns_follow_sources():
+    columns = serializer_columns(PoliticianSerializer)
+
+    # party_name reads through the relation; the rating annotations are skipped
+    assert sorted(columns) == ["age", "name", "party__name", "photo", "slug", "views"]
+
+
+# ---------------------------
+# LIST COLUMNS: GENERATED SQL
+# ---------------------------
+@pytest.mark.django_db
+@pytest.mark.parametrize("route", ["politician-list", "party-politicians"])
+def test_list_pages_skip_heavy_text_columns(api_client, politician_factory, route):
+    pol = politician_factory(biography="long text")
+    kwargs = {"slug": pol.party.slug} if route == "party-politicians" else {}
+
+    sql = page_query(api_client, reverse(route, kwargs=kwargs))
+    select, _, rest = sql.partition(" FROM ")
+    group_by = rest.partition("GROUP BY")[2]
+
+    assert '"politicians_politician"."slug"' in select
+    assert '"politicians_party"."name"' in select
+    for column in HEAVY_COLUMNS:
+        assert f'"{column}"' not in select
+        assert f'"{column}"' not in group_by
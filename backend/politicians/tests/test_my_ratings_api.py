@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from user_api.authentication import refresh_token_for
+
+
+# ---------------------------
+# MY RATINGS: BATCH LOOKUP
+# ---------------------------
+@pytest.mark.django_db
+def test_my_ratings_for_many_politicians_in_one_query(
+    auth_client, politician_factory, rating_factory, django_assert_num_queries
+):
+    client, user = auth_client()
+    rated = [politician_factory() for _ in range(3)]
+    unrated = politician_factory()
+    for score, pol in enumerate(rated, start=2):
+        rating_factory(politician=pol, user=user, score=score)
+    rating_factory(politician=unrated, score=5)
+
+    slugs = ",".join(p.slug for p in [*rated, unrated])
+    url = reverse("my-ratings")
+
+    # Only the token version lookup on top (the tests run without Redis)
+    with django_assert_num_queries(2):
+        response = client.get(url, {"politicians": slugs})
+
+    assert response.status_code == 200  # type: ignore
+    ratings = response.data["ratings"]  # type: ignore
+    assert {slug: r["score"] for slug, r in ratings.items()} == {
+        rated[0].slug: 2,
+        rated[1].slug: 3,
+        rated[2].slug: 4,
+    }
+    assert "private" in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_my_ratings_requires_auth_and_slugs(auth_client):
+    url = reverse("my-ratings")
+
+    assert APIClient().get(url, {"politicians": "a"}).status_code == 401  # type: ignore
+
+    client, _ = auth_client()
+    assert client.get(url).status_code == 400  # type: ignore
+
+
+# ---------------------------
+# LIST: INCLUDE MY RATING
+# ---------------------------
+@pytest.mark.django_db
+def test_list_includes_my_rating_without_sharing_cache(
+    locmem_cache, api_client, user_factory, politician_factory, rating_factory
+):
+    pol = politician_factory()
+    first, second = user_factory(), user_factory()
+    rating_factory(politician=pol, user=first, score=2)
+    rating_factory(politician=pol, user=second, score=5)
+    url = reverse("politician-list")
+
+    # Anonymous list is cached as before and has no per-user field
+    anonymous = api_client.get(url)
+    assert "my_rating" not in anonymous.data["results"][0]  # type: ignore
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(url)
+    assert len(queries) == 0
+
+    for user, score in [(first, 2), (second, 5)]:
+        client = APIClient()
+        token = refresh_token_for(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = client.get(url, {"include_my_rating": 1})
+
+        assert response.data["results"][0]["my_rating"]["score"] == score  # type: ignore
+        assert "private" in response["Cache-Control"]
+
+    response = APIClient().get(url, {"include_my_rating": 1})
+    assert response.data["results"][0]["my_rating"] is None  # type: ignore
+
+
+@pytest.mark.django_db
+def test_list_resolves_my_ratings_in_one_query(
+    auth_client, politician_factory, rating_factory
+):
+    client, user = auth_client()
+    for _ in range(5):
+        rating_factory(politician=politician_factory(), user=user, score=3)
+    url = reverse("politician-list")
+
+    with CaptureQueriesContext(connection) as plain:
+        client.get(url)
+    with CaptureQueriesContext(connection) as decorated:
+        response = client.get(url, {"include_my_rating": 1})
+
+    # One extra query for the whole page
+    assert len(decorated) == len(plain) + 1
+    results = response.data["results"]  # type: ignore
+    assert len(results) == 5
+    assert all(row["my_rating"]["score"] == 3 for row in results)
@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+from django.urls import reverse
+
+from netabase.querybudget import QueryBudgetExceeded, fingerprint
+from politicians.models import Party
+from politicians.views import PartyListView, PoliticianExportView
+
+
+# ---------------------------
+# QUERY BUDGET: INSTRUMENTATION
+# ---------------------------
+@pytest.mark.django_db
+def test_responses_report_db_time(api_client, party_factory):
+    party_factory()
+
+    response = api_client.get(reverse("party-list"))
+
+    assert response.status_code == 200  # type: ignore
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response["Server-Timing"]
+
+
+def test_fingerprint_ignores_batch_size():
+    one = 'SELECT "id" FROM "t" WHERE "id" IN (%s)'
+    many = 'SELECT "id"\n  FROM "t" WHERE "id" IN (%s, %s,%s)'
+
+    assert fingerprint(one) == fingerprint(many)
+
+
+# ---------------------------
+# QUERY BUDGET: ENFORCEMENT
+# ---------------------------
+@pytest.mark.django_db
+def test_n_plus_one_goes_over_budget(api_client, party_factory, monkeypatch):
+    for _ in range(3):
+        party_factory()
+
+    # Without the annotation every party counts its politicians separately
+    monkeypatch.setattr(PartyListView, "queryset", Party.objects.all())
+
+    with pytest.raises(QueryBudgetExceeded, match="ran 5 queries.*repeated: 3x"):
+        api_client.get(reverse("party-list"))
+
+
+@pytest.mark.django_db
+def test_over_budget_only_warns_when_not_strict(
+    api_client, party_factory, monkeypatch, settings, caplog
+):
+    settings.QUERY_BUDGET_STRICT = False
+    party_factory()
+    monkeypatch.setattr(PartyListView, "query_budget", 1)
+
+    with caplog.at_level(logging.WARNING, logger="netabase.querybudget"):
+        response = api_client.get(reverse("party-list"))
+
+    assert response.status_code == 200  # type: ignore
+    assert "over its budget of 1" in caplog.text
+
+
+@pytest.mark.django_db
+def test_streamed_queries_count_against_budget(
+    api_client, politician_factory, monkeypatch
+):
+    politician_factory()
+    monkeypatch.setattr(PoliticianExportView, "query_budget", 1, raising=False)
+
+    response = api_client.get(reverse("politician-export-ndjson"))
+
+    # The rows are read while the body streams, after the headers went out
+    assert "Server-Timing" not in response
+    with pytest.raises(QueryBudgetExceeded, match="over its budget of 1"):
+        b"".join(response.streaming_content)
@@ -91,6 +91,18 @@ def test_rating_detail_update_only_owner(rating_factory, user_factory):
     assert rating.score == 3
 
 
+@pytest.mark.django_db
+def test_rating_detail_owner_with_access_token(auth_client, rating_factory):
+    client, owner = auth_client()
+    rating = rating_factory(user=owner)
+
+    # The token's user id claim must match the rating's user
+    response = client.patch(
+        reverse("rating-detail", args=[rating.id]), {"score": 2}, format="json"
+    )
+    assert response.status_code == 200  # type: ignore
+
+
 # ---------------------------
 # RATING DETAIL: DELETE PERMISSIONS
 # ---------------------------
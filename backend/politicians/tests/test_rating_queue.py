@@ -0,0 +1,151 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from politicians.models import PendingRating, Rating, RatingSummary
+from politicians.services import apply_pending_ratings
+
+
+# ---------------------------
+# WRITE-BEHIND: ENQUEUE
+# ---------------------------
+@pytest.mark.django_db
+@override_settings(RATING_WRITE_BEHIND=True)
+def test_rating_post_is_queued(auth_client, politician_factory):
+    client, user = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    response = client.post(url, {"score": 4, "comment": "ok"}, format="json")
+
+    assert response.status_code == 202  # type: ignore
+    assert response.data["status"] == "queued"  # type: ignore
+    assert not Rating.objects.exists()
+    assert PendingRating.objects.get().user_id == user.id
+
+
+@pytest.mark.django_db
+@override_settings(RATING_WRITE_BEHIND=True)
+def test_queued_rating_is_still_validated(auth_client, politician_factory):
+    client, _ = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    response = client.post(url, {"score": 9}, format="json")
+
+    assert response.status_code == 400  # type: ignore
+    assert not PendingRating.objects.exists()
+
+
+# ---------------------------
+# WRITE-BEHIND: APPLY BATCHES
+# ---------------------------
+@pytest.mark.django_db
+def test_batch_coalesces_edits_and_clears_cache_once(
+    user_factory,
+    politician_factory,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+    monkeypatch,
+):
+    first, second = politician_factory(), politician_factory()
+    alice, bob = user_factory(), user_factory()
+    for politician, user, score in [
+        (first, alice, 1),
+        (first, bob, 2),
+        (first, alice, 5),
+        (second, alice, 3),
+        (second, alice, 4),
+    ]:
+        PendingRating.objects.create(politician=politician, user=user, score=score)
+
+    deleted = []
+    monkeypatch.setattr(cache, "delete_many", deleted.append)
+
+    # Read, lock, insert and relock ratings, add to, find and create both
+    # summaries, dequeue and look up slugs, plus savepoints; the same however
+    # many rows are queued
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_num_queries(14):
+            assert apply_pending_ratings() == 5
+
+    assert Rating.objects.get(politician=first, user=alice).score == 5
+    assert Rating.objects.get(politician=second, user=alice).score == 4
+    assert Rating.objects.count() == 3
+    assert RatingSummary.objects.get(politician=first).average_rating == 3.5
+    assert not PendingRating.objects.exists()
+    assert len(deleted) == 1
+    assert sorted(deleted[0]) == sorted(
+        [f"politician:{first.slug}", f"politician:{second.slug}"]
+    )
+
+
+@pytest.mark.django_db
+def test_apply_rating_queue_command_drains_in_batches(user_factory, politician_factory):
+    pol = politician_factory()
+    for _ in range(5):
+        PendingRating.objects.create(politician=pol, user=user_factory(), score=4)
+
+    out = StringIO()
+    call_command("apply_rating_queue", batch_size=2, stdout=out)
+
+    assert "Applied 5 queued ratings" in out.getvalue()
+
+    assert not PendingRating.objects.exists()
+    assert RatingSummary.objects.get(politician=pol).rated_by == 5
+
+
+# ---------------------------
+# WRITE-BEHIND: DIRECT EDITS
+# ---------------------------
+@pytest.mark.django_db
+@override_settings(RATING_WRITE_BEHIND=True)
+def test_delete_after_queued_post_stays_deleted(
+    auth_client, politician_factory, rating_factory
+):
+    client, user = auth_client()
+    pol = politician_factory()
+    rating = rating_factory(politician=pol, user=user, score=3)
+
+    queued = client.post(
+        reverse("politician-ratings", kwargs={"slug": pol.slug}),
+        {"score": 5},
+        format="json",
+    )
+    deleted = client.delete(reverse("rating-detail", kwargs={"pk": rating.pk}))
+    apply_pending_ratings()
+
+    assert queued.status_code == 202  # type: ignore
+    assert deleted.status_code == 204  # type: ignore
+    assert not Rating.objects.filter(user=user).exists()
+    assert not PendingRating.objects.exists()
+
+
+@pytest.mark.django_db
+@override_settings(RATING_WRITE_BEHIND=True)
+def test_patch_applies_queued_post_first(
+    auth_client, politician_factory, rating_factory
+):
+    client, user = auth_client()
+    pol = politician_factory()
+    rating = rating_factory(politician=pol, user=user, score=3)
+
+    client.post(
+        reverse("politician-ratings", kwargs={"slug": pol.slug}),
+        {"score": 5},
+        format="json",
+    )
+    response = client.patch(
+        reverse("rating-detail", kwargs={"pk": rating.pk}),
+        {"comment": "changed my mind"},
+        format="json",
+    )
+    apply_pending_ratings()
+
+    assert response.status_code == 200  # type: ignore
+    rating.refresh_from_db()
+    assert (rating.score, rating.comment) == (5, "changed my mind")
@@ -0,0 +1,182 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from politicians.models import Rating, RatingSummary
+from politicians import services
+from politicians.services import rating_summaries, upsert_ratings
+
+
+# ---------------------------
+# UPSERT: CREATE THEN UPDATE
+# ---------------------------
+@pytest.mark.django_db
+def test_rating_upsert_creates_then_updates(auth_client, politician_factory):
+    client, user = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    first = client.post(url, {"score": 3, "comment": "ok"}, format="json")
+    second = client.post(url, {"score": 5, "comment": "better"}, format="json")
+
+    assert first.status_code == 201  # type: ignore
+    assert second.status_code == 200  # type: ignore
+    assert second.data["id"] == first.data["id"]  # type: ignore
+    assert second.data["username"] == user.username  # type: ignore
+    assert second.data["created_at"] == first.data["created_at"]  # type: ignore
+
+    rating = Rating.objects.get(politician=pol, user=user)
+    assert (rating.score, rating.comment) == (5, "better")
+
+
+@pytest.mark.django_db
+def test_rating_summary_follows_writes(politician_factory, rating_factory):
+    pol = politician_factory()
+    rating = rating_factory(politician=pol, score=5)
+    rating_factory(politician=pol, score=2)
+
+    summary = RatingSummary.objects.get(politician=pol)
+    assert (summary.rated_by, summary.average_rating) == (2, 3.5)
+
+    rating.delete()
+    summary.refresh_from_db()
+    assert (summary.rated_by, summary.average_rating) == (1, 2.0)
+    assert rating_summaries([pol.id])[0]["average_rating"] == 2.0
+
+
+
+@pytest.mark.django_db
+def test_upserts_adjust_summary_by_difference(
+    user_factory, politician_factory, rating_factory
+):
+    pol = politician_factory()
+    rating_factory(politician=pol, score=2)
+    user = user_factory()
+
+    upsert_ratings([Rating(politician=pol, user=user, score=3)])
+    upsert_ratings([Rating(politician=pol, user=user, score=5)])
+
+    summary = RatingSummary.objects.get(politician=pol)
+    assert (summary.rated_by, summary.score_total) == (2, 7)
+    assert summary.average_rating == 3.5
+
+
+@pytest.mark.django_db
+def test_upsert_counts_concurrent_double_submit_once(
+    user_factory, politician_factory, monkeypatch
+):
+    pol = politician_factory()
+    user = user_factory()
+    upsert_ratings([Rating(politician=pol, user=user, score=2)])
+
+    # The first lookup misses the row, as if the other submit hadn't committed
+    locked = services.locked_ratings
+    calls = []
+
+    def late_locked(pairs):
+        calls.append(pairs)
+        return {} if len(calls) == 1 else locked(pairs)
+
+    monkeypatch.setattr(services, "locked_ratings", late_locked)
+    upsert_ratings([Rating(politician=pol, user=user, score=4)])
+
+    assert Rating.objects.get(politician=pol, user=user).score == 4
+    summary = RatingSummary.objects.get(politician=pol)
+    assert (summary.rated_by, summary.score_total) == (1, 4)
+
+# ---------------------------
+# IDEMPOTENCY KEYS
+# ---------------------------
+@pytest.mark.django_db
+def test_idempotent_retry_replays_response(
+    auth_client, politician_factory, locmem_cache
+):
+    client, user = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    first = client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+    Rating.objects.filter(user=user).update(score=1)
+    retry = client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert first.status_code == retry.status_code == 201  # type: ignore
+    assert retry.data == first.data  # type: ignore
+    assert retry["Idempotent-Replayed"] == "true"
+    # The retry did not write again
+    assert Rating.objects.get(user=user).score == 1
+
+
+@pytest.mark.django_db
+def test_idempotency_key_reused_with_other_payload(
+    auth_client, politician_factory, locmem_cache
+):
+    client, _ = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+    response = client.post(url, {"score": 2}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert response.status_code == 422  # type: ignore
+
+
+@pytest.mark.django_db
+def test_idempotency_keys_are_per_user(
+    auth_client, user_factory, politician_factory, locmem_cache
+):
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    first, _ = auth_client()
+    first.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+    second, _ = auth_client(user_factory())
+    response = second.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert response.status_code == 201  # type: ignore
+    assert Rating.objects.filter(politician=pol).count() == 2
+
+
+@pytest.mark.django_db
+def test_idempotency_key_in_flight_conflicts(
+    auth_client, politician_factory, locmem_cache, monkeypatch
+):
+    client, user = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    # Pretend an earlier request with the key is still running
+    monkeypatch.setattr(cache, "add", lambda *args, **kwargs: False)
+    response = client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="k")
+
+    assert response.status_code == 409  # type: ignore
+    assert not Rating.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_idempotency_key_finished_before_lock_replays(
+    auth_client, politician_factory, locmem_cache, monkeypatch
+):
+    client, user = auth_client()
+    pol = politician_factory()
+    url = reverse("politician-ratings", kwargs={"slug": pol.slug})
+
+    client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="k")
+    Rating.objects.filter(user=user).update(score=1)
+
+    # The first lookup misses as if the first request was still running; it
+    # has stored its response by the time the retry takes the lock
+    get = cache.get
+    lookups = []
+
+    def late_get(key, *args, **kwargs):
+        if key.startswith("idempotency:"):
+            lookups.append(key)
+            if len(lookups) == 1:
+                return None
+        return get(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "get", late_get)
+    retry = client.post(url, {"score": 4}, format="json", HTTP_IDEMPOTENCY_KEY="k")
+
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Rating.objects.get(user=user).score == 1
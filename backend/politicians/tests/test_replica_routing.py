@@ -0,0 +1,80 @@
+from django.db import router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from netabase.routers import PIN_COOKIE, ReplicaRoutingMiddleware
+from politicians.models import Politician, Rating
+
+
+def route(method, status=200, cookies=None):
+    """Run a request through the middleware and report where reads went."""
+    seen = {}
+
+    def view(request):
+        seen["read"] = router.db_for_read(Politician)
+        seen["write"] = router.db_for_write(Rating)
+        return HttpResponse(status=status)
+
+    request = getattr(RequestFactory(), method)("/api/politicians/")
+    request.COOKIES.update(cookies or {})
+    response = ReplicaRoutingMiddleware(view)(request)
+    return seen, response
+
+
+# ---------------------------
+# REPLICAS: READ ROUTING
+# ---------------------------
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+def test_safe_requests_read_from_replica():
+    seen, response = route("get")
+
+    assert seen == {"read": "replica_0", "write": "default"}
+    assert PIN_COOKIE not in response.cookies
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+def test_writes_stay_on_primary_and_pin_the_client():
+    seen, response = route("post", status=201)
+
+    assert seen == {"read": "default", "write": "default"}
+    assert response.cookies[PIN_COOKIE]["max-age"] > 0
+
+    # The next read from the same client sees its own write
+    seen, _ = route("get", cookies={PIN_COOKIE: "1"})
+    assert seen["read"] == "default"
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+def test_failed_writes_do_not_pin():
+    _, response = route("post", status=400)
+
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_without_replicas_everything_uses_primary():
+    seen, _ = route("get")
+
+    assert seen["read"] == "default"
+    # Outside a request, reads go to the primary too
+    assert router.db_for_read(Politician) == "default"
+
+
+def test_replicas_are_not_migrated():
+    with override_settings(DATABASE_REPLICAS=["replica_0"]):
+        assert not router.allow_migrate("replica_0", "politicians")
+        assert router.allow_migrate("default", "politicians")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+def test_streamed_body_reads_from_replica():
+    def view(request):
+        def rows():
+            # Runs while the body is sent, after the middleware returned
+            yield router.db_for_read(Politician)
+
+        return StreamingHttpResponse(rows())
+
+    response = ReplicaRoutingMiddleware(view)(RequestFactory().get("/api/export/"))
+
+    assert list(response.streaming_content) == [b"replica_0"]
+    assert router.db_for_read(Politician) == "default"
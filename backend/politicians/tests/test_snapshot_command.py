@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from politicians.models import Promises
+
+pytestmark = pytest.mark.usefixtures("no_sync_lag")
+
+
+def fetch(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+# ---------------------------
+# SNAPSHOT: FULL BUILD
+# ---------------------------
+@pytest.mark.django_db
+def test_build_snapshot_writes_all_tables(tmp_path, politician_factory, rating_factory):
+    pol = politician_factory()
+    rating_factory(politician=pol, score=5)
+    Promises.objects.create(politician=pol, title="Road", description="Build it")
+
+    output = tmp_path / "netabase.sqlite3"
+    call_command("build_snapshot", str(output))
+
+    assert fetch(output, "SELECT slug FROM politicians") == [(pol.slug,)]
+    assert fetch(output, "SELECT name FROM parties") == [(pol.party.name,)]
+    assert fetch(output, "SELECT title, status FROM promises") == [("Road", "pending")]
+    assert fetch(output, "SELECT * FROM rating_summaries") == [(pol.id, 5.0, 1)]
+    assert fetch(output, "SELECT value FROM meta WHERE key = 'version'") == [("1",)]
+
+    indexes = {row[0] for row in fetch(output, "SELECT name FROM sqlite_master")}
+    assert "idx_politicians_slug" in indexes
+
+
+# ---------------------------
+# SNAPSHOT: INCREMENTAL BUILD
+# ---------------------------
+@pytest.mark.django_db
+def test_build_snapshot_applies_changes_incrementally(tmp_path, politician_factory):
+    kept = politician_factory()
+    removed = politician_factory()
+
+    output = tmp_path / "netabase.sqlite3"
+    call_command("build_snapshot", str(output))
+
+    kept.name = "Renamed"
+    kept.save()
+    removed.delete()
+
+    call_command("build_snapshot", str(output))
+
+    assert fetch(output, "SELECT name FROM politicians") == [("Renamed",)]
+    assert fetch(output, "SELECT value FROM meta WHERE key = 'version'") == [("2",)]
+
+
+@pytest.mark.django_db
+def test_build_snapshot_asks_for_full_rebuild_on_bad_token(
+    tmp_path, politician_factory
+):
+    politician_factory()
+    output = tmp_path / "snapshots" / "netabase.sqlite3"
+    call_command("build_snapshot", str(output))
+
+    conn = sqlite3.connect(output)
+    with conn:
+        conn.execute(
+            "UPDATE meta SET value = 'signed-elsewhere' WHERE key = 'sync_token'"
+        )
+    conn.close()
+
+    with pytest.raises(CommandError, match="--full"):
+        call_command("build_snapshot", str(output))
+
+    call_command("build_snapshot", str(output), "--full")
+    assert len(fetch(output, "SELECT id FROM politicians")) == 1
@@ -0,0 +1,125 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from politicians.models import ChangeLog, Promises
+from politicians.services import build_sync_page
+
+pytestmark = pytest.mark.usefixtures("no_sync_lag")
+
+
+def sync(client, since=None):
+    params = {"since": since} if since else {}
+    response = client.get(reverse("sync"), params)
+    assert response.status_code == 200  # type: ignore
+    return response.data  # type: ignore
+
+
+# ---------------------------
+# SYNC: INITIAL + DELTA
+# ---------------------------
+@pytest.mark.django_db
+def test_sync_returns_only_changes_since_token(politician_factory, rating_factory):
+    client = APIClient()
+    pol = politician_factory()
+    rating_factory(politician=pol, score=4)
+
+    first = sync(client)
+    assert [p["slug"] for p in first["politicians"]] == [pol.slug]
+    assert first["parties"][0]["id"] == pol.party_id
+    assert first["rating_summaries"] == [
+        {"politician_id": pol.id, "average_rating": 4.0, "rated_by": 1}
+    ]
+
+    # Nothing changed, nothing returned
+    second = sync(client, first["next"])
+    assert second["politicians"] == []
+    assert second["rating_summaries"] == []
+
+    pol.name = "Renamed"
+    pol.save()
+    Promises.objects.create(politician=pol, title="Road", description="Build it")
+
+    third = sync(client, second["next"])
+    assert [p["name"] for p in third["politicians"]] == ["Renamed"]
+    assert [p["title"] for p in third["promises"]] == ["Road"]
+    assert third["parties"] == []
+
+
+# ---------------------------
+# SYNC: TOMBSTONES
+# ---------------------------
+@pytest.mark.django_db
+def test_sync_reports_deletions(politician_factory, rating_factory):
+    client = APIClient()
+    pol = politician_factory()
+    other = politician_factory()
+    rating = rating_factory(politician=other, score=5)
+
+    token = sync(client)["next"]
+
+    rating.delete()
+    pol_id = pol.id
+    pol.delete()
+
+    data = sync(client, token)
+    assert {"model": "politician", "id": pol_id} in data["deleted"]
+    assert data["rating_summaries"] == [
+        {"politician_id": other.id, "average_rating": 0, "rated_by": 0}
+    ]
+
+
+
+@pytest.mark.django_db
+def test_politician_delete_skips_per_rating_bookkeeping(
+    politician_factory, rating_factory
+):
+    def delete_with_ratings(count):
+        pol = politician_factory()
+        for _ in range(count):
+            rating_factory(politician=pol)
+        with CaptureQueriesContext(connection) as queries:
+            pol.delete()
+        return len(queries)
+
+    # The cascade costs the same however many ratings go with it
+    assert delete_with_ratings(2) == delete_with_ratings(10)
+    assert not ChangeLog.objects.filter(model="rating_summary").exists()
+
+@pytest.mark.django_db
+def test_sync_pages_with_has_more(politician_factory):
+    politicians = [politician_factory() for _ in range(3)]
+
+    page = build_sync_page(limit=2)
+    assert page["has_more"] is True
+    assert len(page["politicians"]) == 2
+
+    page = build_sync_page(page["next"], limit=2)
+    assert [p["id"] for p in page["politicians"]] == [politicians[2].id]
+
+
+@pytest.mark.django_db
+def test_sync_holds_back_recent_writes(politician_factory, settings):
+    old = politician_factory()
+    token = build_sync_page()["next"]
+
+    settings.SYNC_SAFETY_LAG = 60
+    recent = politician_factory()
+    old.name = "Renamed"
+    old.save()
+
+    # Not served yet, and the cursor doesn't move past them
+    page = build_sync_page(token)
+    assert page["politicians"] == []
+
+    settings.SYNC_SAFETY_LAG = 0
+    page = build_sync_page(page["next"])
+    assert {p["id"] for p in page["politicians"]} == {old.id, recent.id}
+
+
+@pytest.mark.django_db
+def test_sync_rejects_tampered_token():
+    response = APIClient().get(reverse("sync"), {"since": "not-a-token"})
+    assert response.status_code == 400  # type: ignore
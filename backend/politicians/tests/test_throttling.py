@@ -0,0 +1,140 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.settings import api_settings
+
+from netabase import throttling
+from netabase.throttling import LocalBuckets, parse_rate
+
+
+def throttle_rates(num_proxies=0, **rates):
+    return override_settings(
+        REST_FRAMEWORK={
+            **api_settings.user_settings,
+            "NUM_PROXIES": num_proxies,
+            "DEFAULT_THROTTLE_RATES": {
+                key.replace("__", "."): rate for key, rate in rates.items()
+            },
+        }
+    )
+
+
+# ---------------------------
+# THROTTLE: RATING WRITES
+# ---------------------------
+@pytest.mark.django_db
+def test_rating_writes_are_throttled_per_user(auth_client, politician_factory):
+    pol = politician_factory()
+    url = reverse("politician-ratings", args=[pol.slug])
+    client, _ = auth_client()
+
+    with throttle_rates(rating__user="2/min", rating__ip="100/min"):
+        for score in (3, 4):
+            response = client.post(url, {"score": score}, format="json")
+            assert response.status_code in (200, 201)  # type: ignore
+
+        response = client.post(url, {"score": 5}, format="json")
+        assert response.status_code == 429  # type: ignore
+        assert 0 < int(response["Retry-After"]) <= 30
+
+        # Reads are never throttled
+        assert client.get(url).status_code == 200  # type: ignore
+
+        # Another user has a bucket of their own
+        other, _ = auth_client()
+        response = other.post(url, {"score": 5}, format="json")
+        assert response.status_code in (200, 201)  # type: ignore
+
+
+@pytest.mark.django_db
+def test_rating_writes_are_throttled_per_ip(auth_client, politician_factory):
+    pol = politician_factory()
+    url = reverse("politician-ratings", args=[pol.slug])
+
+    with throttle_rates(rating__user="100/min", rating__ip="1/min"):
+        client, _ = auth_client()
+        client.post(url, {"score": 3}, format="json")
+
+        other, _ = auth_client()
+        response = other.post(url, {"score": 3}, format="json")
+        assert response.status_code == 429  # type: ignore
+
+
+@pytest.mark.django_db
+def test_token_refresh_is_throttled(api_client):
+    with throttle_rates(token_refresh__ip="1/min"):
+        api_client.post(reverse("token_refresh"))
+        response = api_client.post(reverse("token_refresh"))
+
+    assert response.status_code == 429  # type: ignore
+
+
+# ---------------------------
+# THROTTLE: BUCKETS
+# ---------------------------
+def test_local_bucket_refills_over_time():
+    buckets = LocalBuckets()
+    capacity, rate = parse_rate("2/min")
+
+    assert buckets.take("k", capacity, rate, now=0) == (True, 0)
+    assert buckets.take("k", capacity, rate, now=0) == (True, 0)
+    allowed, wait = buckets.take("k", capacity, rate, now=0)
+    assert not allowed and wait == pytest.approx(30)
+
+    # Half a minute later one token is back
+    assert buckets.take("k", capacity, rate, now=30)[0]
+    assert not buckets.take("k", capacity, rate, now=30)[0]
+
+
+def test_unreachable_redis_falls_back_to_local_buckets(monkeypatch):
+    monkeypatch.setattr(throttling, "redis_down_until", 0)
+    redis_cache = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://127.0.0.1:1/0",
+        }
+    }
+
+    with override_settings(CACHES=redis_cache):
+        assert throttling.take_token("fallback", 1, 1)[0]
+        assert not throttling.take_token("fallback", 1, 1)[0]
+
+    assert throttling.redis_down_until > 0
+
+
+
+@pytest.mark.django_db
+def test_export_is_throttled_per_ip(api_client, politician_factory):
+    politician_factory()
+    url = reverse("politician-export-ndjson")
+
+    with throttle_rates(export__ip="2/hour"):
+        statuses = [api_client.get(url).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+# ---------------------------
+# THROTTLE: CLIENT ADDRESS
+# ---------------------------
+@pytest.mark.django_db
+@pytest.mark.parametrize("num_proxies", [0, 1])
+def test_spoofed_forwarded_for_shares_one_bucket(
+    auth_client, politician_factory, num_proxies
+):
+    pol = politician_factory()
+    url = reverse("politician-ratings", args=[pol.slug])
+    client, _ = auth_client()
+
+    statuses = []
+    with throttle_rates(num_proxies, rating__user="100/min", rating__ip="2/min"):
+        for i in range(3):
+            # The client picks the first entries; the proxy appends the last
+            response = client.post(
+                url,
+                {"score": 3},
+                format="json",
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{i}, 203.0.113.5",
+            )
+            statuses.append(response.status_code)  # type: ignore
+
+    assert statuses[-1] == 429
@@ -1,13 +1,17 @@
 from django.urls import path
 
 from politicians.views import (
+    MyRatingsView,
     PartyDetailView,
     PartyListView,
     PartyPoliticiansView,
+    PoliticianCompareView,
     PoliticianDetailView,
+    PoliticianExportView,
     PoliticianListView,
     PoliticianRatingDetailView,
     PoliticianRatingListCreateView,
+    SyncView,
 )
 
 urlpatterns = [
@@ -21,6 +25,11 @@ urlpatterns = [
     ),
     # Politician list & detail
     path("politicians/", PoliticianListView.as_view(), name="politician-list"),
+    path(
+        "politicians/compare/",
+        PoliticianCompareView.as_view(),
+        name="politician-compare",
+    ),
     path(
         "politicians/<slug:slug>/",
         PoliticianDetailView.as_view(),
@@ -35,4 +44,18 @@ urlpatterns = [
     path(
         "ratings/<int:pk>/", PoliticianRatingDetailView.as_view(), name="rating-detail"
     ),
+    path("me/ratings/", MyRatingsView.as_view(), name="my-ratings"),
+    # Bulk export
+    path(
+        "export/politicians.ndjson",
+        PoliticianExportView.as_view(export_format="ndjson"),
+        name="politician-export-ndjson",
+    ),
+    path(
+        "export/politicians.csv",
+        PoliticianExportView.as_view(export_format="csv"),
+        name="politician-export-csv",
+    ),
+    # Delta sync
+    path("sync/", SyncView.as_view(), name="sync"),
 ]
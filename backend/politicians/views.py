@@ -1,8 +1,15 @@
+import csv
+import json
+
 from django.conf import settings
+from django.core import signing
 from django.core.cache import cache
-from django.db.models import Avg, Count, F, FloatField
+from django.db.models import Avg, Count, F, FloatField, Q
 from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
@@ -11,13 +18,30 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from politicians.models import Party, Politician, Rating
+from netabase.idempotency import idempotent
+from netabase.throttling import IPTokenBucketThrottle, UserTokenBucketThrottle
+from politicians.models import Party, PendingRating, Politician, Rating
 from politicians.serializers import (
     PartySerializer,
     PoliticianDetailSerializer,
     PoliticianSerializer,
     RatingSerializer,
+    serializer_columns,
+)
+from politicians.services import (
+    EXPORT_CSV_FIELDS,
+    MAX_COMPARE_SLUGS,
+    MAX_MY_RATING_SLUGS,
+    build_comparison,
+    build_sync_page,
+    drain_pending_ratings,
+    export_rows,
+    parse_slugs,
+    politician_cache_key,
+    upsert_ratings,
+    user_ratings,
 )
 
 
@@ -27,16 +51,41 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+ACTIVE_POLITICIANS = Count("politicians", filter=Q(politicians__is_active=True))
+
+
 def clear_politician_cache(slug):
-    cache.delete(f"politician:{slug}")
+    cache.delete(politician_cache_key(slug))
+
+
+class SerializerColumnsMixin:
+    """
+    Select only the columns the serializer emits.
+
+    Keeps the long text fields out of list pages, and out of the GROUP BY
+    that the rating annotations add on databases that group by every
+    selected column.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return queryset.only(*serializer_columns(self.get_serializer_class()))
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv."""
+
+    def write(self, value):
+        return value
 
 
 # Party List View
-class PartyListView(generics.ListAPIView):
-    queryset = Party.objects.all()
+class PartyListView(SerializerColumnsMixin, generics.ListAPIView):
+    queryset = Party.objects.annotate(active_politician_count=ACTIVE_POLITICIANS)
     serializer_class = PartySerializer
     permission_classes = [AllowAny]
     pagination_class = StandardResultsSetPagination
+    query_budget = 2
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
 
     search_fields = ["name", "short_name"]
@@ -46,9 +95,10 @@ class PartyListView(generics.ListAPIView):
 
 # Party Detail View
 class PartyDetailView(generics.RetrieveAPIView):
-    queryset = Party.objects.all()
+    queryset = Party.objects.annotate(active_politician_count=ACTIVE_POLITICIANS)
     serializer_class = PartySerializer
     permission_classes = [AllowAny]
+    query_budget = 1
     lookup_field = "slug"
 
     @method_decorator(cache_page(60 * 10))
@@ -57,10 +107,11 @@ class PartyDetailView(generics.RetrieveAPIView):
 
 
 # Politicians by Party View
-class PartyPoliticiansView(generics.ListAPIView):
+class PartyPoliticiansView(SerializerColumnsMixin, generics.ListAPIView):
     serializer_class = PoliticianSerializer
     permission_classes = [AllowAny]
     pagination_class = StandardResultsSetPagination
+    query_budget = 2
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
 
     search_fields = ["name"]
@@ -69,24 +120,28 @@ class PartyPoliticiansView(generics.ListAPIView):
 
     def get_queryset(self):
         party_slug = self.kwargs["slug"]
-        return Politician.objects.filter(
-            party__slug=party_slug
-        ).annotate(
-            average_rating_annotated=Avg("ratings__score"),
-            total_ratings_annotated=Count("ratings"),
+        return (
+            Politician.objects.filter(party__slug=party_slug)
+            .select_related("party")
+            .annotate(
+                average_rating_annotated=Avg("ratings__score"),
+                total_ratings_annotated=Count("ratings"),
+            )
         )
 
-class PoliticianListView(generics.ListAPIView):
+class PoliticianListView(SerializerColumnsMixin, generics.ListAPIView):
     serializer_class = PoliticianSerializer
     permission_classes = [AllowAny]
     pagination_class = StandardResultsSetPagination
+    # Count and page, plus token version and page ratings for my_rating
+    query_budget = 4
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
 
-    queryset = Politician.objects.all().annotate(
+    queryset = Politician.objects.select_related("party").annotate(
         average_rating_annotated=Coalesce(Avg("ratings__score"), 0, output_field=FloatField()),
         total_ratings_annotated=Count("ratings"),
     )
@@ -102,8 +157,39 @@ class PoliticianListView(generics.ListAPIView):
     ]
     ordering = ["-name"]
 
+    def include_my_rating(self):
+        return self.request.query_params.get("include_my_rating") in ("1", "true")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+
+        # The signed-in user's ratings for the whole page in one query
+        self.my_ratings = None
+        if self.include_my_rating() and page is not None:
+            self.my_ratings = {}
+            if self.request.user.is_authenticated:
+                self.my_ratings = user_ratings(
+                    self.request.user.id, politician_ids=[p.pk for p in page]
+                )
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, "my_ratings", None) is not None:
+            context["my_ratings"] = self.my_ratings
+        return context
+
+    def dispatch(self, request, *args, **kwargs):
+        # Per-user pages bypass the shared page cache, which keeps serving
+        # the anonymous list
+        if request.GET.get("include_my_rating") in ("1", "true"):
+            response = super().dispatch(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+        return self.cached_dispatch(request, *args, **kwargs)
+
     @method_decorator(cache_page(60 * 5))
-    def dispatch(self, *args, **kwargs):
+    def cached_dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
 
@@ -111,11 +197,12 @@ class PoliticianDetailView(generics.RetrieveAPIView):
     queryset = Politician.objects.all()
     serializer_class = PoliticianDetailSerializer
     permission_classes = [AllowAny]
+    query_budget = 6
     lookup_field = "slug"
 
     def retrieve(self, request, *args, **kwargs):
         slug = kwargs["slug"]
-        cache_key = f"politician:{slug}"
+        cache_key = politician_cache_key(slug)
 
         # Try to get from cache
         cached_data = cache.get(cache_key)
@@ -132,6 +219,135 @@ class PoliticianDetailView(generics.RetrieveAPIView):
         return Response(cached_data)
 
 
+class MyRatingsView(APIView):
+    permission_classes = [IsAuthenticated]
+    query_budget = 2
+
+    def get(self, request):
+        slugs = parse_slugs(request.query_params.get("politicians", ""))
+
+        if not slugs:
+            return Response(
+                {"error": "Provide politician slugs to look up"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(slugs) > MAX_MY_RATING_SLUGS:
+            return Response(
+                {"error": f"At most {MAX_MY_RATING_SLUGS} politicians per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = Response({"ratings": user_ratings(request.user.id, slugs=slugs)})
+        patch_cache_control(response, private=True)
+        return response
+
+
+class PoliticianCompareView(APIView):
+    permission_classes = [AllowAny]
+    query_budget = 4
+
+    def get(self, request):
+        slugs = parse_slugs(request.query_params.get("slugs", ""))
+
+        if len(slugs) < 2:
+            return Response(
+                {"error": "Provide at least two politician slugs to compare"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(slugs) > MAX_COMPARE_SLUGS:
+            return Response(
+                {"error": f"At most {MAX_COMPARE_SLUGS} politicians can be compared"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Same set of politicians shares one cache entry regardless of order
+        cache_key = f"politician-compare:{','.join(sorted(slugs))}"
+        data = cache.get(cache_key)
+
+        if data is None:
+            data = build_comparison(sorted(slugs))
+            cache.set(cache_key, data, 60 * 5)
+
+        # Re-align cached rows with the order the client asked for
+        by_slug = {row["slug"]: row for row in data["results"]}
+        return Response(
+            {
+                "results": [by_slug[slug] for slug in slugs if slug in by_slug],
+                "not_found": [slug for slug in slugs if slug not in by_slug],
+            }
+        )
+
+
+class PoliticianExportView(APIView):
+    """Streams the whole public dataset as NDJSON or CSV."""
+
+    permission_classes = [AllowAny]
+    # Each call reads every politician; mirrors should use the sync feed
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = "export"
+    export_format = "ndjson"
+
+    def get(self, request):
+        after = request.query_params.get("after")
+
+        if after is not None:
+            try:
+                after = int(after)
+            except ValueError:
+                return Response(
+                    {"error": "after must be a politician id"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        rows = export_rows(after=after)
+
+        if self.export_format == "csv":
+            response = StreamingHttpResponse(
+                self.stream_csv(rows), content_type="text/csv"
+            )
+        else:
+            response = StreamingHttpResponse(
+                self.stream_ndjson(rows), content_type="application/x-ndjson"
+            )
+
+        response["Content-Disposition"] = (
+            f'attachment; filename="politicians.{self.export_format}"'
+        )
+        return response
+
+    def stream_ndjson(self, rows):
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    def stream_csv(self, rows):
+        writer = csv.DictWriter(Echo(), fieldnames=EXPORT_CSV_FIELDS)
+        yield writer.writeheader()
+
+        for row in rows:
+            row["promises"] = json.dumps(row["promises"], ensure_ascii=False)
+            row["initiatives"] = json.dumps(row["initiatives"], ensure_ascii=False)
+            yield writer.writerow(row)
+
+
+class SyncView(APIView):
+    """Change feed for mirrors: rows updated since the token plus tombstones."""
+
+    permission_classes = [AllowAny]
+    query_budget = 8
+
+    def get(self, request):
+        try:
+            data = build_sync_page(request.query_params.get("since"))
+        except signing.BadSignature:
+            return Response(
+                {"error": "Invalid sync token"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(data)
+
+
 class PoliticianRatingListCreateView(generics.ListCreateAPIView):
     serializer_class = RatingSerializer
     pagination_class = StandardResultsSetPagination
@@ -140,62 +356,108 @@ class PoliticianRatingListCreateView(generics.ListCreateAPIView):
     filterset_fields = ["score"]
     ordering_fields = ["created_at", "updated_at", "score"]
     ordering = ["-created_at"]
+    throttle_scope = "rating"
+    # Reading, writing and relocking the rating with savepoints, then adding
+    # to the summary, which a first rating inserts
+    query_budget = 12
 
     def get_permissions(self):
         if self.request.method == "GET":
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        # Only writes invalidate caches; reading ratings stays unthrottled
+        if self.request.method == "GET":
+            return []
+        return [UserTokenBucketThrottle(), IPTokenBucketThrottle()]
+
     def get_queryset(self):
         return Rating.objects.filter(
             politician__slug=self.kwargs["slug"]
         ).select_related("user", "politician")
 
+    @idempotent("rating")
     def create(self, request, *args, **kwargs):
         politician_slug = self.kwargs["slug"]
-        politician = get_object_or_404(Politician, slug=politician_slug)
-
-        # Check if user already rated
-        existing = Rating.objects.filter(
-            politician=politician, user=request.user
-        ).first()
-
-        if existing:
-            # Update existing rating
-            serializer = self.get_serializer(existing, data=request.data, partial=False)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            clear_politician_cache(politician.slug)  # ← ADD THIS LINE
-            return Response(serializer.data, status=status.HTTP_200_OK)
-
-        # Create new rating
+        politician_id = get_object_or_404(
+            Politician.objects.values_list("id", flat=True), slug=politician_slug
+        )
+
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, politician=politician)
-        clear_politician_cache(politician.slug)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        if settings.RATING_WRITE_BEHIND:
+            PendingRating.objects.create(
+                politician_id=politician_id,
+                user_id=request.user.id,
+                **serializer.validated_data,
+            )
+            return Response(
+                {"status": "queued", **serializer.validated_data},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        # One upsert instead of read-then-write, so a double submit can't
+        # race into the unique constraint
+        started = timezone.now()
+        (rating,) = upsert_ratings(
+            [
+                Rating(
+                    politician_id=politician_id,
+                    user_id=request.user.id,
+                    **serializer.validated_data,
+                )
+            ]
+        )
+        rating = Rating.objects.select_related("user").get(pk=rating.pk)
+        clear_politician_cache(politician_slug)
+
+        created = rating.created_at >= started
+        return Response(
+            self.get_serializer(rating).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 
 class PoliticianRatingDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RatingSerializer
+    throttle_scope = "rating"
+    # Draining queued submissions in write-behind mode adds an upsert, its
+    # savepoints and a second summary refresh
+    query_budget = 20
 
     def get_permissions(self):
         if self.request.method == "GET":
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        if self.request.method == "GET":
+            return []
+        return [UserTokenBucketThrottle(), IPTokenBucketThrottle()]
+
     def get_queryset(self):
         return Rating.objects.all()
 
+    def get_object(self):
+        rating = super().get_object()
+
+        # Queued submissions for this rating land before the direct write
+        if settings.RATING_WRITE_BEHIND and self.request.method != "GET":
+            if drain_pending_ratings(rating.politician_id, rating.user_id):
+                rating.refresh_from_db()
+        return rating
+
     def perform_update(self, serializer):
-        rating = self.get_object()
-        if rating.user != self.request.user:
+        rating = serializer.instance
+        if rating.user_id != self.request.user.id:
             raise PermissionDenied("You can only modify your own rating.")
         serializer.save()
         clear_politician_cache(rating.politician.slug)
 
     def perform_destroy(self, instance):
-        if instance.user != self.request.user:
+        if instance.user_id != self.request.user.id:
             raise PermissionDenied("You can only delete your own rating.")
         clear_politician_cache(instance.politician.slug)
         instance.delete()
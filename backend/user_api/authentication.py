@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from user_api.models import TokenVersion
+from user_api.tokens import RefreshToken
+
+User = get_user_model()
+
+VERSION_CLAIM = "ver"
+
+# Shared cache entry for each user's token version, see current_token_version
+TOKEN_VERSION_TTL = 60 * 60
+
+# Full user objects kept per process for claims users that need them
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 1024
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+def token_version_key(user_id):
+    return f"auth:token-version:{user_id}"
+
+
+def current_token_version(user_id):
+    """The user's token version, from the shared cache when possible."""
+    version = cache.get(token_version_key(user_id))
+    if version is None:
+        version = (
+            TokenVersion.objects.filter(user_id=user_id)
+            .values_list("version", flat=True)
+            .first()
+        ) or 0
+        cache.set(token_version_key(user_id), version, TOKEN_VERSION_TTL)
+    return version
+
+
+def bump_token_version(user_id):
+    """Revoke every token issued to the user so far."""
+    TokenVersion.objects.get_or_create(user_id=user_id)
+    TokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+    version = TokenVersion.objects.get(user_id=user_id).version
+
+    cache.set(token_version_key(user_id), version, TOKEN_VERSION_TTL)
+    user_cache.delete(user_id)
+    return version
+
+
+def stamp_user_claims(token, user):
+    """Copy the claims ``ClaimsUser`` reads from the user onto the token."""
+    token["username"] = user.username
+    token["is_active"] = user.is_active
+    token[VERSION_CLAIM] = current_token_version(user.pk)
+    return token
+
+
+def refresh_token_for(user):
+    """Refresh token whose claims let access tokens authenticate statelessly."""
+    return stamp_user_claims(RefreshToken.for_user(user), user)
+
+
+def check_token_version(token):
+    user_id = token[api_settings.USER_ID_CLAIM]
+    if token.get(VERSION_CLAIM, 0) != current_token_version(user_id):
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from access token claims.
+
+    ``id``, ``username`` and ``is_active`` come from the token; any other
+    attribute loads the full ``User`` through a short per-process cache.
+    Model fields need ``user_id=request.user.id`` rather than the object.
+    """
+
+    @cached_property
+    def id(self):
+        # Tokens carry the id as a string; model foreign keys hold the int
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def user(self):
+        user = user_cache.get(self.id)
+        if user is None:
+            user = User.objects.get(pk=self.id)
+            user_cache.set(self.id, user)
+        return user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that trusts the token claims instead of the DB."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not validated_token.get("is_active", True):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        check_token_version(validated_token)
+        return ClaimsUser(validated_token)
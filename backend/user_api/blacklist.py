@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+BLACKLIST_KEY = "auth:blacklist"
+
+# Always in the set, so an empty blacklist still tells a built set from a
+# missing one
+BUILT_MARKER = "-"
+
+PRUNE_BATCH_SIZE = 1000
+
+# After a Redis error, the database is checked directly for this long before
+# Redis is tried again, so an outage doesn't fail every token refresh
+REDIS_RETRY_AFTER = 30
+redis_down_until = 0
+
+# Set when an add could not reach Redis; the shared set is then dropped on
+# the next successful call so every process rebuilds it from the database
+redis_set_stale = False
+
+logger = logging.getLogger(__name__)
+
+# Adds members only to an already built set; a missing set gets rebuilt
+# from the database on the next check instead
+ADD_IF_BUILT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('sadd', KEYS[1], unpack(ARGV))
+end
+return 0
+"""
+
+
+def blacklisted_jtis(since=None):
+    """Jtis of blacklisted tokens that have not expired yet."""
+    tokens = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+    if since is not None:
+        tokens = tokens.filter(blacklisted_at__gte=since)
+    return tokens.values_list("token__jti", flat=True).iterator(chunk_size=5000)
+
+
+class RedisJtiSet:
+    """Blacklisted jtis in one Redis set shared by every process."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def contains(self, jti):
+        pipe = self.conn.pipeline()
+        pipe.sismember(BLACKLIST_KEY, jti)
+        pipe.exists(BLACKLIST_KEY)
+        member, built = pipe.execute()
+
+        if not built:
+            self.rebuild()
+            return bool(self.conn.sismember(BLACKLIST_KEY, jti))
+        return bool(member)
+
+    def add(self, jti):
+        self.conn.eval(ADD_IF_BUILT, 1, BLACKLIST_KEY, jti)
+
+    def rebuild(self):
+        started = timezone.now()
+        tmp_key = f"{BLACKLIST_KEY}:rebuild:{started.timestamp()}"
+
+        pipe = self.conn.pipeline()
+        pipe.sadd(tmp_key, BUILT_MARKER)
+        batch = []
+        for jti in blacklisted_jtis():
+            batch.append(jti)
+            if len(batch) >= 5000:
+                pipe.sadd(tmp_key, *batch)
+                batch = []
+        if batch:
+            pipe.sadd(tmp_key, *batch)
+        pipe.rename(tmp_key, BLACKLIST_KEY)
+        pipe.execute()
+
+        # Tokens blacklisted elsewhere while the set was being built
+        recent = list(blacklisted_jtis(since=started - timedelta(seconds=5)))
+        if recent:
+            self.conn.sadd(BLACKLIST_KEY, *recent)
+
+
+class LocalJtiSet:
+    """
+    In-process fallback when the cache is not Redis.
+
+    Only sees tokens blacklisted by this process after its first build, so
+    it suits development and tests, not several workers.
+    """
+
+    def __init__(self):
+        self.jtis = None
+        self.lock = threading.Lock()
+
+    def contains(self, jti):
+        if self.jtis is None:
+            self.rebuild()
+        return jti in self.jtis
+
+    def add(self, jti):
+        with self.lock:
+            if self.jtis is not None:
+                self.jtis.add(jti)
+
+    def rebuild(self):
+        jtis = set(blacklisted_jtis())
+        with self.lock:
+            self.jtis = jtis
+
+    def clear(self):
+        with self.lock:
+            self.jtis = None
+
+
+local_jtis = LocalJtiSet()
+
+
+def jti_set():
+    try:
+        from django_redis import get_redis_connection
+
+        return RedisJtiSet(get_redis_connection("default"))
+    except NotImplementedError:
+        return local_jtis
+
+
+def redis_failed(now):
+    global redis_down_until
+    logger.warning("Redis blacklist unavailable, checking the database")
+    redis_down_until = now + REDIS_RETRY_AFTER
+
+
+def available_jti_set():
+    """The membership set, or None while Redis is treated as down."""
+    global redis_set_stale
+
+    members = jti_set()
+    if redis_set_stale and isinstance(members, RedisJtiSet):
+        members.conn.delete(BLACKLIST_KEY)
+        redis_set_stale = False
+    return members
+
+
+def is_blacklisted(jti):
+    """
+    Whether the jti is blacklisted, from the set when it can be reached
+    and from the database otherwise.
+    """
+    now = time.monotonic()
+    if now >= redis_down_until:
+        try:
+            return available_jti_set().contains(jti)
+        except Exception:
+            redis_failed(now)
+
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def add_to_blacklist(jti):
+    """Add a jti already blacklisted in the database to the set."""
+    global redis_set_stale
+
+    now = time.monotonic()
+    if now >= redis_down_until:
+        try:
+            available_jti_set().add(jti)
+            return
+        except Exception:
+            redis_failed(now)
+
+    redis_set_stale = True
+
+
+def prune_tokens(batch_size=PRUNE_BATCH_SIZE):
+    """
+    Delete expired outstanding tokens, and with them their blacklist
+    entries, in small batches so the tables are never locked for long.
+    Returns the number of outstanding tokens removed.
+    """
+    now = timezone.now()
+    removed = 0
+
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now).values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            break
+
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        removed += len(ids)
+
+    jti_set().rebuild()
+    return removed
@@ -0,0 +1,165 @@
+import logging
+import re
+import threading
+import time
+
+import jwt as pyjwt
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import jwt as google_jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+CERTS_CACHE_KEY = "auth:google-certs"
+CERTS_FETCH_TIMEOUT = 5
+
+# Used when Google's response carries no usable max-age
+DEFAULT_CERTS_TTL = 60 * 60
+
+# Start a background refresh once the key set is this close to expiring
+REFRESH_AHEAD = 5 * 60
+
+# Unknown key ids force a refetch at most this often (Google rotated keys)
+MIN_REFETCH_INTERVAL = 60
+
+CLOCK_SKEW = 10
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def certs_ttl(response):
+    """Seconds the key set stays fresh according to Cache-Control and Age."""
+    match = MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    if not match:
+        return DEFAULT_CERTS_TTL
+    age = int(response.headers.get("Age", 0) or 0)
+    return max(int(match.group(1)) - age, 0)
+
+
+class GoogleCerts:
+    """
+    Google's ID-token signing certificates, cached in process and in the
+    shared cache until the expiry their response headers allow.
+
+    Shortly before expiry one background thread refreshes them, so logins
+    never wait on the fetch; if Google can't be reached the last key set
+    keeps being used.
+    """
+
+    def __init__(self):
+        self.certs = None
+        self.expires_at = 0
+        self.fetched_at = 0
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def clear(self):
+        with self.lock:
+            self.certs = None
+            self.expires_at = 0
+            self.fetched_at = 0
+
+    def get(self):
+        now = time.time()
+        if self.certs is None or now >= self.expires_at:
+            self.load_shared() or self.fetch()
+        elif self.expires_at - now < REFRESH_AHEAD:
+            self.refresh_in_background()
+        return self.certs
+
+    def load_shared(self):
+        """Adopt a newer key set another process already fetched."""
+        shared = cache.get(CERTS_CACHE_KEY)
+        if not shared or shared["expires_at"] <= max(time.time(), self.expires_at):
+            return False
+
+        with self.lock:
+            self.certs = shared["certs"]
+            self.expires_at = shared["expires_at"]
+        return True
+
+    def fetch(self, force=False):
+        with self.lock:
+            # Another thread fetched while this one waited for the lock
+            fresh_until = self.expires_at - REFRESH_AHEAD
+            if not force and self.certs is not None and time.time() < fresh_until:
+                return self.certs
+
+            try:
+                response = requests.get(
+                    settings.GOOGLE_CERTS_URL, timeout=CERTS_FETCH_TIMEOUT
+                )
+                response.raise_for_status()
+                certs = response.json()
+            except (requests.RequestException, ValueError):
+                if self.certs is None:
+                    raise
+                logger.warning("Google certs refresh failed, keeping cached keys")
+                return self.certs
+
+            ttl = certs_ttl(response)
+            self.certs = certs
+            self.fetched_at = time.time()
+            self.expires_at = self.fetched_at + ttl
+
+        cache.set(
+            CERTS_CACHE_KEY,
+            {"certs": certs, "expires_at": self.expires_at},
+            ttl or None,
+        )
+        return certs
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+
+        def refresh():
+            try:
+                self.load_shared() or self.fetch()
+            except Exception:
+                logger.exception("Background refresh of Google certs failed")
+            finally:
+                self.refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def for_key(self, kid):
+        """The key set, refetched first when it doesn't know ``kid``."""
+        certs = self.get()
+        if kid not in certs and time.time() - self.fetched_at > MIN_REFETCH_INTERVAL:
+            certs = self.fetch(force=True)
+        return certs
+
+
+google_certs = GoogleCerts()
+
+
+def verify_google_id_token(token, audience=None):
+    """
+    Verify a Google ID token locally against the cached key set.
+
+    Same checks as ``google.oauth2.id_token.verify_oauth2_token``; raises
+    ``ValueError`` for invalid tokens.
+    """
+    audience = settings.GOOGLE_CLIENT_ID if audience is None else audience
+
+    try:
+        kid = pyjwt.get_unverified_header(token).get("kid")
+    except pyjwt.InvalidTokenError as e:
+        raise ValueError(f"Malformed token: {e}") from e
+
+    idinfo = google_jwt.decode(
+        token,
+        certs=google_certs.for_key(kid),
+        audience=audience,
+        clock_skew_in_seconds=CLOCK_SKEW,
+    )
+
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+    return idinfo
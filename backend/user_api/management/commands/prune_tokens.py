@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from user_api.blacklist import PRUNE_BATCH_SIZE, prune_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens and rebuild "
+        "the blacklist membership set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        removed = prune_tokens(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Pruned {removed} expired tokens"))
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import models
+
+
+class TokenVersion(models.Model):
+    """
+    Version stamped into every JWT issued for a user.
+
+    Bumping it revokes all access and refresh tokens issued before, without
+    a per-request user query.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="token_version",
+    )
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+User = get_user_model()
+
+USERNAME_MAX_LENGTH = User._meta.get_field("username").max_length
+
+# Room kept for the "_<n>" suffix when the base is truncated
+SUFFIX_ROOM = 8
+
+# Sign-ups that lose the race for a username retry with a fresh query
+SIGNUP_RETRIES = 5
+
+
+def generate_unique_username(base_username):
+    """
+    The base username, or the base with the lowest free numeric suffix.
+
+    All usernames sharing the prefix are fetched in one query (served by
+    the username ``LIKE`` index), so popular bases cost one round trip.
+    """
+    base = base_username[: USERNAME_MAX_LENGTH - SUFFIX_ROOM] or "user"
+    taken = set(
+        User.objects.filter(username__startswith=base).values_list(
+            "username", flat=True
+        )
+    )
+    if base not in taken:
+        return base
+
+    suffix = 1
+    while f"{base}_{suffix}" in taken:
+        suffix += 1
+    return f"{base}_{suffix}"
+
+
+def get_or_create_user_for_email(email, first_name="", last_name=""):
+    """
+    The user with this email, created with a unique username if missing.
+
+    Concurrent sign-ups can pick the same username; the loser's insert
+    fails on the unique constraint and retries, at most ``SIGNUP_RETRIES``
+    times. Returns ``(user, created)``.
+    """
+    for attempt in range(SIGNUP_RETRIES):
+        user = User.objects.filter(email=email).order_by("id").first()
+        if user is not None:
+            if (user.first_name, user.last_name) != (first_name, last_name):
+                user.first_name = first_name
+                user.last_name = last_name
+                user.save(update_fields=["first_name", "last_name"])
+            return user, False
+
+        username = generate_unique_username(email.split("@")[0])
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username=username,
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                )
+            return user, True
+        except IntegrityError:
+            if attempt == SIGNUP_RETRIES - 1:
+                raise
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from user_api.authentication import bump_token_version, user_cache
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_token_claims(sender, instance, created, **kwargs):
+    """Drop the cached user and revoke the tokens of deactivated accounts."""
+    user_cache.delete(instance.pk)
+    if not created and not instance.is_active:
+        bump_token_version(instance.pk)
@@ -0,0 +1,163 @@
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.contrib.auth.models import User
+from django.test import override_settings
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+from rest_framework.test import APIClient
+
+from netabase.throttling import local_buckets
+from user_api.authentication import refresh_token_for, user_cache
+from user_api.blacklist import local_jtis
+from user_api.google import google_certs
+
+GOOGLE_CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def local_cache():
+    # Per-test in-memory cache instead of Redis, and cold process caches.
+    with override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "user-api-tests",
+            }
+        }
+    ):
+        from django.core.cache import cache
+
+        cache.clear()
+        user_cache.clear()
+        local_jtis.clear()
+        google_certs.clear()
+        local_buckets.clear()
+        yield
+
+
+@pytest.fixture
+def user_factory(db):
+    def make_user(**kwargs):
+        defaults = {
+            "username": f"user_{User.objects.count()}",
+            "email": f"user_{User.objects.count()}@example.com",
+        }
+        defaults.update(kwargs)
+        return User.objects.create(**defaults)
+
+    return make_user
+
+
+@pytest.fixture
+def auth_client(api_client, user_factory):
+    def _get(user=None):
+        if user is None:
+            user = user_factory()
+
+        refresh = refresh_token_for(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}")
+        return api_client, user
+
+    return _get
+
+
+def self_signed_key():
+    """RSA private key PEM and a self-signed certificate PEM for it."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return key_pem.decode(), cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertsHandler(BaseHTTPRequestHandler):
+    """Serves the current key set like Google's certs endpoint."""
+
+    def do_GET(self):
+        self.server.hits += 1
+        body = json.dumps(self.server.certs).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", f"public, max-age={self.server.max_age}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def signing_keys():
+    return {kid: self_signed_key() for kid in ("key-1", "key-2")}
+
+
+@pytest.fixture
+def google_keys(signing_keys):
+    """
+    Local stand-in for Google's certs endpoint publishing ``key-1``.
+
+    ``google_keys.sign(**claims)`` issues an ID token for the test client.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CertsHandler)
+    server.daemon_threads = True
+    server.hits = 0
+    server.max_age = 3600
+    server.certs = {"key-1": signing_keys["key-1"][1]}
+
+    def sign(kid="key-1", **claims):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": GOOGLE_CLIENT_ID,
+            "sub": "1234567890",
+            "email": "ram@example.com",
+            "given_name": "Ram",
+            "family_name": "Thapa",
+            "iat": now,
+            "exp": now + 600,
+            **claims,
+        }
+        signer = crypt.RSASigner.from_string(signing_keys[kid][0], kid)
+        return google_jwt.encode(signer, payload).decode()
+
+    server.sign = sign
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    with override_settings(
+        GOOGLE_CERTS_URL=f"http://127.0.0.1:{server.server_port}/certs",
+        GOOGLE_CLIENT_ID=GOOGLE_CLIENT_ID,
+    ):
+        yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,86 @@
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user_api.authentication import bump_token_version, refresh_token_for
+
+
+# ---------------------------
+# AUTH: CLAIMS WITHOUT QUERIES
+# ---------------------------
+@pytest.mark.django_db
+def test_authenticated_request_skips_user_query(auth_client, django_assert_num_queries):
+    client, user = auth_client()
+    url = reverse("me")
+
+    # First request loads the full user for the profile fields
+    response = client.get(url)
+    assert response.status_code == 200  # type: ignore
+    assert response.data["email"] == user.email  # type: ignore
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+
+    assert response.data["username"] == user.username  # type: ignore
+
+
+# ---------------------------
+# AUTH: REVOCATION
+# ---------------------------
+@pytest.mark.django_db
+def test_token_version_bump_revokes_tokens(auth_client):
+    client, user = auth_client()
+    refresh = refresh_token_for(user)
+
+    bump_token_version(user.id)
+
+    response = client.get(reverse("me"))
+    assert response.status_code == 401  # type: ignore
+
+    client.credentials()
+    client.cookies["refresh_token"] = str(refresh)
+    response = client.post(reverse("token_refresh"))
+    assert response.status_code == 401  # type: ignore
+
+
+@pytest.mark.django_db
+def test_tokens_issued_after_bump_are_valid(auth_client, user_factory):
+    user = user_factory()
+    bump_token_version(user.id)
+
+    client, _ = auth_client(user)
+    response = client.get(reverse("me"))
+
+    assert response.status_code == 200  # type: ignore
+
+
+@pytest.mark.django_db
+def test_deactivating_user_revokes_tokens(auth_client):
+    client, user = auth_client()
+
+    user.is_active = False
+    user.save()
+
+    response = client.get(reverse("me"))
+    assert response.status_code == 401  # type: ignore
+
+
+# ---------------------------
+# AUTH: CLAIMS ON REFRESH
+# ---------------------------
+@pytest.mark.django_db
+def test_refresh_stamps_claims_missing_from_old_tokens(api_client, user_factory):
+    user = user_factory()
+    # As issued before the claims were added
+    api_client.cookies["refresh_token"] = str(RefreshToken.for_user(user))
+
+    user.username = "renamed"
+    user.save()
+    response = api_client.post(reverse("token_refresh"))
+    assert response.status_code == 200  # type: ignore
+
+    access = response.data["access"]  # type: ignore
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    response = api_client.get(reverse("me"))
+
+    assert response.data["username"] == "renamed"  # type: ignore
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from user_api import blacklist
+from user_api.authentication import refresh_token_for
+from user_api.blacklist import local_jtis
+from user_api.tokens import RefreshToken
+
+
+def refresh(client, token):
+    client.cookies["refresh_token"] = str(token)
+    return client.post(reverse("token_refresh"))
+
+
+class UnreachableRedis:
+    def contains(self, jti):
+        raise ConnectionError("Connection refused")
+
+    def add(self, jti):
+        raise ConnectionError("Connection refused")
+
+
+# ---------------------------
+# BLACKLIST: ROTATION
+# ---------------------------
+@pytest.mark.django_db
+def test_refresh_rotates_and_blacklists_old_token(api_client, user_factory):
+    old = refresh_token_for(user_factory())
+
+    response = refresh(api_client, old)
+    assert response.status_code == 200  # type: ignore
+    new = response.cookies["refresh_token"].value  # type: ignore
+    assert new != str(old)
+
+    assert refresh(api_client, old).status_code == 401  # type: ignore
+    assert refresh(api_client, new).status_code == 200  # type: ignore
+
+
+@pytest.mark.django_db
+def test_logout_blacklists_refresh_token(api_client, user_factory):
+    token = refresh_token_for(user_factory())
+
+    api_client.cookies["refresh_token"] = str(token)
+    api_client.post(reverse("logout"))
+
+    assert refresh(api_client, token).status_code == 401  # type: ignore
+
+
+@pytest.mark.django_db
+def test_blacklist_check_skips_database(user_factory, django_assert_num_queries):
+    revoked = refresh_token_for(user_factory())
+    valid = refresh_token_for(user_factory())
+    revoked.blacklist()
+    local_jtis.clear()
+
+    # Built from the database once, then answered from memory
+    with django_assert_num_queries(1):
+        RefreshToken(str(valid))
+
+    with django_assert_num_queries(0):
+        with pytest.raises(TokenError):
+            RefreshToken(str(revoked))
+        RefreshToken(str(valid))
+
+
+# ---------------------------
+# BLACKLIST: PRUNING
+# ---------------------------
+@pytest.mark.django_db
+def test_prune_tokens_removes_expired(user_factory):
+    expired = refresh_token_for(user_factory())
+    expired.blacklist()
+    live = refresh_token_for(user_factory())
+    live.blacklist()
+    OutstandingToken.objects.filter(jti=expired["jti"]).update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+
+    call_command("prune_tokens", batch_size=1)
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [live["jti"]]
+    assert BlacklistedToken.objects.count() == 1
+    assert local_jtis.jtis == {live["jti"]}
+
+
+# ---------------------------
+# BLACKLIST: REDIS OUTAGE
+# ---------------------------
+@pytest.mark.django_db
+def test_refresh_falls_back_to_database_without_redis(
+    api_client, user_factory, monkeypatch
+):
+    monkeypatch.setattr(blacklist, "jti_set", UnreachableRedis)
+    monkeypatch.setattr(blacklist, "redis_down_until", 0)
+    monkeypatch.setattr(blacklist, "redis_set_stale", False)
+    old = refresh_token_for(user_factory())
+
+    response = refresh(api_client, old)
+    assert response.status_code == 200  # type: ignore
+
+    # The rotated-out token is still refused, from the database
+    assert refresh(api_client, old).status_code == 401  # type: ignore
+    # The missed add drops the shared set once Redis is back
+    assert blacklist.redis_set_stale
@@ -0,0 +1,109 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from user_api.google import CERTS_CACHE_KEY, google_certs, verify_google_id_token
+
+
+# ---------------------------
+# GOOGLE: LOCAL VERIFICATION
+# ---------------------------
+def test_verify_reuses_cached_key_set(google_keys):
+    for _ in range(3):
+        idinfo = verify_google_id_token(google_keys.sign())
+        assert idinfo["email"] == "ram@example.com"
+
+    assert google_keys.hits == 1
+
+
+def test_verify_honors_max_age(google_keys):
+    google_keys.max_age = 120
+
+    verify_google_id_token(google_keys.sign())
+
+    assert 110 < google_certs.expires_at - time.time() <= 120
+    assert cache.get(CERTS_CACHE_KEY)["certs"] == google_keys.certs
+
+
+def test_verify_uses_shared_key_set(google_keys):
+    verify_google_id_token(google_keys.sign())
+    google_certs.clear()
+
+    # Another process' fetch is picked up from the shared cache
+    verify_google_id_token(google_keys.sign())
+
+    assert google_keys.hits == 1
+
+
+def test_verify_refetches_on_rotated_key(google_keys, signing_keys):
+    verify_google_id_token(google_keys.sign())
+    google_keys.certs = {"key-2": signing_keys["key-2"][1]}
+    google_certs.fetched_at -= 3600
+
+    idinfo = verify_google_id_token(google_keys.sign(kid="key-2"))
+
+    assert idinfo["sub"] == "1234567890"
+    assert google_keys.hits == 2
+
+
+def test_expiring_key_set_refreshes_in_background(google_keys):
+    # Already inside the refresh-ahead window once fetched
+    google_keys.max_age = 200
+    verify_google_id_token(google_keys.sign())
+
+    verify_google_id_token(google_keys.sign())
+
+    deadline = time.time() + 2
+    while google_keys.hits < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert google_keys.hits == 2
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 3600, "iat": int(time.time()) - 7200},
+    ],
+)
+def test_verify_rejects_invalid_tokens(google_keys, claims):
+    with pytest.raises(ValueError):
+        verify_google_id_token(google_keys.sign(**claims))
+
+
+def test_verify_rejects_unknown_signer(google_keys, signing_keys):
+    # Signed by key-2, but the token claims to be key-1
+    token = google_keys.sign(kid="key-2")
+    header, rest = token.split(".", 1)
+    forged = google_keys.sign().split(".", 1)[0] + "." + rest
+
+    with pytest.raises(ValueError):
+        verify_google_id_token(forged)
+
+
+# ---------------------------
+# GOOGLE: LOGIN ENDPOINT
+# ---------------------------
+@pytest.mark.django_db
+def test_google_login_issues_tokens(api_client, google_keys):
+    response = api_client.post(
+        reverse("google-login"), {"credential": google_keys.sign()}, format="json"
+    )
+
+    assert response.status_code == 200  # type: ignore
+    assert response.data["user"]["username"] == "ram"  # type: ignore
+    assert "refresh_token" in response.cookies  # type: ignore
+
+
+@pytest.mark.django_db
+def test_google_login_rejects_invalid_token(api_client, google_keys):
+    response = api_client.post(
+        reverse("google-login"),
+        {"credential": google_keys.sign(aud="someone-else")},
+        format="json",
+    )
+
+    assert response.status_code == 400  # type: ignore
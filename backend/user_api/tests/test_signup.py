@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from user_api import services
+from user_api.services import generate_unique_username, get_or_create_user_for_email
+
+
+# ---------------------------
+# USERNAMES: SINGLE QUERY
+# ---------------------------
+@pytest.mark.django_db
+def test_username_takes_lowest_free_suffix(user_factory, django_assert_num_queries):
+    for username in ["ram", "ram_1", "ram_3", "ramesh"]:
+        user_factory(username=username)
+
+    with django_assert_num_queries(1):
+        assert generate_unique_username("ram") == "ram_2"
+
+    assert generate_unique_username("sita") == "sita"
+
+
+@pytest.mark.django_db
+def test_existing_email_logs_in_without_new_user(user_factory):
+    user = user_factory(username="ram", email="ram@example.com")
+
+    found, created = get_or_create_user_for_email("ram@example.com", "Ram", "Thapa")
+
+    assert (found, created) == (user, False)
+    assert User.objects.get(pk=user.pk).first_name == "Ram"
+
+
+# ---------------------------
+# USERNAMES: CONCURRENT SIGN-UPS
+# ---------------------------
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_signups_get_distinct_usernames(monkeypatch):
+    signups = 8
+    barrier = threading.Barrier(signups, timeout=5)
+    generate = services.generate_unique_username
+    first_attempt = threading.local()
+
+    # SQLite allows a single writer, so each sign-up holds this lock while
+    # it talks to the database and drops it only at the barrier
+    db_lock = threading.Lock()
+
+    def racing_generate(base):
+        username = generate(base)
+        if not getattr(first_attempt, "done", False):
+            # Every sign-up reads the taken names before any of them
+            # inserts, so the first attempts all pick the same username
+            first_attempt.done = True
+            db_lock.release()
+            try:
+                barrier.wait()
+            finally:
+                db_lock.acquire()
+        return username
+
+    def sign_up(i):
+        try:
+            with db_lock:
+                return get_or_create_user_for_email(f"ram@host{i}.example")
+        finally:
+            connection.close()
+
+    monkeypatch.setattr(services, "generate_unique_username", racing_generate)
+    monkeypatch.setattr(services, "SIGNUP_RETRIES", signups)
+
+    with ThreadPoolExecutor(max_workers=signups) as executor:
+        results = list(executor.map(sign_up, range(signups)))
+
+    usernames = sorted(user.username for user, created in results)
+    assert all(created for _, created in results)
+    assert usernames == sorted(["ram"] + [f"ram_{n}" for n in range(1, signups)])
@@ -0,0 +1,54 @@
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from user_api.blacklist import add_to_blacklist, is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token checked against the blacklist set instead of the
+    ``token_blacklist`` tables, which only see writes.
+    """
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("Token is blacklisted")
+
+    def outstanding_token(self):
+        # By user id, skipping the user lookup simplejwt does here
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "created_at": self.current_time,
+                "token": str(self),
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            },
+        )
+        return token
+
+    def outstand(self):
+        return self.outstanding_token()
+
+    def blacklist(self):
+        blacklisted = BlacklistedToken.objects.get_or_create(
+            token=self.outstanding_token()
+        )
+        add_to_blacklist(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
+
+    def rotate(self):
+        """Blacklist this token if configured, then turn it into a new one."""
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            self.blacklist()
+
+        self.set_jti()
+        self.set_exp()
+        self.set_iat()
+        self.outstand()
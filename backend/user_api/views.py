@@ -1,26 +1,32 @@
-import random
-import string
-
 from django.conf import settings
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from netabase.throttling import IPTokenBucketThrottle
+from user_api.authentication import (
+    check_token_version,
+    refresh_token_for,
+    stamp_user_claims,
+)
+from user_api.google import verify_google_id_token
+from user_api.services import get_or_create_user_for_email
+from user_api.tokens import RefreshToken
+
+User = get_user_model()
+
 
+class GoogleLoginThrottle(IPTokenBucketThrottle):
+    scope = "google_login"
 
-def generate_unique_username(base_username):
-    """Ensures username uniqueness by appending random suffix when conflicts occur."""
-    username = base_username
-    while User.objects.filter(username=username).exists():
-        rand_str = "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
-        username = f"{base_username}_{rand_str}"
-    return username
+
+class TokenRefreshThrottle(IPTokenBucketThrottle):
+    scope = "token_refresh"
 
 
 def set_refresh_token_cookie(response, refresh_token):
@@ -46,6 +52,7 @@ def set_refresh_token_cookie(response, refresh_token):
 @csrf_exempt
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([GoogleLoginThrottle])
 def google_login(request):
     """Authenticates user via Google OAuth and issues JWT tokens."""
     token = request.data.get("credential")
@@ -56,11 +63,7 @@ def google_login(request):
         )
 
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        idinfo = verify_google_id_token(token)
 
         email = idinfo.get("email")
         if not email:
@@ -69,26 +72,13 @@ def google_login(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        first_name = idinfo.get("given_name", "")
-        last_name = idinfo.get("family_name", "")
-        base_username = email.split("@")[0]
-        username = generate_unique_username(base_username)
-
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={
-                "username": username,
-                "first_name": first_name,
-                "last_name": last_name,
-            },
+        user, created = get_or_create_user_for_email(
+            email,
+            first_name=idinfo.get("given_name", ""),
+            last_name=idinfo.get("family_name", ""),
         )
 
-        if not created:
-            user.first_name = first_name
-            user.last_name = last_name
-            user.save()
-
-        refresh = RefreshToken.for_user(user)
+        refresh = refresh_token_for(user)
         access = refresh.access_token
 
         response = Response(
@@ -141,6 +131,7 @@ def me(request):
 @csrf_exempt
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([TokenRefreshThrottle])
 def refresh_token_view(request):
     """Issues new access token and rotates refresh token from httpOnly cookie."""
     refresh_token = request.COOKIES.get("refresh_token")
@@ -152,15 +143,25 @@ def refresh_token_view(request):
 
     try:
         refresh = RefreshToken(refresh_token)
+        check_token_version(refresh)
+
+        # Older tokens lack claims and usernames can change; refreshing
+        # re-stamps them so the access and rotated tokens are current
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("User is inactive or deleted")
+        stamp_user_claims(refresh, user)
         access = refresh.access_token
 
         response = Response({"access": str(access)}, status=status.HTTP_200_OK)
 
         # Rotate refresh token when ROTATE_REFRESH_TOKENS is enabled
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.rotate()
         set_refresh_token_cookie(response, refresh)
         return response
 
-    except TokenError as e:
+    except (TokenError, AuthenticationFailed) as e:
         return Response(
             {"error": "Invalid or expired refresh token"},
             status=status.HTTP_401_UNAUTHORIZED,
@@ -15,12 +15,14 @@ interface NewsItem {
   category?: string;
   pub_date?: string;
   published_date?: string;
+  published_at?: string;
   source?: string;
+  source_name?: string;
   author?: string;
 }
 
 interface NewsApiResponse {
-  count: number;
+  next: string | null;
   results: NewsItem[];
 }
 
@@ -205,12 +207,12 @@ export default function PoliticsNewsWidget() {
                   <div className="space-y-2 mb-4 text-xs sm:text-sm text-gray-400">
                     <div className="flex items-center gap-2">
                       <Calendar size={16} className="text-pink-600" />
-                      <span>{formatDate(item.pub_date || item.published_date)}</span>
+                      <span>{formatDate(item.published_at || item.pub_date || item.published_date)}</span>
                     </div>
 
                     <div className="flex items-center gap-2">
                       <Building2 size={16} className="text-pink-600" />
-                      <span>{item.source || "OnlineKhabar"}</span>
+                      <span>{item.source_name || item.source || "OnlineKhabar"}</span>
                     </div>
 
                     {item.author && (